@@ -0,0 +1,228 @@
+"""
+Benchmark de las llamadas de IA de ChatGPTClient contra el servidor local de
+pruebas (src/ai/fake_server.py), sin necesidad de conexión ni API key real.
+
+Mide latencia por llamada, manejo de timeouts y rendimiento con concurrencia.
+
+Uso:
+    python benchmarks/ai_latency_bench.py --requests 200 --concurrency 8 \\
+        --latency lognormal:0.2,0.6 --error-rate 0.05 --timeout 1
+    python benchmarks/ai_latency_bench.py --stream --verbose-words 60 --token-delay 0.01
+
+Todas las decisiones usan el mismo estado, así que con concurrencia se agrupan
+las que coinciden en vuelo (coalesce_requests); --no-coalesce mide cada llamada.
+
+El limitador de peticiones (rate_limit_per_sec de config/openai_config.json, 5
+por segundo) también frena el benchmark; --rate-limit lo sustituye y
+--rate-limit 0 lo desactiva.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai.chatgpt_client import ChatGPTClient
+from src.ai.fake_server import add_server_arguments, server_from_args
+from src.ai.telemetry import telemetry
+from src.utils.stats import summarize_latencies
+
+# Estado representativo de un turno enemigo en la oleada del tutorial
+SAMPLE_GAME_STATE = {
+    "player_health": 112,
+    "player_max_health": 150,
+    "player_defending": False,
+    "player_status_effects": ["veneno"],
+    "enemies": [
+        {"name": "Goblin Guerrero", "health": 28, "max_health": 40, "status_effects": []},
+        {
+            "name": "Arquero Esqueleto",
+            "health": 30,
+            "max_health": 30,
+            "status_effects": ["congelado"],
+        },
+        {"name": "Mago Oscuro", "health": 12, "max_health": 35, "status_effects": []},
+    ],
+    "ally": {"health": 64, "max_health": 100},
+    "potions": 3,
+    "biome": 0,
+}
+SAMPLE_ACTIONS = ["Mordisco", "Garras", "Golpe de Mazo"]
+
+CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "openai_config.json",
+)
+
+
+def write_config(rate_limit, path=CONFIG_PATH):
+    """
+    Copia temporal de la configuración con otro límite de peticiones
+
+    El limitador se crea junto con el cliente (get_resilient_caller), así que el
+    límite hay que fijarlo antes de construirlo.
+
+    Returns:
+        Ruta del archivo temporal (el llamador lo borra)
+    """
+    config = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            config = json.load(f)
+    config["rate_limit_per_sec"] = rate_limit
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", prefix="ai_bench_", delete=False
+    ) as f:
+        json.dump(config, f)
+    return f.name
+
+
+def make_call(client, call):
+    """Devuelve la función a medir según el tipo de llamada"""
+    if call == "decision":
+        return lambda: client.get_decision(SAMPLE_GAME_STATE, SAMPLE_ACTIONS)
+    if call == "boss":
+        return lambda: client.generate_boss_phrase("Señor del Caos", 75, 64)
+    return lambda: client.get_completion(
+        "Genera un consejo corto y útil para un jugador de RPG táctico."
+    )
+
+
+def run_benchmark(client, call, requests, concurrency):
+    """Lanza las peticiones con el nivel de concurrencia pedido y mide cada una"""
+    fn = make_call(client, call)
+
+    def timed(_):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, range(requests)))
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def measure(client, server, args):
+    """Calienta el cliente y lanza el benchmark (None si no se pudo inicializar)"""
+    if not client.is_initialized():
+        return None
+    if args.timeout is not None:
+        client.config["timeout"] = args.timeout
+    client.config["stream_decisions"] = args.stream
+    client.config["coalesce_requests"] = not args.no_coalesce
+
+    # Calentamiento: la primera llamada importa el SDK y abre la conexión
+    make_call(client, args.call)()
+    server.reset_stats()
+    telemetry.reset()
+
+    latencies, elapsed = run_benchmark(client, args.call, args.requests, args.concurrency)
+    return (
+        latencies,
+        elapsed,
+        dict(server.stats),
+        telemetry.snapshot(),
+        client.config.get("rate_limit_per_sec", 0),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latencia de la IA")
+    parser.add_argument(
+        "--call", choices=["decision", "boss", "completion"], default="decision"
+    )
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--difficulty", default="Normal")
+    parser.add_argument("--model", default="gpt-3.5-turbo")
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="Timeout por llamada (segundos)"
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="Activar decisiones en streaming"
+    )
+    parser.add_argument(
+        "--no-coalesce",
+        action="store_true",
+        help="No agrupar decisiones idénticas en vuelo",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        help="Peticiones por segundo del limitador (0 = sin límite; "
+        "por defecto el de openai_config.json)",
+    )
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    config_path = write_config(args.rate_limit) if args.rate_limit is not None else None
+    try:
+        with server_from_args(args) as server:
+            client = ChatGPTClient(
+                api_key="fake-key",
+                config_path=config_path,
+                difficulty=args.difficulty,
+                model_id=args.model,
+                api_base=server.url,
+            )
+            results = measure(client, server, args)
+    finally:
+        if config_path:
+            os.remove(config_path)
+    if results is None:
+        print("No se pudo inicializar ChatGPTClient (¿está instalado openai?)")
+        sys.exit(1)
+    latencies, elapsed, stats, client_stats, rate_limit = results
+    summary = summarize_latencies([l * 1000 for l in latencies])
+    throughput = args.requests / elapsed if elapsed > 0 else 0.0
+
+    print(
+        f"Llamada: {args.call}  peticiones: {args.requests}  concurrencia: {args.concurrency}"
+    )
+    print(f"Servidor: latencia {args.latency}, errores {args.error_rate:.0%}")
+    print(f"Límite de peticiones: {f'{rate_limit:g}/s' if rate_limit else 'desactivado'}")
+    print(
+        f"Latencia (ms): media {summary['mean']:.1f}  p50 {summary['p50']:.1f}  "
+        f"p95 {summary['p95']:.1f}  p99 {summary['p99']:.1f}  máx {summary['max']:.1f}"
+    )
+    print(f"Rendimiento: {throughput:.1f} llamadas/s en {elapsed:.2f} s")
+    print(f"Servidor: {stats}")
+    for site, site_stats in client_stats.items():
+        print(
+            f"Cliente [{site}]: llamadas {site_stats['calls']}  ok {site_stats['ok']}  "
+            f"timeouts {site_stats['timeouts']}  errores {site_stats['errors']}  "
+            f"cortocircuito {site_stats['circuit_open']}  "
+            f"fallos de análisis {site_stats['parse_failures']}  "
+            f"agrupadas {site_stats['coalesced']}  "
+            f"tokens {site_stats['prompt_tokens']}+{site_stats['completion_tokens']}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(
+                {
+                    "args": vars(args),
+                    "latency_ms": summary,
+                    "rate_limit_per_sec": rate_limit,
+                    "throughput": throughput,
+                    "elapsed": elapsed,
+                    "server": stats,
+                    "telemetry": client_stats,
+                },
+                f,
+                indent=4,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Prueba de carga del modo de batalla grande: una horda de cientos de enemigos sin
+ventana real. Mide el tiempo por frame del render, el de un turno enemigo en
+bloque y el de las consultas de selección (TAB y clic).
+
+Uso:
+    python benchmarks/large_battle_bench.py --enemies 500 --frames 200
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+# Sin ventana ni audio reales: el benchmark debe poder correr en cualquier máquina
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from src.characters import CharacterType
+from src.engine import GameEngine, screen
+from src.ui import enemy_at, enemy_center
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga de batallas grandes")
+    parser.add_argument("--enemies", type=int, default=500)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--ai-model", default="local")
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    engine = GameEngine(
+        screen,
+        {"difficulty": "Normal", "ai_model": args.ai_model, "horde_size": args.enemies},
+    )
+    game_state = engine.game_state
+    # El jugador aguanta toda la prueba
+    game_state.player.max_health = game_state.player.health = 10**9
+    # Sin pausas de la Curandera entre turnos
+    engine.handle_ally_turn = lambda: None
+
+    frame_ms = []
+    for i in range(args.frames):
+        game_state.enemy_scroll = i % 8
+        start = time.perf_counter()
+        engine.render()
+        frame_ms.append((time.perf_counter() - start) * 1000)
+
+    turn_ms = []
+    for _ in range(args.turns):
+        game_state.current_turn = CharacterType.ENEMY
+        start = time.perf_counter()
+        engine.handle_enemy_turn()
+        turn_ms.append((time.perf_counter() - start) * 1000)
+
+    size = screen.get_size()
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.handle_player_input(pygame.K_TAB)
+        enemy_at(game_state, enemy_center(game_state, game_state.selected_enemy, size), size)
+    select_us = (time.perf_counter() - start) / 1000 * 1e6
+
+    results = {
+        "enemies": args.enemies,
+        "frame_ms_mean": statistics.mean(frame_ms),
+        "frame_ms_p95": percentile(frame_ms, 95),
+        "fps": 1000 / statistics.mean(frame_ms),
+        "enemy_turn_ms_mean": statistics.mean(turn_ms),
+        "select_us": select_us,
+    }
+    print(
+        f"{args.enemies} enemigos: render {results['frame_ms_mean']:.2f} ms/frame "
+        f"(p95 {results['frame_ms_p95']:.2f}, {results['fps']:.0f} fps)  "
+        f"turno enemigo {results['enemy_turn_ms_mean']:.1f} ms  "
+        f"selección {select_us:.1f} µs"
+    )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compara el prompt de decisión detallado con el compacto (src/ai/prompt_builder.py):
+tokens de entrada, parte fija cacheable y tiempo de construcción.
+
+Uso:
+    python benchmarks/prompt_bench.py --enemies 3 --budget 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.ai_latency_bench import SAMPLE_ACTIONS, SAMPLE_GAME_STATE
+from src.ai.chatgpt_client import ChatGPTClient
+from src.ai.prompt_builder import count_message_tokens, count_tokens
+
+
+def make_state(enemies):
+    """Estado de ejemplo con el número de enemigos pedido"""
+    state = dict(SAMPLE_GAME_STATE)
+    base = SAMPLE_GAME_STATE["enemies"]
+    state["enemies"] = [
+        dict(base[i % len(base)], name=f"{base[i % len(base)]['name']} {i + 1}")
+        for i in range(enemies)
+    ]
+    return state
+
+
+def measure(client, state, prompt_format, iterations):
+    client.config["prompt_format"] = prompt_format
+    messages = client._build_decision_messages(state, SAMPLE_ACTIONS)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        client._build_decision_messages(state, SAMPLE_ACTIONS)
+    build_us = (time.perf_counter() - start) / iterations * 1e6
+    return {
+        "tokens": count_message_tokens(messages, client.config["model"]),
+        "system_tokens": count_tokens(messages[0]["content"], client.config["model"]),
+        "build_us": build_us,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokens del prompt de decisión")
+    parser.add_argument("--enemies", type=int, default=3)
+    parser.add_argument("--difficulty", default="Normal")
+    parser.add_argument("--budget", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    client = ChatGPTClient(api_key="fake-key", difficulty=args.difficulty)
+    client.prompt_builder.token_budget = args.budget
+    state = make_state(args.enemies)
+
+    results = {
+        fmt: measure(client, state, fmt, args.iterations) for fmt in ("verbose", "compact")
+    }
+    built = client.prompt_builder.build(state, SAMPLE_ACTIONS)
+
+    for fmt, r in results.items():
+        print(
+            f"{fmt:8s} tokens {r['tokens']:4d}  (sistema {r['system_tokens']:3d})  "
+            f"construcción {r['build_us']:.1f} µs"
+        )
+    saved = 1 - results["compact"]["tokens"] / results["verbose"]["tokens"]
+    print(f"Ahorro: {saved:.0%}  presupuesto {args.budget}  recortes {built.trimmed or '-'}")
+    print("--- prompt compacto ---")
+    print(built.messages[1]["content"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(
+                {"args": vars(args), "results": results, "trimmed": built.trimmed},
+                f,
+                indent=4,
+            )
+
+
+if __name__ == "__main__":
+    main()
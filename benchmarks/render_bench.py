@@ -0,0 +1,349 @@
+"""
+Benchmark de render sin pantalla: dibuja escenas fijas N frames con el driver
+dummy de SDL y compara el resultado con una línea base guardada.
+
+Escenas: menú principal, menú de opciones, cada página del tutorial, combate
+con los 3 enemigos del tutorial y el jefe final. Por escena se mide:
+
+    ms/frame        media, p50, p95 y máximo (sin tracemalloc); p50 es la
+                    mediana del mejor de 4 bloques seguidos de frames
+    frame_ratio     ms/frame de la escena entre los de una escena de
+                    referencia que solo usa pygame (rejilla de sprites con
+                    alfa, texto y círculos), medidas por bloques alternos en el
+                    mismo proceso; es la mediana de los cocientes por bloque
+    alloc KiB/frame pico de memoria de Python reservada dentro de un frame
+                    (tracemalloc, en una pasada aparte)
+    blocks/frame    bloques de memoria de Python que quedan vivos tras el frame
+    rss KiB         pico de memoria residente del proceso al dibujar la escena
+                    (incluye los píxeles de las superficies de SDL); cada escena
+                    corre en su propio proceso para que el pico sea solo suyo
+
+Con --baseline se compara con un JSON anterior y el proceso termina con código 1
+si alguna escena empeora más de --tolerance; con --update-baseline se guarda el
+resultado como nueva línea base. Los ms/frame absolutos dependen de la máquina
+y de su carga, así que el tiempo se compara con frame_ratio: una máquina el
+doble de lenta, o un pico de carga, frena igual a la escena y a la referencia
+que se mide justo antes o después. La memoria reservada por frame se compara
+tal cual; el pico de memoria residente depende de las bibliotecas y solo se
+compara si la línea base se grabó en la misma plataforma (sistema,
+arquitectura, Python y pygame).
+
+Uso:
+    python benchmarks/render_bench.py --frames 200
+    python benchmarks/render_bench.py --baseline benchmarks/render_baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Sin ventana ni audio reales: el benchmark debe poder correr en cualquier máquina
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+os.environ.setdefault("RPG_LOG_LEVEL", "ERROR")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "render_baseline.json")
+# Versión de la escena de referencia: si cambia, las líneas base anteriores no sirven
+REFERENCE_VERSION = 1
+# Bloques alternos escena/referencia para frame_ratio
+RATIO_BLOCKS = 8
+# Métricas que se comparan con la línea base (más alto = peor)
+GATED = ("frame_ratio", "alloc_kib_per_frame", "rss_peak_kib")
+# Las que solo se comparan con una línea base de la misma plataforma
+PLATFORM_GATED = ("rss_peak_kib",)
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def scene_names():
+    import pygame
+
+    from src.tutorial import Tutorial
+
+    pygame.init()
+    pages = Tutorial(pygame.display.set_mode((1024, 768))).max_steps
+    pygame.quit()
+    return (
+        ["main_menu", "options_menu"]
+        + [f"tutorial_{i + 1}" for i in range(pages)]
+        + ["combat", "boss"]
+    )
+
+
+def build_scene(name, screen):
+    """Devuelve una función que dibuja un frame de la escena"""
+    config = {"difficulty": "Normal", "ai_model": "local", "ally_controller": "rules"}
+    if name == "main_menu":
+        from src.menu import MainMenu
+
+        menu = MainMenu(screen)
+        menu.wisdom_visible = True
+        menu.wisdom_opacity = 255
+        return menu.draw
+    if name == "options_menu":
+        from src.menu import OptionsMenu
+
+        return OptionsMenu(screen).draw
+    if name.startswith("tutorial_"):
+        from src.tutorial import Tutorial
+
+        tutorial = Tutorial(screen)
+        tutorial.current_step = int(name.split("_")[1]) - 1
+        return tutorial.draw
+
+    from src.engine import GameEngine
+
+    engine = GameEngine(screen, config)
+    if name == "boss":
+        from src.scenarios import load_scenario
+
+        engine.game_state.enemies = []
+        load_scenario(engine.game_state, "boss")
+    return engine.render
+
+
+def build_reference(screen):
+    """Escena de referencia: solo pygame, sin código del juego"""
+    import pygame
+
+    font = pygame.font.Font(None, 28)
+    tile = pygame.Surface((32, 32), pygame.SRCALPHA)
+    tile.fill((120, 80, 200, 160))
+    lines = [f"Texto de referencia {i}" for i in range(12)]
+
+    def draw():
+        screen.fill((20, 20, 30))
+        for y in range(0, screen.get_height(), 32):
+            for x in range(0, screen.get_width(), 32):
+                screen.blit(tile, (x, y))
+        for i, line in enumerate(lines):
+            screen.blit(font.render(line, True, (230, 230, 230)), (40, 40 + i * 30))
+        for i in range(30):
+            pygame.draw.circle(screen, (200, 60, 60), (30 * i + 20, 600), 12)
+
+    return draw
+
+
+def time_frames(draw, frames):
+    """ms de cada uno de `frames` frames seguidos"""
+    frame_ms = []
+    for _ in range(frames):
+        start = time.perf_counter_ns()
+        draw()
+        frame_ms.append((time.perf_counter_ns() - start) / 1e6)
+    return frame_ms
+
+
+def peak_rss_kib():
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss está en KiB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def best_block_median(values, blocks=4):
+    """Mediana del bloque más rápido de frames consecutivos"""
+    size = max(1, len(values) // blocks)
+    return min(
+        statistics.median(values[i : i + size]) for i in range(0, len(values) - size + 1, size)
+    )
+
+
+def run_scene(name, frames, warmup):
+    """Mide una escena en este proceso"""
+    import pygame
+
+    pygame.init()
+    screen = pygame.display.set_mode((1024, 768))
+    random.seed(0)
+    draw = build_scene(name, screen)
+    reference = build_reference(screen)
+    for _ in range(warmup):
+        reference()
+        draw()
+    rss_before = peak_rss_kib()
+
+    # Bloques alternos: cada bloque de la escena se divide entre el de la
+    # referencia medido justo después, con la máquina en el mismo estado
+    frame_ms = []
+    ratios = []
+    size = max(1, frames // RATIO_BLOCKS)
+    for first in range(0, frames, size):
+        block = time_frames(draw, min(size, frames - first))
+        ref_block = time_frames(reference, len(block))
+        frame_ms.extend(block)
+        ratios.append(statistics.median(block) / statistics.median(ref_block))
+
+    # Pasada aparte con tracemalloc: su coste no entra en los tiempos
+    alloc_kib = []
+    blocks = []
+    tracemalloc.start()
+    for _ in range(max(1, frames // 4)):
+        tracemalloc.reset_peak()
+        before_blocks = sys.getallocatedblocks()
+        base, _ = tracemalloc.get_traced_memory()
+        draw()
+        _, peak = tracemalloc.get_traced_memory()
+        alloc_kib.append((peak - base) / 1024)
+        blocks.append(sys.getallocatedblocks() - before_blocks)
+    tracemalloc.stop()
+
+    rss_peak = peak_rss_kib()
+    return {
+        "frames": frames,
+        "frame_ms_mean": statistics.mean(frame_ms),
+        "frame_ms_p50": best_block_median(frame_ms),
+        "frame_ms_p95": percentile(frame_ms, 95),
+        "frame_ms_max": max(frame_ms),
+        "fps": 1000 / statistics.mean(frame_ms),
+        "frame_ratio": statistics.median(ratios),
+        "alloc_kib_per_frame": statistics.mean(alloc_kib),
+        "blocks_per_frame": statistics.mean(blocks),
+        "rss_peak_kib": rss_peak,
+        "rss_growth_kib": rss_peak - rss_before if rss_peak is not None else None,
+    }
+
+
+def platform_info():
+    """Plataforma en la que se mide (de ella dependen los valores absolutos)"""
+    import pygame
+
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+    }
+
+
+def run_isolated(name, frames, warmup):
+    """Mide una escena en un proceso nuevo (pico de memoria propio)"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--worker",
+            name,
+            "--frames",
+            str(frames),
+            "--warmup",
+            str(warmup),
+        ],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"La escena {name} falló:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance, same_platform=True):
+    """Lista de (escena, métrica, base, actual) que empeoran más de la tolerancia"""
+    metrics = [m for m in GATED if same_platform or m not in PLATFORM_GATED]
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in metrics:
+            before, after = base.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            # Margen absoluto para valores casi nulos (ruido de medida)
+            if after > before * (1 + tolerance) and after - before > 0.05:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de render sin pantalla")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--scenes", help="Escenas separadas por comas (por defecto todas)")
+    parser.add_argument(
+        "--baseline", nargs="?", const=DEFAULT_BASELINE, help="Comparar con esta línea base"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Guardar el resultado como línea base"
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="Empeoramiento admitido (0.25 = 25%%)"
+    )
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_scene(args.worker, args.frames, args.warmup)))
+        return
+
+    names = args.scenes.split(",") if args.scenes else scene_names()
+    results = {}
+    for name in names:
+        r = results[name] = run_isolated(name, args.frames, args.warmup)
+        rss = f"{r['rss_peak_kib'] / 1024:6.1f} MiB" if r["rss_peak_kib"] else "     -"
+        print(
+            f"{name:14s} {r['frame_ms_mean']:7.2f} ms/frame (p95 {r['frame_ms_p95']:6.2f}, "
+            f"{r['fps']:6.0f} fps, x{r['frame_ratio']:.2f} ref)  "
+            f"{r['alloc_kib_per_frame']:7.1f} KiB/frame  "
+            f"{r['blocks_per_frame']:+6.1f} bloques  rss {rss}"
+        )
+    host = platform_info()
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "platform": host, "results": results}, f, indent=4)
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(
+                {"platform": host, "reference": REFERENCE_VERSION, "scenes": results},
+                f,
+                indent=4,
+            )
+        print(f"Línea base guardada en {baseline_path}")
+        return
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if "scenes" not in baseline or baseline.get("reference") != REFERENCE_VERSION:
+            print(
+                f"{args.baseline} es de otra versión de la referencia; "
+                "grábala de nuevo con --update-baseline"
+            )
+            sys.exit(2)
+        same_platform = baseline.get("platform") == host
+        if not same_platform:
+            print(
+                f"Línea base grabada en {baseline.get('platform')}; aquí {host}: "
+                "solo se comparan frame_ratio y la memoria de Python"
+            )
+        regressions = compare(results, baseline["scenes"], args.tolerance, same_platform)
+        for name, metric, before, after in regressions:
+            print(f"REGRESIÓN {name} {metric}: {before:.2f} -> {after:.2f}")
+        if regressions:
+            sys.exit(1)
+        print(f"Sin regresiones respecto a {args.baseline} (tolerancia {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark de arranque: mide cuánto tarda en importarse el punto de entrada del
+juego y genera un resumen de `python -X importtime`.
+
+Uso:
+    python benchmarks/startup_bench.py [--module main] [--runs 5] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_import(module):
+    """Importa el módulo en un proceso nuevo con -X importtime y devuelve (segundos, stderr)"""
+    env = dict(os.environ)
+    # Sin ventana ni audio reales: el benchmark debe poder correr en cualquier máquina
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}:\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr):
+    """Convierte la salida de -X importtime en una lista de (módulo, propio_us, acumulado_us, nivel)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        level = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return entries
+
+
+def summarize(entries, top):
+    """Resume los módulos importados: total, los más costosos y los paquetes de primer nivel"""
+    total_us = sum(cumulative for _, _, cumulative, level in entries if level == 0)
+    modules = {name for name, _, _, _ in entries}
+
+    by_self = sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+    by_cumulative = sorted(
+        (e for e in entries if e[3] <= 1), key=lambda e: e[2], reverse=True
+    )[:top]
+
+    return {
+        "total_ms": total_us / 1000,
+        "module_count": len(modules),
+        "openai_imported": any(
+            name == "openai" or name.startswith("openai.") for name in modules
+        ),
+        "top_self": [(name, us / 1000) for name, us, _, _ in by_self],
+        "top_cumulative": [(name, us / 1000) for name, _, us, _ in by_cumulative],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de tiempo de arranque")
+    parser.add_argument("--module", default="main", help="Módulo a importar")
+    parser.add_argument("--runs", type=int, default=5, help="Número de repeticiones")
+    parser.add_argument("--top", type=int, default=15, help="Módulos a listar")
+    parser.add_argument("--json", dest="json_path", help="Guardar el resumen en JSON")
+    args = parser.parse_args()
+
+    wall_times = []
+    import_totals = []
+    summary = None
+    for _ in range(args.runs):
+        elapsed, stderr = run_import(args.module)
+        summary = summarize(parse_importtime(stderr), args.top)
+        wall_times.append(elapsed * 1000)
+        import_totals.append(summary["total_ms"])
+
+    print(f"Módulo: {args.module} ({args.runs} ejecuciones)")
+    print(f"  Proceso completo (mediana): {statistics.median(wall_times):8.1f} ms")
+    print(f"  Importaciones (mediana):    {statistics.median(import_totals):8.1f} ms")
+    print(f"  Módulos importados:         {summary['module_count']}")
+    print(f"  SDK de OpenAI importado:    {'sí' if summary['openai_imported'] else 'no'}")
+
+    print("\nMayor tiempo acumulado (paquetes de primer nivel):")
+    for name, ms in summary["top_cumulative"]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    print("\nMayor tiempo propio:")
+    for name, ms in summary["top_self"]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    if args.json_path:
+        report = {
+            "module": args.module,
+            "runs": args.runs,
+            "wall_ms": wall_times,
+            "import_ms": import_totals,
+            "summary": summary,
+        }
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,105 @@
+import argparse
+import json
 import pygame
+import random
 import sys
 import os
 from src.engine import GameEngine
-from src.menu import MainMenu, OptionsMenu, get_config, WisdomGenerator
+from src.menu import MainMenu, OptionsMenu, get_config, use_memory_config, WisdomGenerator
 from src.tutorial import Tutorial
+from src.ai.chatgpt_client import preload_openai
+from src.ai.list_models import is_offline_model
+from src.utils.log import get_logger
+from src.utils.pacing import open_window
+from src.utils.profiler import profiler
+
+# Como script, __name__ es "__main__", fuera de "src": sin este nombre los
+# registros no pasarían por la cola asíncrona de src/utils/log.py
+log = get_logger("src.main")
 
 # Asegúrate que la carpeta config exista
 os.makedirs(os.path.join(os.path.dirname(__file__), "config"), exist_ok=True)
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pygame AI RPG")
+    parser.add_argument("--record", metavar="DEMO", help="Grabar la partida en este archivo")
+    parser.add_argument(
+        "--timedemo", metavar="DEMO", help="Reproducir una partida grabada lo más rápido posible"
+    )
+    parser.add_argument("--seed", type=int, help="Semilla aleatoria de la grabación")
+    parser.add_argument("--json", dest="json_path", help="Guardar el informe de --timedemo en JSON")
+    return parser.parse_args(argv)
+
+
+def start_demo(args):
+    """Grabación o reproducción de partida (src/utils/timedemo.py), o None"""
+    from src.utils.timedemo import DEMO_CONFIG, DemoPlayer, InputRecorder
+
+    if args.timedemo:
+        demo = DemoPlayer.load(args.timedemo)
+    elif args.record:
+        seed = args.seed if args.seed is not None else random.randrange(2**31)
+        demo = InputRecorder(args.record, seed, dict(get_config(), **DEMO_CONFIG))
+    else:
+        return None
+    use_memory_config(demo.config)
+    demo.install()
+    return demo
+
+
+def finish_demo(demo, args):
+    if demo is None:
+        return
+    report = demo.finish()
+    if report is None:
+        return
+    from src.utils.timedemo import print_report
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"demo": args.timedemo, "results": report}, f, indent=4)
+
+
+def main(args=None):
     """Función principal del juego"""
+    args = args or parse_args()
+    demo = start_demo(args)
+    try:
+        run_game(demo)
+    finally:
+        finish_demo(demo, args)
+
+    # Limpiar y salir al final del programa
+    pygame.quit()
+    sys.exit()
+
+
+def run_game(demo=None):
+    """Bucle de estados del juego (menú, partida, tutorial y opciones)"""
     # Inicializar pygame dentro de la función main
     pygame.init()
 
     # Configurar pantalla
     SCREEN_WIDTH = 1024
     SCREEN_HEIGHT = 768
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Configuración
+    config = get_config()
+
+    screen = open_window((SCREEN_WIDTH, SCREEN_HEIGHT), config.get("vsync"))
     pygame.display.set_caption("Pygame AI RPG")
 
     # Variables de estado
     game_state = "MENU"  # MENU, PLAY, TUTORIAL, OPTIONS, QUIT
 
-    # Configuración
-    config = get_config()
+    # Perfilador de frames (F3 lo muestra u oculta en cualquier pantalla)
+    if config.get("profiler"):
+        profiler.set_enabled(True)
+
+    # Importar el SDK de OpenAI en segundo plano mientras se muestra el menú
+    if not is_offline_model(config["ai_model"]):
+        preload_openai()
 
     # Generar la frase sabia UNA SOLA VEZ al iniciar el juego
     wisdom_generator = WisdomGenerator(model_id=config["ai_model"])
@@ -33,6 +108,8 @@ def main():
     # Bucle principal
     running = True
     while running:
+        if demo is not None:
+            demo.enter_scene(game_state)
         try:
             if game_state == "MENU":
                 # Mostrar menú principal
@@ -50,14 +127,20 @@ def main():
 
             elif game_state == "PLAY":
                 game_engine = GameEngine(screen, config)
+                if demo is not None:
+                    # El combate se desglosa por bioma (tutorial y jefe)
+                    demo.enter_scene(
+                        "PLAY",
+                        lambda: getattr(game_engine.game_state, "current_biome", "tutorial"),
+                    )
                 victory = game_engine.run()
                 game_state = "MENU"
 
             elif game_state == "TUTORIAL":
                 tutorial = Tutorial(screen)
                 next_state = tutorial.run()
-                # Solamente cambiar el estado si no es None
-                if next_state:
+                # Solamente cambiar el estado si no es None ("BACK" vuelve al menú)
+                if next_state and next_state != "BACK":
                     game_state = next_state
                 else:
                     game_state = "MENU"
@@ -74,20 +157,16 @@ def main():
 
             elif game_state == "QUIT":
                 running = False
-        except Exception as e:
-            print(f"Error en el bucle de juego: {e}")
+        except Exception:
+            log.exception("Error en el bucle de juego")
             # Si hay un error, volver al menú principal
             game_state = "MENU"
 
-    # Limpiar y salir al final del programa
-    pygame.quit()
-    sys.exit()
-
 
 if __name__ == "__main__":
     try:
         main()
-    except Exception as e:
-        print(f"Error fatal: {e}")
+    except Exception:
+        log.exception("Error fatal")
         pygame.quit()
         sys.exit(1)
@@ -1,6 +1,10 @@
 import random
 import pygame
 
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
 # Colores para los mensajes
 RED = (200, 0, 0)
 GREEN = (50, 205, 50)
@@ -14,8 +18,13 @@ def roll_dice(dice, sides):
     return sum(random.randint(1, sides) for _ in range(dice))
 
 
-def execute_attack(game_state, attacker, defender, attack_name):
-    """Ejecuta un ataque de un personaje a otro"""
+def execute_attack(game_state, attacker, defender, attack_name, animate=True):
+    """
+    Ejecuta un ataque de un personaje a otro
+
+    Con animate=False no se muestra la animación (turnos en bloque de las
+    batallas grandes).
+    """
     # Verificar que el ataque existe
     if attack_name not in attacker.attacks:
         game_state.add_message(f"¡Ataque {attack_name} no disponible!", RED)
@@ -47,19 +56,20 @@ def execute_attack(game_state, attacker, defender, attack_name):
     # Mostrar efecto visual del ataque
     attacker.game_state = game_state
     defender.game_state = game_state
-    from src.ui import show_attack_effect
+    if animate:
+        from src.ui import show_attack_effect
 
-    try:
-        show_attack_effect(
-            pygame.display.get_surface(),
-            attacker,
-            defender,
-            attack_name,
-            actual_damage,
-            attack_type,
-        )
-    except Exception as e:
-        print(f"Error mostrando efecto visual: {e}")
+        try:
+            show_attack_effect(
+                pygame.display.get_surface(),
+                attacker,
+                defender,
+                attack_name,
+                actual_damage,
+                attack_type,
+            )
+        except Exception as e:
+            log.warning("Error mostrando efecto visual", error=str(e))
 
     # Efectos especiales según el tipo de ataque
     apply_attack_effects(
@@ -131,8 +141,7 @@ def apply_attack_effects(
 def check_defender_death(game_state, defender):
     """Verifica si el defensor murió y actualiza el estado del juego"""
     if defender.health <= 0:
-        if defender in game_state.enemies:
-            game_state.enemies.remove(defender)
+        if game_state.remove_enemy(defender):
             game_state.add_message(f"{defender.name} ha sido derrotado!", RED)
 
             # Asegurarse de que selected_enemy esté dentro del rango
@@ -147,47 +156,70 @@ def check_defender_death(game_state, defender):
             game_state.add_message(f"{defender.name} ha caído en batalla", RED)
 
 
-def perform_ally_action(game_state):
-    """Realiza la acción del aliado controlada por IA"""
+def heal_character(game_state, healer, target, attack_name):
+    """Aplica una habilidad de curación del aliado sobre `target`"""
+    heal_amount = healer.attacks[attack_name]["heal"]
+
+    old_health = target.health
+    target.health = min(target.max_health, target.health + heal_amount)
+    actual_heal = target.health - old_health
+
+    game_state.add_message(
+        f"{healer.name} --> {target.name} {{+{actual_heal} HP - {attack_name}}}",
+        GREEN,
+    )
+
+    # Mostrar efecto visual de curación
+    from src.ui import show_attack_effect
+
+    try:
+        show_attack_effect(
+            pygame.display.get_surface(),
+            healer,
+            target,
+            attack_name,
+            -actual_heal,  # Negativo para indicar curación
+            "healing",
+        )
+    except Exception as e:
+        log.warning("Error mostrando efecto visual", error=str(e))
+
+    # Curaciones con efecto (Bendición)
+    apply_attack_effects(game_state, healer, target, attack_name, 0, 0)
+
+
+def perform_ally_action(game_state, controller=None):
+    """
+    Realiza la acción del aliado controlada por IA
+
+    Con `controller` (src/ai/ally_controller.py) decide el controlador; sin él
+    se usan las reglas fijas.
+    """
     if not game_state.ally or not game_state.ally.is_alive():
         return
 
     attacker = game_state.ally
 
+    if controller is not None:
+        from src.sim.rules import CombatState
+
+        action = controller.decide(CombatState.from_game_state(game_state))
+        if action is None:
+            return
+        kind, attack_name, target = action
+        if kind == "heal":
+            healed = game_state.player if target == "player" else attacker
+            heal_character(game_state, attacker, healed, attack_name)
+        else:
+            execute_attack(game_state, attacker, game_state.enemies[target], attack_name)
+        return
+
     # Evaluar la situación para tomar decisiones inteligentes
     player_health_ratio = game_state.player.health / game_state.player.max_health
 
     # Si el jugador está muy herido, priorizar curación
     if player_health_ratio < 0.4 and "Toque Curativo" in attacker.attacks:
-        attack_name = "Toque Curativo"
-        heal_amount = attacker.attacks[attack_name]["heal"]
-
-        # Aplicar curación al jugador
-        old_health = game_state.player.health
-        game_state.player.health = min(
-            game_state.player.max_health, game_state.player.health + heal_amount
-        )
-        actual_heal = game_state.player.health - old_health
-
-        game_state.add_message(
-            f"{attacker.name} --> {game_state.player.name} {{+{actual_heal} HP - {attack_name}}}",
-            GREEN,
-        )
-
-        # Mostrar efecto visual de curación
-        from src.ui import show_attack_effect
-
-        try:
-            show_attack_effect(
-                pygame.display.get_surface(),
-                attacker,
-                game_state.player,
-                attack_name,
-                -actual_heal,  # Negativo para indicar curación
-                "healing",
-            )
-        except Exception as e:
-            print(f"Error mostrando efecto visual: {e}")
+        heal_character(game_state, attacker, game_state.player, "Toque Curativo")
 
     # Si el jugador está en estado decente, el aliado ataca
     elif len(game_state.enemies) > 0:
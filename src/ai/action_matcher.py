@@ -0,0 +1,65 @@
+"""
+Detección incremental de acciones en respuestas de IA recibidas en streaming
+"""
+
+
+class StreamingActionMatcher:
+    """
+    Acumula los fragmentos de una respuesta en streaming y detecta en cuanto
+    aparece el nombre de una acción disponible sin ambigüedad.
+
+    Una acción es inequívoca cuando ya está escrita por completo en el texto y
+    ninguna otra acción podría terminar ganándole con lo que falta por llegar:
+    por ejemplo, "Flecha" no se confirma mientras el texto aún pueda continuar
+    como "Flecha Venenosa".
+    """
+
+    def __init__(self, available_actions):
+        self.actions = [(action, action.lower()) for action in available_actions]
+        self.text = ""
+        self.decision = None
+
+    def feed(self, chunk):
+        """Añade un fragmento de texto y devuelve la acción si ya es inequívoca"""
+        if self.decision is None and chunk:
+            self.text += chunk
+            self.decision = self._match()
+        return self.decision
+
+    def _match(self):
+        text = self.text.lower()
+
+        # Acción completa que aparece antes (y la más larga si empiezan igual)
+        best, best_pos, best_len = None, -1, 0
+        for action, lowered in self.actions:
+            pos = text.find(lowered)
+            if pos == -1:
+                continue
+            if best is None or pos < best_pos or (
+                pos == best_pos and len(lowered) > best_len
+            ):
+                best, best_pos, best_len = action, pos, len(lowered)
+
+        if best is None:
+            return None
+
+        # Comprobar si otra acción está a medio escribir al final del texto y
+        # ganaría a la encontrada si se completara
+        for action, lowered in self.actions:
+            if action == best:
+                continue
+            start = self._partial_start(text, lowered)
+            if start is None:
+                continue
+            if start < best_pos or (start == best_pos and len(lowered) > best_len):
+                return None
+
+        return best
+
+    @staticmethod
+    def _partial_start(text, lowered):
+        """Posición donde empieza un prefijo propio de la acción que termina el texto"""
+        for size in range(min(len(lowered) - 1, len(text)), 0, -1):
+            if text.endswith(lowered[:size]):
+                return len(text) - size
+        return None
@@ -0,0 +1,160 @@
+"""
+Controladores intercambiables para la Curandera.
+
+    - "rules": las reglas fijas de perform_ally_action (curar por debajo del 40%,
+      Proyectil Mágico contra enemigos débiles, Agua Bendita contra fuertes...).
+    - "lookahead": valora cada acción posible por valor esperado mirando varios
+      turnos por delante (src/ai/planner.py) dentro de un presupuesto de tiempo,
+      con las mismas distribuciones de daño cacheadas.
+
+Todos deciden sobre un CombatState (src/sim/rules.py) y devuelven una acción
+("heal", ataque, "player"/"ally"), ("attack", ataque, índice de enemigo) o None.
+
+Modo de evaluación por lotes, para comparar políticas sobre los mismos combates:
+    python -m src.ai.ally_controller --battles 200 --controllers rules,lookahead
+"""
+
+import argparse
+import json
+import random
+
+from src.ai.planner import EnemyPlanner
+from src.sim.rules import ally_actions, default_ally_action
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Nodos por decisión del controlador lookahead en simulaciones con semilla
+# (unos 10 ms en una máquina de escritorio): el resultado no depende de la carga
+SIM_NODE_BUDGET = 60
+
+
+class RuleAllyController:
+    """Las reglas fijas de src/abilities.py"""
+
+    name = "rules"
+
+    def decide(self, state):
+        return default_ally_action(state)
+
+
+class LookaheadAllyController:
+    """
+    Elige la acción del aliado que minimiza el valor esperado para los enemigos
+
+    Args:
+        budget_ms: Milisegundos por decisión
+        max_depth: Máximo de acciones por delante
+        buckets: Tramos en que se resume cada distribución de daño
+        node_budget: Nodos por decisión en lugar de milisegundos (reproducible)
+    """
+
+    name = "lookahead"
+
+    def __init__(self, budget_ms=10, max_depth=12, buckets=2, node_budget=None):
+        # En los turnos futuros el aliado sigue las reglas fijas
+        self.planner = EnemyPlanner(
+            budget_ms=budget_ms,
+            max_depth=max_depth,
+            buckets=buckets,
+            node_budget=node_budget,
+        )
+
+    def decide(self, state):
+        actions = ally_actions(state)
+        if not actions or not state.enemies:
+            return None
+        action, _, _ = self.planner.search_actions(
+            state, state.ally, actions, ("ally", 0), min
+        )
+        return action
+
+
+ALLY_CONTROLLERS = {
+    "rules": RuleAllyController,
+    "lookahead": LookaheadAllyController,
+}
+
+
+def create_ally_controller(name="rules", **kwargs):
+    """Crea un controlador por nombre (las reglas fijas si no se conoce)"""
+    if name not in ALLY_CONTROLLERS:
+        log.warning("Controlador de aliado desconocido; usando reglas fijas", controller=name)
+        name = "rules"
+    return ALLY_CONTROLLERS[name](**kwargs)
+
+
+def compare_controllers(controllers, battles=100, seed=0, scenario="tutorial"):
+    """
+    Juega `battles` combates simulados con cada controlador. El combate i usa la
+    misma semilla para todos, así las diferencias no vienen de la suerte inicial.
+    """
+    from src.sim.battle import initial_state, simulate_battle
+
+    template = initial_state(scenario)
+    results = {}
+    for controller in controllers:
+        totals = {"victories": 0, "rounds": 0, "player_health": 0, "ally_alive": 0}
+        totals.update({"potions_used": 0, "ally_ms": 0.0, "decisions": 0})
+        for i in range(battles):
+            rng = random.Random(seed * 1_000_003 + i)
+            result = simulate_battle(template.copy(), controller, rng)
+            totals["victories"] += result["victory"]
+            totals["ally_alive"] += result["ally_alive"]
+            totals["rounds"] += result["rounds"]
+            totals["player_health"] += result["player_health"]
+            totals["potions_used"] += result["potions_used"]
+            totals["ally_ms"] += result["ally_ms"]
+            totals["decisions"] += result["ally_decisions"]
+        results[controller.name] = {
+            "battles": battles,
+            "win_rate": totals["victories"] / battles,
+            "ally_survival": totals["ally_alive"] / battles,
+            "mean_rounds": totals["rounds"] / battles,
+            "mean_player_health": totals["player_health"] / battles,
+            "mean_potions_used": totals["potions_used"] / battles,
+            "decide_ms": totals["ally_ms"] / max(1, totals["decisions"]),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar políticas del aliado")
+    parser.add_argument("--battles", type=int, default=200)
+    parser.add_argument("--controllers", default="rules,lookahead")
+    parser.add_argument("--scenario", default="tutorial")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--budget-ms", type=float, default=5, help="Presupuesto del controlador lookahead"
+    )
+    parser.add_argument(
+        "--node-budget",
+        type=int,
+        default=None,
+        help="Nodos por decisión del controlador lookahead (sustituye a --budget-ms)",
+    )
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    args = parser.parse_args()
+
+    controllers = [
+        create_ally_controller(name, budget_ms=args.budget_ms, node_budget=args.node_budget)
+        if name == "lookahead"
+        else create_ally_controller(name)
+        for name in args.controllers.split(",")
+    ]
+    results = compare_controllers(controllers, args.battles, args.seed, args.scenario)
+
+    for name, r in results.items():
+        print(
+            f"{name:10s} victorias {r['win_rate']:6.1%}  aliado vivo {r['ally_survival']:6.1%}  "
+            f"rondas {r['mean_rounds']:5.1f}  HP final {r['mean_player_health']:5.1f}  "
+            f"pociones {r['mean_potions_used']:4.2f}  decisión {r['decide_ms']:.2f} ms"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
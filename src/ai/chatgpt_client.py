@@ -1,21 +1,68 @@
 import os
 import json
 import random
+import threading
+import importlib.util
+
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+# El SDK de OpenAI tarda cientos de milisegundos en importarse, así que no se
+# importa al cargar este módulo: se carga la primera vez que hace falta una
+# llamada remota (o antes, en segundo plano, mediante preload_openai)
+_OPENAI_CLASS = None
+_OPENAI_LOCK = threading.Lock()
+
+
+def openai_available():
+    """Comprueba si el SDK de OpenAI está instalado sin llegar a importarlo"""
+    return importlib.util.find_spec("openai") is not None
 
-try:
-    from openai import OpenAI
-except ImportError:
-    print("OpenAI API no disponible. Usando modo simulado local.")
+
+def _load_openai():
+    """Importa el SDK de OpenAI bajo demanda y devuelve la clase OpenAI (o None)"""
+    global _OPENAI_CLASS
+    if _OPENAI_CLASS is None:
+        with _OPENAI_LOCK:
+            if _OPENAI_CLASS is None:
+                try:
+                    from openai import OpenAI
+
+                    _OPENAI_CLASS = OpenAI
+                except ImportError:
+                    log.warning("OpenAI API no disponible. Usando modo simulado local")
+                    _OPENAI_CLASS = False
+    return _OPENAI_CLASS or None
+
+
+def preload_openai():
+    """Importa el SDK de OpenAI en un hilo en segundo plano para no bloquear el arranque"""
+    thread = threading.Thread(target=_load_openai, daemon=True)
+    thread.start()
+    return thread
+
+
+from src.ai.action_matcher import StreamingActionMatcher
+from src.ai.coalescing import canonical_request, get_single_flight
+from src.ai.decision_log import get_decision_logger
+from src.ai.prompt_builder import PromptBuilder, count_message_tokens, count_tokens
+from src.ai.resilience import AttemptCancelled, CircuitOpenError, get_resilient_caller
+from src.ai.telemetry import telemetry
+from src.utils.metrics import AI_DECISION_SECONDS
 
 # Intentar importar modelos
 try:
-    from src.ai.list_models import get_model_info
+    from src.ai.list_models import get_model_info, get_model_info_by_id
 except ImportError:
-    print("Módulo list_models no encontrado. Usando valores por defecto.")
+    log.warning("Módulo list_models no encontrado. Usando valores por defecto")
 
     def get_model_info(model_name):
         return {"id": "gpt-3.5-turbo", "max_tokens": 100, "temperature": 0.7}
 
+    def get_model_info_by_id(model_id):
+        return None
+
 
 class ChatGPTClient:
     def __init__(
@@ -24,6 +71,7 @@ class ChatGPTClient:
         config_path=None,
         difficulty="Normal",
         model_id="gpt-3.5-turbo",
+        api_base=None,
     ):
         """
         Inicializa el cliente de ChatGPT
@@ -33,18 +81,25 @@ class ChatGPTClient:
             config_path: Ruta al archivo de configuración JSON (opcional)
             difficulty: Dificultad del juego (afecta la inteligencia de la IA)
             model_id: ID del modelo a utilizar
+            api_base: URL base de la API (opcional, sustituye a la del archivo de
+                configuración; útil para apuntar a un servidor local de pruebas)
         """
         # Guardar dificultad y modelo para ajustar comportamiento
         self.difficulty = difficulty
         self.model_id = model_id
 
-        # Si es un modelo local, usar configuración diferente
-        self.is_local = model_id == "local"
+        # Si es un modelo local (o cualquier modelo sin conexión), usar configuración diferente
+        model_info = get_model_info_by_id(model_id) or {}
+        self.is_local = model_id == "local" or bool(model_info.get("offline"))
+        self.hedger = None
+        self.offline_policy = None
+        self.planner = None
+        self.decision_log = None
 
         # Obtener API key desde parámetro o variable de entorno
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key and not self.is_local:
-            print("ADVERTENCIA: No se encontró una API key para OpenAI")
+            log.warning("No se encontró una API key para OpenAI")
             self.initialized = False
             return
 
@@ -54,6 +109,32 @@ class ChatGPTClient:
             "max_tokens": 100,
             "temperature": 0.7,
             "timeout": 30,
+            "stream_decisions": False,
+            # Resiliencia (ver src/ai/resilience.py)
+            "call_deadline": 30,
+            "max_retries": 2,
+            "rate_limit_per_sec": 5,
+            "rate_limit_burst": 10,
+            "breaker_failure_threshold": 3,
+            "breaker_reset_timeout": 30,
+            # Cobertura entre backends (ver src/ai/hedging.py)
+            "hedge_percentile": 95,
+            "hedge_min_samples": 10,
+            "hedge_initial_delay": 1.0,
+            # Archivo JSON donde volcar la telemetría al salir (vacío = no volcar)
+            "telemetry_file": "",
+            # Prompt de decisiones: "compact" (ver src/ai/prompt_builder.py) o "verbose"
+            "prompt_format": "compact",
+            "prompt_token_budget": 200,
+            # Registro .jsonl de decisiones remotas para entrenar la política destilada
+            "decision_log_file": "",
+            # Milisegundos por decisión del planificador (None = según la dificultad)
+            "planner_budget_ms": None,
+            # Nodos por decisión en lugar de milisegundos (None = por tiempo);
+            # con un valor fijo el planificador es reproducible
+            "planner_node_budget": None,
+            # Agrupar decisiones idénticas en vuelo de varias partidas (src/ai/coalescing.py)
+            "coalesce_requests": True,
         }
 
         # Cargar configuración desde archivo JSON si existe
@@ -69,39 +150,160 @@ class ChatGPTClient:
             if os.path.exists(config_path):
                 with open(config_path, "r") as f:
                     self.config.update(json.load(f))
-                print(f"Configuración cargada desde {config_path}")
+                log.info("Configuración cargada", path=config_path)
         except Exception as e:
-            print(f"No se pudo cargar la configuración desde {config_path}: {e}")
-            print("Usando configuración por defecto")
+            log.warning(
+                "No se pudo cargar la configuración; usando la configuración por defecto",
+                path=config_path,
+                error=str(e),
+            )
 
         # Sobrescribir el modelo con el seleccionado
         self.config["model"] = model_id
+        if api_base:
+            self.config["api_base"] = api_base
+
+        # Modelo en cobertura: el resto de llamadas usan el backend principal
+        backends = model_info.get("backends")
+        if backends:
+            self.config["model"] = backends[0]
+
+        if self.config.get("telemetry_file"):
+            telemetry.dump_at_exit(self.config["telemetry_file"])
+        if self.config.get("decision_log_file") and not self.is_local:
+            self.decision_log = get_decision_logger(self.config["decision_log_file"])
 
         # Ajustar parámetros según dificultad
         self._adjust_parameters_for_difficulty()
 
+        self.prompt_builder = PromptBuilder(
+            self.difficulty,
+            self.config["model"],
+            self.config.get("prompt_token_budget"),
+        )
+
         # Inicializar cliente de OpenAI o local según corresponda
         try:
             if self.is_local:
-                # Aquí iría la inicialización de un modelo local si lo implementamos
-                print("Usando modelo local")
+                if model_info.get("policy_file"):
+                    self.offline_policy = self._load_distilled_policy(
+                        model_info["policy_file"]
+                    )
+                if model_info.get("planner"):
+                    from src.ai.planner import EnemyPlanner
+
+                    self.planner = EnemyPlanner(
+                        self.difficulty,
+                        budget_ms=self.config.get("planner_budget_ms"),
+                        node_budget=self.config.get("planner_node_budget"),
+                    )
+                log.info("Usando modelo local")
                 self.initialized = True
             else:
-                self.client = OpenAI(api_key=self.api_key)
+                if not openai_available():
+                    raise ImportError("el paquete openai no está instalado")
+                # El cliente real se crea en la primera llamada remota (_get_client)
+                self.client = None
                 self.context = []
+                # Limitador, reintentos y cortocircuito compartidos por backend
+                self.resilience = get_resilient_caller(
+                    self.config.get("api_base"), self.config["model"], self.config
+                )
+                if backends:
+                    self.hedger = self._create_hedger(
+                        backends, config_path, self.config.get("api_base")
+                    )
                 self.initialized = True
 
-            print(
-                f"Cliente ChatGPT inicializado con modelo: {self.config['model']} - Dificultad: {self.difficulty}"
+            log.info(
+                "Cliente ChatGPT inicializado",
+                model=self.config["model"],
+                difficulty=self.difficulty,
             )
         except Exception as e:
-            print(f"Error inicializando cliente OpenAI: {e}")
+            log.error("Error inicializando cliente OpenAI", error=str(e))
             self.initialized = False
 
     def is_initialized(self):
         """Verifica si el cliente está inicializado correctamente"""
         return getattr(self, "initialized", False)
 
+    def _create_hedger(self, backends, config_path, api_base):
+        """Crea un cliente por backend y el HedgedDecider que los coordina"""
+        from src.ai.hedging import HedgedDecider
+
+        clients = [
+            ChatGPTClient(self.api_key, config_path, self.difficulty, backend, api_base)
+            for backend in backends[1:]
+        ]
+        return HedgedDecider(
+            [self] + [client for client in clients if client.is_initialized()],
+            hedge_percentile=self.config["hedge_percentile"],
+            min_samples=self.config["hedge_min_samples"],
+            initial_delay=self.config["hedge_initial_delay"],
+        )
+
+    def _load_distilled_policy(self, policy_file):
+        """Carga la política destilada; sin ella se usa la lógica local básica"""
+        from src.ai.distilled_policy import DistilledPolicy
+
+        if not os.path.isabs(policy_file):
+            policy_file = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(__file__))), policy_file
+            )
+        try:
+            return DistilledPolicy.load(policy_file)
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("No se pudo cargar la política destilada. Usando IA local básica", error=str(e))
+            return None
+
+    def _log_decision(self, game_state, available_actions, decision):
+        """Guarda la decisión remota como ejemplo de entrenamiento si está activado"""
+        if self.decision_log:
+            self.decision_log.log(
+                game_state, available_actions, decision, self.model_id, self.difficulty
+            )
+        return decision
+
+    def _get_client(self):
+        """Devuelve el cliente de OpenAI, importando el SDK la primera vez que se usa"""
+        if self.client is None:
+            self.client = self._new_client()
+        return self.client
+
+    def _new_client(self):
+        OpenAI = _load_openai()
+        if OpenAI is None:
+            raise RuntimeError("SDK de OpenAI no disponible")
+        # Los reintentos los gestiona la capa de resiliencia, no el SDK
+        return OpenAI(
+            api_key=self.api_key,
+            base_url=self.config.get("api_base"),
+            max_retries=0,
+        )
+
+    def _call_api(self, request):
+        """
+        Ejecuta una petición remota a través de la capa de resiliencia compartida
+
+        `request(timeout)` recibe el timeout del intento, acotado por el plazo
+        total de la llamada (call_deadline). Si el backend está marcado como
+        caído lanza CircuitOpenError sin esperar.
+        """
+        return self.resilience.call(
+            request, self.config["timeout"], self.config.get("call_deadline")
+        )
+
+    def _create_completion(self, **kwargs):
+        """Crea una chat completion pasando por _call_api y registra los tokens usados"""
+        response = self._call_api(
+            lambda timeout: self._get_client().chat.completions.create(
+                timeout=timeout, **kwargs
+            )
+        )
+        telemetry.record_usage(getattr(response, "usage", None))
+        return response
+
     def _adjust_parameters_for_difficulty(self):
         """Ajusta los parámetros de la IA según la dificultad seleccionada"""
         if self.difficulty == "Easy":
@@ -110,60 +312,235 @@ class ChatGPTClient:
             # - Menos tokens para respuestas más cortas
             self.config["temperature"] = 0.9
             self.config["max_tokens"] = 50
-            print("Modo FÁCIL: IA con decisiones más aleatorias")
+            log.debug("Modo FÁCIL: IA con decisiones más aleatorias")
         elif self.difficulty == "Hard":
             # En modo difícil, la IA es más inteligente:
             # - Temperatura más baja para decisiones más óptimas
             # - Más tokens para respuestas más detalladas y estratégicas
             self.config["temperature"] = 0.3
             self.config["max_tokens"] = 150
-            print("Modo DIFÍCIL: IA con decisiones más estratégicas")
+            log.debug("Modo DIFÍCIL: IA con decisiones más estratégicas")
         else:  # Normal
             # Configuración predeterminada para modo normal
             self.config["temperature"] = 0.7
             self.config["max_tokens"] = 100
-            print("Modo NORMAL: IA con equilibrio de decisiones")
+            log.debug("Modo NORMAL: IA con equilibrio de decisiones")
 
+    @AI_DECISION_SECONDS.time(lambda self, *args, **kwargs: (self.model_id,))
     def get_decision(self, game_state, available_actions):
         """
         Consulta a ChatGPT para obtener la mejor acción para un enemigo
         """
         if not self.is_initialized():
-            import random
-
             return random.choice(available_actions)
 
         # Si es un modelo local, usar la implementación local
         if self.is_local:
+            if self.offline_policy:
+                decision = self.offline_policy.decide(
+                    game_state, available_actions, self.difficulty
+                )
+                if decision:
+                    return decision
             return self._get_local_decision(game_state, available_actions)
 
-        # De lo contrario, usar la API normal
-        prompt = self._create_prompt(game_state, available_actions)
+        with telemetry.track("get_decision") as call:
+            # Modo cobertura: varios backends compiten por responder primero
+            if self.hedger:
+                try:
+                    return self._coalesced_decision(
+                        game_state,
+                        available_actions,
+                        lambda: self.hedger.decide(game_state, available_actions),
+                    )
+                except CircuitOpenError as e:
+                    call.fail(e)
+                    call.fallback()
+                    return self._get_local_decision(game_state, available_actions)
+                except Exception as e:
+                    call.fail(e)
+                    call.fallback()
+                    log.warning("Error al consultar a los modelos en cobertura", error=str(e))
+                    return random.choice(available_actions)
+
+            # De lo contrario, usar la API normal
+            try:
+                decision = self._coalesced_decision(
+                    game_state,
+                    available_actions,
+                    lambda: self._request_decision(game_state, available_actions, strict=True),
+                )
+                if decision is None:
+                    # Respuesta sin acción reconocible: no es una elección del modelo
+                    log.warning(
+                        "No se pudo identificar la acción entre las disponibles. "
+                        "Usando la primera acción"
+                    )
+                    return available_actions[0]
+                return decision
+
+            except CircuitOpenError as e:
+                # Backend caído: usar la política local sin esperar otro timeout
+                call.fail(e)
+                call.fallback()
+                return self._get_local_decision(game_state, available_actions)
+            except Exception as e:
+                call.fail(e)
+                call.fallback()
+                log.warning("Error al consultar a ChatGPT", error=str(e))
+                # En caso de error, retornar una acción aleatoria
+                return random.choice(available_actions)
 
-        try:
-            response = self.client.chat.completions.create(
+    def _coalesced_decision(self, game_state, available_actions, request):
+        """
+        Ejecuta `request()` o, si otra partida ya espera la misma decisión,
+        reutiliza su respuesta. Solo la llamada real se guarda en el registro
+        de decisiones, y solo si el modelo eligió una acción (`request()` no
+        devolvió None); las agrupadas cuentan como "coalesced" en la telemetría.
+        """
+        def request_and_log():
+            decision = request()
+            if decision is None:
+                return None
+            return self._log_decision(game_state, available_actions, decision)
+
+        if not self.config.get("coalesce_requests"):
+            return request_and_log()
+        key = (
+            self.config.get("api_base"),
+            self.model_id,
+            self.difficulty,
+            canonical_request(game_state, available_actions),
+        )
+        decision, shared = get_single_flight().do(key, request_and_log)
+        # Una petición agrupada es un acierto de la caché de peticiones en vuelo
+        telemetry.record_cache("get_decision", shared)
+        if shared:
+            telemetry.count("get_decision", "coalesced")
+        return decision
+
+    def _request_decision(
+        self, game_state, available_actions, stream=None, strict=False, cancel_event=None
+    ):
+        """
+        Pide la decisión al backend remoto y lanza una excepción si falla
+
+        Args:
+            stream: Forzar (o desactivar) el streaming; por defecto según configuración
+            strict: Si es True, una respuesta sin acción reconocible devuelve None
+                en lugar de la primera acción disponible
+            cancel_event: threading.Event que, al activarse, cancela el stream, o
+                un CancellableAttempt (src/ai/hedging.py) que además lo cierra
+                desde otro hilo aunque no llegue ningún fragmento. Un intento
+                cancelado lanza AttemptCancelled
+        """
+        messages = self._build_decision_messages(game_state, available_actions)
+
+        if stream is None:
+            stream = self.config.get("stream_decisions")
+
+        if stream:
+            decision = self._call_api(
+                lambda timeout: self._get_streamed_decision(
+                    messages, available_actions, timeout, strict, cancel_event
+                )
+            )
+        else:
+            response = self._create_completion(
                 model=self.config["model"],
-                messages=[
-                    {
-                        "role": "system",
-                        "content": self._get_system_prompt_for_difficulty(),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                messages=messages,
                 max_tokens=self.config["max_tokens"],
                 temperature=self.config["temperature"],
-                timeout=self.config["timeout"],
+            )
+            decision = self._parse_decision(
+                response.choices[0].message.content.strip(), available_actions, strict
             )
 
-            decision = response.choices[0].message.content.strip()
-            return self._parse_decision(decision, available_actions)
+        return decision
 
-        except Exception as e:
-            print(f"Error al consultar a ChatGPT: {e}")
-            # En caso de error, retornar una acción aleatoria
-            import random
+    def _build_decision_messages(self, game_state, available_actions):
+        """Mensajes de la decisión según el formato de prompt configurado"""
+        if self.config.get("prompt_format", "compact") == "compact":
+            prompt = self.prompt_builder.build(game_state, available_actions)
+            # Los intentos en cobertura corren en otros hilos, sin punto de llamada activo
+            telemetry.record_prompt(prompt, telemetry.current_site() or "get_decision")
+            return prompt.messages
 
-            return random.choice(available_actions)
+        prompt = self._create_prompt(game_state, available_actions)
+        return [
+            {
+                "role": "system",
+                "content": self._get_system_prompt_for_difficulty(),
+            },
+            {"role": "user", "content": prompt},
+        ]
+
+    def _get_streamed_decision(
+        self, messages, available_actions, timeout, strict=False, cancel_event=None
+    ):
+        """
+        Pide la decisión en streaming y se queda con la primera acción inequívoca
+
+        En cuanto el texto recibido nombra una acción sin ambigüedad se cierra el
+        stream, de modo que no hay que esperar al resto de la respuesta. También
+        se cierra si se activa cancel_event (otra petición ya respondió).
+
+        Los tokens salen del fragmento final de uso (stream_options); si el
+        stream se cierra antes de recibirlo, se estiman con el prompt y el texto
+        recibido.
+        """
+        matcher = StreamingActionMatcher(available_actions)
+        register = getattr(cancel_event, "register", None)
+        # Los intentos en cobertura corren en otros hilos, sin punto de llamada activo
+        site = telemetry.current_site() or "get_decision"
+        try:
+            stream = self._get_client().chat.completions.create(
+                model=self.config["model"],
+                messages=messages,
+                max_tokens=self.config["max_tokens"],
+                temperature=self.config["temperature"],
+                timeout=timeout,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            if register is not None:
+                # Si ya se canceló, register cierra el stream y lanza AttemptCancelled
+                register(stream)
+
+            usage = None
+            try:
+                for chunk in stream:
+                    if getattr(chunk, "usage", None) is not None:
+                        usage = chunk.usage
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise AttemptCancelled()
+                    if not chunk.choices:
+                        continue
+                    action = matcher.feed(chunk.choices[0].delta.content)
+                    if action:
+                        return action
+            finally:
+                # Cancelar el resto de la respuesta si aún se está recibiendo
+                stream.close()
+                if usage is not None:
+                    telemetry.record_usage(usage, site)
+                else:
+                    telemetry.record_tokens(
+                        count_message_tokens(messages, self.config["model"]),
+                        count_tokens(matcher.text, self.config["model"]),
+                        site=site,
+                    )
+        except AttemptCancelled:
+            raise
+        except Exception:
+            # El stream cerrado por la cancelación no es un fallo del backend
+            # (ni debe reintentarse ni contar para el cortocircuito)
+            if cancel_event is not None and cancel_event.is_set():
+                raise AttemptCancelled()
+            raise
+
+        # El stream terminó sin una acción inequívoca: analizar el texto completo
+        return self._parse_decision(matcher.text.strip(), available_actions, strict)
 
     def _get_local_decision(self, game_state, available_actions):
         """Implementación simple para decisiones locales sin API"""
@@ -293,11 +670,15 @@ Responde solo con el nombre de la acción.
             """
             return prompt
         except Exception as e:
-            print(f"Error al crear prompt: {e}")
+            log.error("Error al crear prompt", error=str(e))
             return f"Elige la mejor acción entre: {', '.join(available_actions)}"
 
-    def _parse_decision(self, decision, available_actions):
-        """Procesa la respuesta de ChatGPT para extraer la acción"""
+    def _parse_decision(self, decision, available_actions, strict=False):
+        """
+        Procesa la respuesta de ChatGPT para extraer la acción
+
+        Con strict=True devuelve None si no reconoce ninguna acción.
+        """
         # Buscar coincidencia exacta primero
         for action in available_actions:
             if action.lower() == decision.lower():
@@ -308,9 +689,14 @@ Responde solo con el nombre de la acción.
             if action.lower() in decision.lower():
                 return action
 
+        telemetry.count(telemetry.current_site() or "get_decision", "parse_failures")
+        if strict:
+            return None
+
         # Si no se puede identificar una acción válida, elegir la primera disponible
-        print(
-            f"No se pudo identificar la acción '{decision}' entre las disponibles. Usando la primera acción."
+        log.warning(
+            "No se pudo identificar la acción entre las disponibles. Usando la primera acción",
+            decision=decision,
         )
         return available_actions[0]
 
@@ -329,18 +715,19 @@ Responde solo con el nombre de la acción.
         if not self.is_initialized() or self.is_local:
             return self._get_fallback_boss_phrase()
 
-        try:
-            # Ajustar la intensidad del boss según la dificultad
-            difficulty_modifier = ""
-            if self.difficulty == "Easy":
-                difficulty_modifier = (
-                    "Tu amenaza debe ser un poco torpe y no muy aterradora."
-                )
-            elif self.difficulty == "Hard":
-                difficulty_modifier = "Tu amenaza debe ser realmente aterradora y mostrar gran inteligencia."
-
-            # Construir prompt para la IA
-            prompt = f"""
+        with telemetry.track("generate_boss_phrase") as call:
+            try:
+                # Ajustar la intensidad del boss según la dificultad
+                difficulty_modifier = ""
+                if self.difficulty == "Easy":
+                    difficulty_modifier = (
+                        "Tu amenaza debe ser un poco torpe y no muy aterradora."
+                    )
+                elif self.difficulty == "Hard":
+                    difficulty_modifier = "Tu amenaza debe ser realmente aterradora y mostrar gran inteligencia."
+
+                # Construir prompt para la IA
+                prompt = f"""
             Eres {boss_name}, el jefe final malvado de un juego RPG. 
             Genera UNA SOLA frase corta y amenazadora (máximo 15 palabras) para intimidar al jugador y su aliado.
             El jugador tiene {player_health_pct}% de salud y su aliado {ally_health_pct}%.
@@ -348,34 +735,40 @@ Responde solo con el nombre de la acción.
             Solo devuelve la frase, sin comillas ni otros caracteres.
             """
 
-            # Obtener respuesta de la IA
-            response = self.client.chat.completions.create(
-                model=self.config["model"],
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Eres un villano malvado en un juego RPG. Genera frases amenazadoras y aterradoras.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=50,  # Menos tokens para frases cortas
-                temperature=self.config[
-                    "temperature"
-                ],  # Usar temperatura según dificultad
-                timeout=self.config["timeout"],
-            )
-
-            if response and response.choices and len(response.choices) > 0:
-                phrase = response.choices[0].message.content.strip()
-                # Limpiar comillas si las hay
-                phrase = phrase.strip("\"'")
-                return phrase
-
-            return self._get_fallback_boss_phrase()
+                # Obtener respuesta de la IA
+                response = self._create_completion(
+                    model=self.config["model"],
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Eres un villano malvado en un juego RPG. Genera frases amenazadoras y aterradoras.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=50,  # Menos tokens para frases cortas
+                    temperature=self.config[
+                        "temperature"
+                    ],  # Usar temperatura según dificultad
+                )
 
-        except Exception as e:
-            print(f"Error generando frase del jefe: {e}")
-            return self._get_fallback_boss_phrase()
+                if response and response.choices and len(response.choices) > 0:
+                    phrase = response.choices[0].message.content.strip()
+                    # Limpiar comillas si las hay
+                    phrase = phrase.strip("\"'")
+                    return phrase
+
+                call.fallback()
+                return self._get_fallback_boss_phrase()
+
+            except CircuitOpenError as e:
+                call.fail(e)
+                call.fallback()
+                return self._get_fallback_boss_phrase()
+            except Exception as e:
+                call.fail(e)
+                call.fallback()
+                log.warning("Error generando frase del jefe", error=str(e))
+                return self._get_fallback_boss_phrase()
 
     def _get_fallback_boss_phrase(self):
         """Retorna una frase predefinida en caso de error"""
@@ -410,28 +803,34 @@ Responde solo con el nombre de la acción.
         if self.is_local:
             return self._get_local_response(prompt)
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.config["model"],
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Eres un asistente para un juego RPG. Tus respuestas deben ser breves, directas y adecuadas para un juego.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=self.config.get("max_tokens", 100),
-                temperature=self.config.get("temperature", 0.7),
-                timeout=self.config.get("timeout", 10),
-            )
-
-            if response and response.choices and len(response.choices) > 0:
-                return response.choices[0].message.content.strip()
-            return None
+        with telemetry.track("get_completion") as call:
+            try:
+                response = self._create_completion(
+                    model=self.config["model"],
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Eres un asistente para un juego RPG. Tus respuestas deben ser breves, directas y adecuadas para un juego.",
+                        },
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=self.config.get("max_tokens", 100),
+                    temperature=self.config.get("temperature", 0.7),
+                )
 
-        except Exception as e:
-            print(f"Error obteniendo respuesta de ChatGPT: {e}")
-            return self._get_local_response(prompt)
+                if response and response.choices and len(response.choices) > 0:
+                    return response.choices[0].message.content.strip()
+                return None
+
+            except CircuitOpenError as e:
+                call.fail(e)
+                call.fallback()
+                return self._get_local_response(prompt)
+            except Exception as e:
+                call.fail(e)
+                call.fallback()
+                log.warning("Error obteniendo respuesta de ChatGPT", error=str(e))
+                return self._get_local_response(prompt)
 
     def _get_local_response(self, prompt):
         """Genera respuestas simuladas para modo local o errores"""
@@ -0,0 +1,105 @@
+"""
+Agrupación de peticiones idénticas en vuelo (single-flight).
+
+Cuando muchas partidas están en la misma oleada del tutorial, sus enemigos piden
+a la vez decisiones con el mismo prompt. La primera petición de cada clave hace
+la llamada real; las que llegan mientras sigue en vuelo esperan a que termine y
+reciben el mismo resultado (o la misma excepción). No hay caché: en cuanto la
+llamada termina, la siguiente petición con esa clave vuelve a salir a la red,
+así que nadie espera más de lo que ya tardaba la llamada en curso.
+
+Dos peticiones son equivalentes si lo es su estado canónico: los mismos valores
+de salud, efectos, pociones y bioma, los mismos enemigos aunque estén en otro
+orden y las mismas acciones disponibles.
+"""
+
+import threading
+
+
+def canonical_request(game_state, available_actions):
+    """Clave hashable de una decisión, igual para estados equivalentes"""
+    ally = game_state.get("ally")
+    return (
+        game_state.get("player_health"),
+        game_state.get("player_max_health"),
+        bool(game_state.get("player_defending")),
+        tuple(sorted(game_state.get("player_status_effects") or ())),
+        tuple(
+            sorted(
+                (
+                    enemy.get("name"),
+                    enemy.get("health"),
+                    enemy.get("max_health"),
+                    tuple(sorted(enemy.get("status_effects") or ())),
+                )
+                for enemy in game_state.get("enemies") or ()
+            )
+        ),
+        (ally.get("health"), ally.get("max_health")) if ally else None,
+        game_state.get("potions"),
+        game_state.get("biome"),
+        tuple(sorted(available_actions)),
+    )
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Ejecuta una sola llamada a la vez por clave y reparte su resultado, seguro entre hilos"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        """
+        Ejecuta `fn()` o espera a la llamada en curso con la misma clave
+
+        Returns:
+            (resultado, True si se reutilizó una llamada en vuelo)
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self.lock:
+            return len(self.calls)
+
+
+# Una instancia por proceso, compartida por todos los clientes (la clave
+# incluye backend, modelo y dificultad)
+_SINGLE_FLIGHT = SingleFlight()
+
+
+def get_single_flight():
+    return _SINGLE_FLIGHT
@@ -0,0 +1,93 @@
+"""
+Registro de las decisiones de la IA remota en formato JSON Lines.
+
+Cada línea guarda el estado del juego, las acciones disponibles y la acción
+elegida por el modelo; es el conjunto de entrenamiento de la política
+destilada (src/ai/distilled_policy.py).
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+
+class DecisionLogger:
+    """
+    Añade decisiones a un archivo .jsonl (seguro entre hilos)
+
+    Quien llama solo serializa la línea y la mete en una cola; un hilo en
+    segundo plano la escribe, así la E/S no bloquea el hilo del juego.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.lines = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self._write, name="decision-log", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def log(self, game_state, available_actions, decision, model, difficulty):
+        record = {
+            "time": time.time(),
+            "model": model,
+            "difficulty": difficulty,
+            "state": game_state,
+            "actions": list(available_actions),
+            "decision": decision,
+        }
+        # Se serializa aquí: el estado puede cambiar antes de que se escriba
+        self.lines.put(json.dumps(record, ensure_ascii=False))
+
+    def _write(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                line = self.lines.get()
+                # Escribir de una vez todo lo que se haya acumulado
+                while line is not None:
+                    f.write(line + "\n")
+                    try:
+                        line = self.lines.get_nowait()
+                    except queue.Empty:
+                        break
+                f.flush()
+                if line is None:
+                    return
+
+    def close(self):
+        """Escribe lo que quede en la cola y para el hilo de escritura"""
+        if self.thread.is_alive():
+            self.lines.put(None)
+            self.thread.join()
+
+
+def read_decisions(path):
+    """Lee un registro de decisiones, ignorando líneas incompletas o inválidas"""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("decision") in record.get("actions", ()):
+                records.append(record)
+    return records
+
+
+# Un registro por archivo, compartido por todos los clientes del proceso
+_LOGGERS = {}
+_LOGGERS_LOCK = threading.Lock()
+
+
+def get_decision_logger(path):
+    with _LOGGERS_LOCK:
+        logger = _LOGGERS.get(path)
+        if logger is None:
+            logger = _LOGGERS[path] = DecisionLogger(path)
+        return logger
@@ -0,0 +1,270 @@
+"""
+Política local destilada a partir de las decisiones registradas del modelo remoto.
+
+Combina dos modelos pequeños entrenados sin conexión:
+    - Tabla de consulta: estado discretizado + acciones -> recuento de decisiones.
+      Se usa cuando el estado se ha visto suficientes veces.
+    - Política softmax (logit condicional): cada acción tiene un vector de pesos
+      sobre las características del estado; se elige la de mayor puntuación
+      entre las disponibles.
+
+Una decisión son unas pocas multiplicaciones, sin red ni dependencias.
+
+Uso:
+    python -m src.ai.distilled_policy train --log logs/decisions.jsonl \\
+        --out config/distilled_policy.json
+    python -m src.ai.distilled_policy evaluate --log logs/decisions.jsonl \\
+        --policy config/distilled_policy.json
+"""
+
+import argparse
+import json
+import math
+import random
+import time
+
+from src.ai.decision_log import read_decisions
+
+FEATURES = (
+    "player_hp",
+    "player_defending",
+    "player_effects",
+    "ally_alive",
+    "ally_hp",
+    "potions",
+    "enemies",
+    "enemy_min_hp",
+    "enemy_mean_hp",
+    "enemy_effects",
+    "easy",
+    "hard",
+)
+
+
+def _ratio(health, max_health):
+    return health / max_health if max_health else 0.0
+
+
+def extract_features(game_state, difficulty="Normal"):
+    """Vector de características (en el orden de FEATURES) de un estado del juego"""
+    enemies = game_state.get("enemies") or []
+    enemy_hp = [_ratio(e.get("health", 0), e.get("max_health", 0)) for e in enemies]
+    ally = game_state.get("ally") or {}
+    ally_alive = ally.get("health", 0) > 0
+
+    return [
+        _ratio(game_state.get("player_health", 0), game_state.get("player_max_health", 100)),
+        1.0 if game_state.get("player_defending") else 0.0,
+        1.0 if game_state.get("player_status_effects") else 0.0,
+        1.0 if ally_alive else 0.0,
+        _ratio(ally.get("health", 0), ally.get("max_health", 0)) if ally_alive else 0.0,
+        min(game_state.get("potions", 0), 5) / 5,
+        min(len(enemies), 5) / 5,
+        min(enemy_hp) if enemy_hp else 0.0,
+        sum(enemy_hp) / len(enemy_hp) if enemy_hp else 0.0,
+        1.0 if any(e.get("status_effects") for e in enemies) else 0.0,
+        1.0 if difficulty == "Easy" else 0.0,
+        1.0 if difficulty == "Hard" else 0.0,
+    ]
+
+
+def state_key(game_state, available_actions, difficulty="Normal", features=None):
+    """Clave discretizada para la tabla de consulta"""
+    if features is None:
+        features = extract_features(game_state, difficulty)
+    return "|".join(
+        (
+            difficulty,
+            str(round(features[0] * 4)),
+            str(int(features[1])),
+            str(int(features[2])),
+            str(round(features[4] * 4)),
+            str(min(game_state.get("potions", 0), 3)),
+            ",".join(sorted(available_actions)),
+        )
+    )
+
+
+class DistilledPolicy:
+    """Política entrenada; se guarda y se carga como JSON"""
+
+    def __init__(self, weights=None, bias=None, table=None, min_table_count=3):
+        self.weights = weights or {}
+        self.bias = bias or {}
+        self.table = table or {}
+        self.min_table_count = min_table_count
+
+    def scores(self, features, available_actions):
+        """Puntuación de cada acción disponible (None si ninguna se ha visto)"""
+        known = [a for a in available_actions if a in self.weights]
+        if not known:
+            return None
+        return {
+            action: self.bias.get(action, 0.0)
+            + sum(w * x for w, x in zip(self.weights[action], features))
+            if action in self.weights
+            else -math.inf
+            for action in available_actions
+        }
+
+    def decide(self, game_state, available_actions, difficulty="Normal"):
+        """Acción elegida, o None si la política no conoce ninguna de las acciones"""
+        features = extract_features(game_state, difficulty)
+        key = state_key(game_state, available_actions, difficulty, features)
+        counts = self.table.get(key)
+        if counts and sum(counts.values()) >= self.min_table_count:
+            return max(counts, key=counts.get)
+
+        scores = self.scores(features, available_actions)
+        if scores is None:
+            return None
+        return max(scores, key=scores.get)
+
+    def to_dict(self):
+        return {
+            "version": 1,
+            "features": list(FEATURES),
+            "weights": self.weights,
+            "bias": self.bias,
+            "table": self.table,
+            "min_table_count": self.min_table_count,
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("features") != list(FEATURES):
+            raise ValueError(f"La política {path} usa otras características; reentrénala")
+        return cls(
+            data["weights"],
+            data["bias"],
+            data.get("table", {}),
+            data.get("min_table_count", 3),
+        )
+
+
+def _softmax(scores):
+    top = max(scores.values())
+    exp = {a: math.exp(s - top) for a, s in scores.items()}
+    total = sum(exp.values())
+    return {a: e / total for a, e in exp.items()}
+
+
+def train(records, epochs=30, learning_rate=0.1, l2=1e-4, min_table_count=3, seed=0):
+    """
+    Ajusta la tabla y la política softmax a una lista de registros de decisiones
+
+    La softmax se entrena por descenso de gradiente estocástico sobre la
+    log-verosimilitud de la acción elegida entre las disponibles en cada caso.
+    """
+    samples = []
+    table = {}
+    for record in records:
+        difficulty = record.get("difficulty", "Normal")
+        features = extract_features(record["state"], difficulty)
+        samples.append((features, record["actions"], record["decision"]))
+
+        key = state_key(record["state"], record["actions"], difficulty, features)
+        counts = table.setdefault(key, {})
+        counts[record["decision"]] = counts.get(record["decision"], 0) + 1
+
+    policy = DistilledPolicy(table=table, min_table_count=min_table_count)
+    for _, actions, _ in samples:
+        for action in actions:
+            policy.weights.setdefault(action, [0.0] * len(FEATURES))
+            policy.bias.setdefault(action, 0.0)
+
+    rng = random.Random(seed)
+    for _ in range(epochs):
+        rng.shuffle(samples)
+        for features, actions, decision in samples:
+            probabilities = _softmax(policy.scores(features, actions))
+            for action, p in probabilities.items():
+                error = p - (1.0 if action == decision else 0.0)
+                weights = policy.weights[action]
+                for i, x in enumerate(features):
+                    weights[i] -= learning_rate * (error * x + l2 * weights[i])
+                policy.bias[action] -= learning_rate * error
+
+    return policy
+
+
+def evaluate(policy, records):
+    """Acierto frente al modelo remoto y tiempo medio por decisión"""
+    if not records:
+        return {"samples": 0, "accuracy": 0.0, "decide_us": 0.0}
+    hits = 0
+    start = time.perf_counter()
+    for record in records:
+        decision = policy.decide(
+            record["state"], record["actions"], record.get("difficulty", "Normal")
+        )
+        hits += decision == record["decision"]
+    elapsed = time.perf_counter() - start
+    return {
+        "samples": len(records),
+        "accuracy": hits / len(records),
+        "decide_us": elapsed / len(records) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Política local destilada")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = sub.add_parser("train", help="Entrenar a partir de un registro")
+    train_parser.add_argument("--log", required=True)
+    train_parser.add_argument("--out", default="config/distilled_policy.json")
+    train_parser.add_argument("--epochs", type=int, default=30)
+    train_parser.add_argument("--learning-rate", type=float, default=0.1)
+    train_parser.add_argument("--min-table-count", type=int, default=3)
+    train_parser.add_argument(
+        "--holdout", type=float, default=0.2, help="Fracción reservada para validar"
+    )
+    train_parser.add_argument("--seed", type=int, default=0)
+
+    eval_parser = sub.add_parser("evaluate", help="Medir el acierto de una política")
+    eval_parser.add_argument("--log", required=True)
+    eval_parser.add_argument("--policy", default="config/distilled_policy.json")
+
+    args = parser.parse_args()
+    records = read_decisions(args.log)
+    print(f"{len(records)} decisiones leídas de {args.log}")
+
+    if args.command == "evaluate":
+        print(evaluate(DistilledPolicy.load(args.policy), records))
+        return
+
+    random.Random(args.seed).shuffle(records)
+    cut = int(len(records) * (1 - args.holdout))
+    policy = train(
+        records[:cut],
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        min_table_count=args.min_table_count,
+        seed=args.seed,
+    )
+    print(f"Entrenamiento: {evaluate(policy, records[:cut])}")
+    if cut < len(records):
+        print(f"Validación:    {evaluate(policy, records[cut:])}")
+
+    # La política final se entrena con todos los datos
+    if cut < len(records):
+        policy = train(
+            records,
+            epochs=args.epochs,
+            learning_rate=args.learning_rate,
+            min_table_count=args.min_table_count,
+            seed=args.seed,
+        )
+    policy.save(args.out)
+    print(f"Política guardada en {args.out}")
+
+
+if __name__ == "__main__":
+    main()
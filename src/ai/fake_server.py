@@ -0,0 +1,412 @@
+"""
+Servidor local compatible con la API de chat completions de OpenAI.
+
+Sirve para medir latencia, manejo de timeouts y rendimiento de ChatGPTClient
+sin conexión: la latencia sigue una distribución configurable, se pueden
+inyectar errores, respuestas en streaming y respuestas predefinidas.
+
+Uso:
+    python -m src.ai.fake_server --port 8765 --latency lognormal:0.3,0.5 --error-rate 0.05
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LatencyModel:
+    """
+    Distribución de latencia en segundos
+
+    Tipos soportados (parámetros en segundos):
+        fixed:valor
+        uniform:mínimo,máximo
+        normal:media,desviación
+        lognormal:mediana,sigma
+        exponential:media
+    """
+
+    def __init__(self, kind="fixed", params=(0.0,)):
+        if kind not in ("fixed", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Distribución de latencia desconocida: {kind}")
+        self.kind = kind
+        self.params = tuple(float(p) for p in params)
+
+    @classmethod
+    def parse(cls, spec):
+        """Crea el modelo a partir de un texto como 'uniform:0.05,0.3'"""
+        if not spec:
+            return cls()
+        kind, _, params = spec.partition(":")
+        return cls(kind, params.split(",") if params else (0.0,))
+
+    def sample(self, rng):
+        if self.kind == "fixed":
+            value = self.params[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(self.params[0], self.params[1])
+        elif self.kind == "normal":
+            value = rng.gauss(self.params[0], self.params[1])
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(max(self.params[0], 1e-6)), self.params[1])
+        else:
+            value = rng.expovariate(1.0 / self.params[0]) if self.params[0] > 0 else 0.0
+        return max(0.0, value)
+
+    def __repr__(self):
+        return f"{self.kind}:{','.join(str(p) for p in self.params)}"
+
+
+class FakeOpenAIServer:
+    """
+    Servidor HTTP en un hilo propio que imita /v1/chat/completions y /v1/models
+
+    Args:
+        host, port: Dirección de escucha (port=0 elige un puerto libre)
+        latency: LatencyModel o texto ('lognormal:0.3,0.5') antes de la respuesta
+        error_rate: Probabilidad de responder con error_status
+        error_status: Código HTTP de los errores inyectados
+        token_delay: Segundos de generación por palabra (entre fragmentos en
+            streaming, o antes de la respuesta completa sin streaming)
+        responses: Lista de respuestas que se devuelven en orden cíclico
+        rules: Lista de {"match": texto, "response": texto}; gana la primera
+            regla cuyo texto aparezca en el último mensaje del usuario
+        verbose_words: Palabras de relleno añadidas tras la acción elegida,
+            para simular modelos que se explayan
+        seed: Semilla para que las ejecuciones sean reproducibles
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=None,
+        error_rate=0.0,
+        error_status=500,
+        token_delay=0.0,
+        responses=None,
+        rules=None,
+        verbose_words=0,
+        seed=None,
+    ):
+        if isinstance(latency, str) or latency is None:
+            latency = LatencyModel.parse(latency)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_delay = token_delay
+        self.responses = itertools.cycle(responses) if responses else None
+        self.rules = rules or []
+        self.verbose_words = verbose_words
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "streams": 0,
+            "streams_cancelled": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """URL base para usar como api_base del cliente"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _draw(self):
+        """Decide latencia y si se inyecta un error (bajo lock para ser reproducible)"""
+        with self._lock:
+            return self.latency.sample(self._rng), self._rng.random() < self.error_rate
+
+    def build_reply(self, messages):
+        """Elige el texto de la respuesta según las reglas, el guion o el prompt"""
+        prompt = messages[-1].get("content", "") if messages else ""
+
+        for rule in self.rules:
+            if rule["match"] in prompt:
+                return rule["response"]
+
+        with self._lock:
+            if self.responses:
+                return next(self.responses)
+
+            # Sin guion: si el prompt lista acciones, elegir una de ellas
+            match = re.search(r"Acciones(?: disponibles)?:\s*\n(.+)", prompt)
+            if match:
+                actions = [a.strip() for a in match.group(1).split(",") if a.strip()]
+                reply = self._rng.choice(actions)
+            else:
+                reply = "Analizando situación táctica..."
+            filler = " ".join(
+                self._rng.choice(("porque", "así", "el", "enemigo", "parece", "débil"))
+                for _ in range(self.verbose_words)
+            )
+
+        return f"{reply} {filler}".strip()
+
+
+def _count_tokens(text):
+    """Aproximación de tokens suficiente para el servidor de pruebas"""
+    return max(1, len(text) // 4)
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            # Silenciar el registro por petición de http.server
+            pass
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                self._send_json(
+                    200,
+                    {
+                        "object": "list",
+                        "data": [{"id": "fake-model", "object": "model"}],
+                    },
+                )
+            else:
+                self._send_json(404, {"error": {"message": "Not found"}})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "Not found"}})
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                self._send_json(400, {"error": {"message": "JSON inválido"}})
+                return
+
+            server._count("requests")
+            delay, fail = server._draw()
+            time.sleep(delay)
+
+            if fail:
+                server._count("errors")
+                self._send_json(
+                    server.error_status,
+                    {"error": {"message": "Error inyectado", "type": "server_error"}},
+                )
+                return
+
+            messages = body.get("messages", [])
+            reply = server.build_reply(messages)
+            prompt_tokens = sum(_count_tokens(m.get("content", "")) for m in messages)
+            completion_tokens = _count_tokens(reply)
+            server._count("prompt_tokens", prompt_tokens)
+
+            if body.get("stream"):
+                self._stream_reply(body, reply, prompt_tokens, completion_tokens)
+                return
+
+            server._count("completion_tokens", completion_tokens)
+            if server.token_delay:
+                # Simular el tiempo de generación de la respuesta completa
+                time.sleep(server.token_delay * len(reply.split()))
+            self._send_json(
+                200,
+                {
+                    "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake-model"),
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": reply},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                },
+            )
+
+        def _stream_reply(self, body, reply, prompt_tokens, completion_tokens):
+            """Envía la respuesta como eventos SSE, una palabra por fragmento"""
+            server._count("streams")
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+
+            words = re.findall(r"\S+\s*", reply)
+            try:
+                for i, word in enumerate(words):
+                    delta = {"content": word}
+                    if i == 0:
+                        delta["role"] = "assistant"
+                    self._send_event(completion_id, body, delta, None)
+                    server._count("completion_tokens", _count_tokens(word))
+                    if server.token_delay:
+                        time.sleep(server.token_delay)
+                self._send_event(completion_id, body, {}, "stop")
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    # Fragmento final sin opciones, solo con el uso (como la API real)
+                    self._send_chunk(
+                        completion_id,
+                        body,
+                        [],
+                        usage={
+                            "prompt_tokens": prompt_tokens,
+                            "completion_tokens": completion_tokens,
+                            "total_tokens": prompt_tokens + completion_tokens,
+                        },
+                    )
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # El cliente cerró el stream antes de terminar
+                server._count("streams_cancelled")
+
+        def _send_event(self, completion_id, body, delta, finish_reason):
+            self._send_chunk(
+                completion_id,
+                body,
+                [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            )
+
+        def _send_chunk(self, completion_id, body, choices, usage=None):
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "fake-model"),
+                "choices": choices,
+            }
+            if usage is not None:
+                chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        def _send_json(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            try:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # El cliente abandonó la petición (por ejemplo, por timeout)
+                pass
+
+    return Handler
+
+
+def add_server_arguments(parser):
+    """Argumentos de línea de comandos compartidos por el servidor y los benchmarks"""
+    parser.add_argument(
+        "--latency",
+        default="fixed:0.05",
+        help="Distribución de latencia, p. ej. fixed:0.1, uniform:0.05,0.3, lognormal:0.3,0.5",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument(
+        "--token-delay",
+        type=float,
+        default=0.0,
+        help="Segundos de generación por palabra de la respuesta",
+    )
+    parser.add_argument(
+        "--verbose-words",
+        type=int,
+        default=0,
+        help="Palabras de relleno tras la acción elegida",
+    )
+    parser.add_argument(
+        "--script",
+        help="JSON con {'responses': [...]} y/o {'rules': [{'match', 'response'}]}",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def server_from_args(args, port=0):
+    """Construye un FakeOpenAIServer a partir de los argumentos parseados"""
+    responses, rules = None, None
+    if args.script:
+        with open(args.script, "r") as f:
+            script = json.load(f)
+        responses = script.get("responses")
+        rules = script.get("rules")
+
+    return FakeOpenAIServer(
+        port=port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        token_delay=args.token_delay,
+        responses=responses,
+        rules=rules,
+        verbose_words=args.verbose_words,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local compatible con OpenAI")
+    parser.add_argument("--port", type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, port=args.port)
+    print(f"Servidor de pruebas escuchando en {server.url} (latencia {server.latency})")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(f"Estadísticas: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Peticiones en cobertura (hedged requests) para las decisiones de los enemigos.
+
+La decisión se pide al backend principal; si no ha respondido cuando se cumple
+un percentil de su latencia reciente, se pide también al secundario. Gana la
+primera respuesta válida y la otra petición se cancela, así que la latencia de
+cola de los turnos enemigos queda acotada por el backend más rápido.
+
+Cancelar es cerrar el stream del intento: decide() lo cierra al terminar y la
+lectura bloqueada en el hilo del intento acaba enseguida. Los intentos usan el
+cliente (y su pool de conexiones) de su backend, así que no pagan un
+handshake nuevo por decisión; mientras el backend no ha enviado las cabeceras
+no hay stream que cerrar y la espera la acota el timeout del intento. Un
+intento cancelado lanza AttemptCancelled, que la capa de resiliencia no cuenta
+como éxito ni como fallo.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.ai.resilience import AttemptCancelled
+from src.utils.stats import percentile
+
+
+class CancellableAttempt:
+    """
+    Petición en curso que otro hilo puede cancelar cerrando sus recursos
+
+    El intento registra el stream de su respuesta; cancel() lo cierra y la
+    lectura bloqueada en el hilo del intento termina con un error.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cancelled = False
+        self.handles = []
+
+    def is_set(self):
+        return self.cancelled
+
+    def register(self, handle):
+        """Añade algo con close(); si ya se canceló, lo cierra y lanza AttemptCancelled"""
+        with self.lock:
+            if not self.cancelled:
+                self.handles.append(handle)
+                return handle
+        _close(handle)
+        raise AttemptCancelled()
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            handles, self.handles = self.handles, []
+        for handle in reversed(handles):
+            _close(handle)
+
+
+def _close(handle):
+    try:
+        handle.close()
+    except Exception:
+        # Cerrar desde otro hilo puede fallar si la conexión ya terminó
+        pass
+
+
+class HedgedDecider:
+    """
+    Reparte una decisión entre varios ChatGPTClient en orden de preferencia
+
+    Args:
+        backends: Clientes ya inicializados; el primero es el principal
+        hedge_percentile: Percentil de la latencia del principal tras el cual
+            se lanza la petición al siguiente backend
+        min_samples: Muestras necesarias antes de usar el percentil
+        initial_delay: Espera (segundos) mientras no hay muestras suficientes
+        window: Número de latencias recientes que se conservan
+
+    Las peticiones se hacen siempre en streaming: es lo que permite cancelar de
+    verdad la petición perdedora (se cierra su stream) en lugar de abandonarla.
+    """
+
+    def __init__(
+        self, backends, hedge_percentile=95, min_samples=10, initial_delay=1.0, window=100
+    ):
+        if not backends:
+            raise ValueError("Se necesita al menos un backend")
+        self.backends = list(backends)
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.latencies = deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers=2 * len(self.backends), thread_name_prefix="hedge"
+        )
+        self.stats = {"decisions": 0, "hedged": 0, "won_by_backup": 0, "failed": 0}
+
+    def hedge_delay(self):
+        """Segundos que se espera al principal antes de lanzar la siguiente petición"""
+        with self.lock:
+            samples = list(self.latencies)
+        if len(samples) < self.min_samples:
+            return self.initial_delay
+        return percentile(samples, self.hedge_percentile)
+
+    def _record_primary_latency(self, seconds):
+        with self.lock:
+            self.latencies.append(seconds)
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def decide(self, game_state, available_actions):
+        """Devuelve la primera acción válida de cualquiera de los backends"""
+        self._count("decisions")
+        attempts = []
+        start = time.perf_counter()
+        delay = self.hedge_delay()
+
+        waiting = list(enumerate(self.backends))
+        futures = {}
+        last_error = None
+
+        def launch():
+            index, backend = waiting.pop(0)
+            attempt = CancellableAttempt()
+            attempts.append(attempt)
+            future = self.executor.submit(
+                backend._request_decision,
+                game_state,
+                available_actions,
+                stream=True,
+                strict=True,
+                cancel_event=attempt,
+            )
+            futures[future] = index
+
+        launch()
+        try:
+            while futures:
+                done, _ = wait(
+                    futures,
+                    timeout=delay if waiting else None,
+                    return_when=FIRST_COMPLETED,
+                )
+
+                if not done:
+                    # El principal tarda más de lo habitual: cubrir con el siguiente
+                    self._count("hedged")
+                    launch()
+                    continue
+
+                for future in done:
+                    index = futures.pop(future)
+                    try:
+                        action = future.result()
+                        if action is None:
+                            raise ValueError("La respuesta no contiene ninguna acción disponible")
+                    except Exception as e:
+                        last_error = e
+                        # Un fallo rápido no espera al plazo: pasar ya al siguiente
+                        if waiting and not futures:
+                            launch()
+                        continue
+
+                    elapsed = time.perf_counter() - start
+                    if index == 0:
+                        self._record_primary_latency(elapsed)
+                    else:
+                        self._count("won_by_backup")
+                        # El principal fue más lento que esto: cota inferior de su latencia
+                        self._record_primary_latency(elapsed)
+                    return action
+        finally:
+            # Cerrar las conexiones de los intentos que sigan en curso
+            for attempt in attempts:
+                attempt.cancel()
+
+        self._count("failed")
+        raise last_error or RuntimeError("Ningún backend devolvió una acción válida")
@@ -2,6 +2,10 @@
 Lista de modelos de IA disponibles para el juego
 """
 
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # Modelos disponibles con sus configuraciones
 AVAILABLE_MODELS = {
     "GPT-3.5": {
@@ -21,11 +25,50 @@ AVAILABLE_MODELS = {
         "description": "Modo sin conexión (simulación básica)",
         "max_tokens": 80,
         "temperature": 0.8,
+        "offline": True,
+    },
+    "Cobertura": {
+        "id": "hedged",
+        "description": "Pide la decisión a GPT-3.5 y, si tarda, también a GPT-4; gana la primera",
+        "max_tokens": 100,
+        "temperature": 0.7,
+        # Backends en orden de preferencia (el primero es el principal)
+        "backends": ["gpt-3.5-turbo", "gpt-4"],
+    },
+    "Destilado": {
+        "id": "distilled",
+        "description": "Política local entrenada con decisiones de GPT (sin conexión)",
+        "max_tokens": 80,
+        "temperature": 0.8,
+        "offline": True,
+        # Generada con: python -m src.ai.distilled_policy train --log ...
+        "policy_file": "config/distilled_policy.json",
+    },
+    "Planificador": {
+        "id": "planner",
+        "description": "Búsqueda expectiminimax sobre las reglas del combate (sin conexión)",
+        "max_tokens": 80,
+        "temperature": 0.8,
+        "offline": True,
+        # Elige también el objetivo; el presupuesto por decisión depende de la dificultad
+        "planner": True,
     },
 }
 
-# Nombres simplificados para el menú
-MODEL_NAMES = list(AVAILABLE_MODELS.keys())  # ["GPT-3.5", "GPT-4", "Local"]
+
+
+def is_model_available(model_info):
+    """Un modelo con política entrenada solo aparece si su archivo existe"""
+    policy_file = model_info.get("policy_file")
+    if not policy_file:
+        return True
+    return os.path.exists(os.path.join(ROOT_DIR, policy_file))
+
+
+# Nombres simplificados para el menú (sin los modelos a los que les falta su archivo)
+MODEL_NAMES = [
+    name for name, info in AVAILABLE_MODELS.items() if is_model_available(info)
+]  # ["GPT-3.5", "GPT-4", "Local", ...]
 
 
 def get_model_info(model_name):
@@ -35,6 +78,20 @@ def get_model_info(model_name):
     return AVAILABLE_MODELS["GPT-3.5"]  # Modelo por defecto
 
 
+def get_model_info_by_id(model_id):
+    """Obtiene la información completa de un modelo por su ID (o None si no existe)"""
+    for info in AVAILABLE_MODELS.values():
+        if info["id"] == model_id:
+            return info
+    return None
+
+
+def is_offline_model(model_id):
+    """Indica si el modelo responde sin conexión (no necesita el SDK de OpenAI)"""
+    info = get_model_info_by_id(model_id)
+    return model_id == "local" or bool(info and info.get("offline"))
+
+
 def get_model_id(model_name):
     """Obtiene el ID del modelo para usar con la API"""
     model_info = get_model_info(model_name)
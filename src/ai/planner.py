@@ -0,0 +1,239 @@
+"""
+Planificador de enemigos por búsqueda (expectiminimax) sobre las reglas reales
+del combate (src/sim/rules.py).
+
+Los turnos se recorren en el mismo orden que el juego: enemigos, aliado (con su
+política de src/abilities.py), efectos de estado y jugador. Los enemigos
+maximizan, el jugador minimiza y las tiradas de dados son nodos de azar con la
+distribución de daño resumida en unos pocos tramos.
+
+La búsqueda usa profundización iterativa con un presupuesto de milisegundos por
+decisión y una tabla de transposiciones, así que siempre devuelve la mejor
+acción de la última profundidad completada. No usa azar, pero el presupuesto es
+de tiempo real: la profundidad alcanzada, y con ella la decisión, depende de la
+máquina y de la carga. Con node_budget el corte se hace por nodos visitados en
+lugar de por tiempo y el mismo estado da siempre la misma decisión (demos,
+simulaciones con semilla y comparaciones entre máquinas).
+"""
+
+import time
+
+from src.sim.rules import (
+    CombatState,
+    action_outcomes,
+    default_ally_action,
+    dot_damage,
+    enemy_actions,
+    next_state,
+    player_actions,
+    tick_status_effects,
+)
+
+WIN = 1000.0
+LOSS = -1000.0
+
+# Presupuesto por dificultad: milisegundos por decisión y profundidad máxima
+PLANNER_SETTINGS = {
+    "Easy": {"budget_ms": 2, "max_depth": 1, "buckets": 2},
+    "Normal": {"budget_ms": 8, "max_depth": 4, "buckets": 2},
+    "Hard": {"budget_ms": 25, "max_depth": 16, "buckets": 3},
+}
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class EnemyPlanner:
+    """
+    Elige ataque y objetivo para un enemigo
+
+    Args:
+        difficulty: Ajustes por defecto de PLANNER_SETTINGS
+        budget_ms: Milisegundos por decisión (sustituye al de la dificultad)
+        node_budget: Nodos por decisión; si se indica sustituye al presupuesto
+            de tiempo y la búsqueda es reproducible
+        max_depth: Máximo de acciones por delante (de cualquier personaje)
+        buckets: Tramos en que se resume cada distribución de daño
+        ally_policy: Función (state) -> acción del aliado
+    """
+
+    def __init__(
+        self,
+        difficulty="Normal",
+        budget_ms=None,
+        max_depth=None,
+        buckets=None,
+        ally_policy=default_ally_action,
+        node_budget=None,
+    ):
+        settings = PLANNER_SETTINGS.get(difficulty, PLANNER_SETTINGS["Normal"])
+        self.budget_ms = budget_ms if budget_ms is not None else settings["budget_ms"]
+        self.node_budget = node_budget
+        self.max_depth = max_depth if max_depth is not None else settings["max_depth"]
+        self.buckets = buckets if buckets is not None else settings["buckets"]
+        self.ally_policy = ally_policy
+        self.table = {}
+        self.deadline = 0.0
+        self.node_limit = None
+        self.root_depth = 0
+        self.stats = {"decisions": 0, "nodes": 0, "depth": 0, "table_hits": 0}
+
+    def plan(self, game_state, enemy):
+        """
+        Decide para un enemigo del GameState real
+
+        Returns:
+            (nombre del ataque, personaje objetivo)
+        """
+        state = CombatState.from_game_state(game_state)
+        index = game_state.enemy_index(enemy)
+        action, _, _ = self.search(state, index)
+        target = game_state.ally if action[2] == "ally" else game_state.player
+        return action[1], target
+
+    def search(self, state, enemy_index):
+        """Profundización iterativa; devuelve (acción, valor, profundidad completada)"""
+        enemy = state.enemies[enemy_index]
+        return self.search_actions(
+            state, enemy, enemy_actions(state, enemy), ("enemy", enemy_index), max
+        )
+
+    def search_actions(self, state, actor, actions, position, choose):
+        """
+        Busca la mejor de `actions` para `actor` en `position`. `choose` es max
+        para el bando enemigo y min para el jugador y su aliado.
+        """
+        self.stats["decisions"] += 1
+        if self.node_budget is not None:
+            self.node_limit = self.stats["nodes"] + self.node_budget
+        else:
+            self.deadline = time.perf_counter() + self.budget_ms / 1000
+        # Las entradas dependen del estado completo, pero se limpian por decisión
+        # para acotar la memoria durante partidas largas
+        self.table.clear()
+
+        actions = list(actions)
+        best, best_value, completed = actions[0], None, 0
+
+        for depth in range(1, self.max_depth + 1):
+            self.root_depth = depth
+            try:
+                values = [
+                    (self._action_value(state, actor, action, position, depth), action)
+                    for action in actions
+                ]
+            except _SearchTimeout:
+                break
+            best_value, best = choose(values, key=lambda item: item[0])
+            completed = depth
+            # Explorar primero la mejor acción en la siguiente iteración
+            actions.sort(key=lambda a: a != best)
+            if abs(best_value) >= WIN:
+                break
+
+        self.stats["depth"] = completed
+        return best, best_value, completed
+
+    def evaluate(self, state):
+        """Valor heurístico del estado para los enemigos (mayor = mejor para ellos)"""
+        player = state.player
+        pending = sum(
+            turns * dot_damage(player.max_health)
+            for effect, turns in player.effects.items()
+            if effect in ("veneno", "sangrado")
+        )
+        player_left = max(0, player.health - pending) / player.max_health
+        ally_left = state.ally.health / state.ally.max_health if state.ally else 0.0
+        enemies_left = (
+            sum(e.health for e in state.enemies)
+            / sum(e.max_health for e in state.enemies)
+            * len(state.enemies)
+            / state.initial_enemies
+        )
+        return (
+            100 * (1 - player_left)
+            + 25 * (1 - ally_left)
+            + 40 * enemies_left
+            - 5 * state.potions
+        )
+
+    def _value(self, state, position, depth):
+        if state.player.health <= 0:
+            return WIN + depth
+        if not state.enemies:
+            return LOSS - depth
+        if depth == 0:
+            return self.evaluate(state)
+
+        self.stats["nodes"] += 1
+        if self.node_limit is not None:
+            if self.stats["nodes"] > self.node_limit:
+                raise _SearchTimeout()
+        elif time.perf_counter() > self.deadline:
+            raise _SearchTimeout()
+
+        key = (state.key(), position)
+        cached = self.table.get(key)
+        if cached is not None and cached[0] >= depth:
+            self.stats["table_hits"] += 1
+            return cached[1]
+
+        phase, index = position
+        if phase == "enemy":
+            enemy = state.enemies[index]
+            value = max(
+                self._action_value(state, enemy, action, position, depth)
+                for action in enemy_actions(state, enemy)
+            )
+        elif phase == "ally":
+            action = self.ally_policy(state) if state.ally else None
+            if action is None:
+                value = self._value(*self._advance(state, position), depth)
+            else:
+                value = self._action_value(state, state.ally, action, position, depth)
+        else:
+            value = min(
+                self._action_value(state, state.player, action, position, depth)
+                for action in player_actions(state)
+            )
+
+        self.table[key] = (depth, value)
+        return value
+
+    def _action_value(self, state, actor, action, position, depth):
+        """Valor esperado de una acción sobre sus posibles tiradas"""
+        actor_ref = self._actor_ref(state, actor)
+        # Tramos completos en las dos primeras acciones; más abajo basta con la
+        # media y el crítico, que es lo que permite llegar más lejos en el tiempo
+        buckets = self.buckets if self.root_depth - depth < 2 else 1
+        total = 0.0
+        for p, damage in action_outcomes(actor, action, buckets):
+            child = next_state(state, actor_ref, action, damage)
+            if depth == 1 and not child.is_over():
+                # Hoja: no hace falta avanzar el turno para evaluarla
+                total += p * self.evaluate(child)
+            else:
+                total += p * self._value(*self._advance(child, position), depth - 1)
+        return total
+
+    @staticmethod
+    def _actor_ref(state, actor):
+        if actor.kind == "enemy":
+            return next(i for i, e in enumerate(state.enemies) if e is actor)
+        return actor.kind
+
+    @staticmethod
+    def _advance(state, position):
+        """Siguiente personaje en actuar (aplica los efectos al empezar el turno del jugador)"""
+        phase, index = position
+        if phase == "enemy" and index + 1 < len(state.enemies):
+            return state, ("enemy", index + 1)
+        if phase == "enemy":
+            return state, ("ally", 0)
+        if phase == "ally":
+            # Los efectos tocan a todos los personajes: copia completa
+            state = state.copy()
+            tick_status_effects(state)
+            return state, ("player", 0)
+        return state, ("enemy", 0)
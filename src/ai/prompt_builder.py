@@ -0,0 +1,208 @@
+"""
+Constructor de prompts compactos para las decisiones de los enemigos.
+
+El prompt se divide en dos partes:
+    - Cabecera fija (mensaje de sistema): instrucciones, leyenda del formato y
+      dificultad, siempre en el mismo orden y con el mismo texto, para que el
+      proveedor pueda reutilizarla desde su caché de prompts.
+    - Estado: una línea corta por elemento (jugador, pociones, aliado, enemigos)
+      seguida de las acciones disponibles.
+
+Cada prompt informa de sus tokens y se recorta hasta caber en el presupuesto
+configurado (prompt_token_budget).
+"""
+
+import importlib.util
+import math
+from functools import lru_cache
+
+from src.ai.telemetry import telemetry
+
+# Tokens extra que añade la API por mensaje y por respuesta
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY = 3
+
+DIFFICULTY_HINTS = {
+    "Easy": "Juega como un enemigo torpe: decisiones simples y a veces malas.",
+    "Normal": "Juega como un enemigo competente: estrategia moderada.",
+    "Hard": "Juega como un enemigo experto: maximiza el daño y acaba con el jugador.",
+}
+
+LEGEND = (
+    "Estado: J=jugador vida/máx (D=defendiendo) efectos; P=pociones; "
+    "A=aliado vida/máx; E#=enemigo nombre vida/máx efectos; B=bioma."
+)
+
+
+@lru_cache(maxsize=None)
+def _get_encoder(model):
+    """Codificador de tiktoken para el modelo, o None si tiktoken no está instalado"""
+    if importlib.util.find_spec("tiktoken") is None:
+        return None
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text, model="gpt-3.5-turbo"):
+    """Cuenta los tokens de un texto (exacto con tiktoken, aproximado sin él)"""
+    encoder = _get_encoder(model)
+    if encoder is not None:
+        return len(encoder.encode(text))
+    # Aproximación habitual: unos 4 caracteres por token
+    return math.ceil(len(text) / 4)
+
+
+def count_message_tokens(messages, model="gpt-3.5-turbo"):
+    """Tokens de entrada de una lista de mensajes de chat"""
+    return TOKENS_PER_REPLY + sum(
+        TOKENS_PER_MESSAGE + count_tokens(m["content"], model) for m in messages
+    )
+
+
+@lru_cache(maxsize=None)
+def system_header(difficulty):
+    """Cabecera fija por dificultad (misma cadena en todas las llamadas)"""
+    hint = DIFFICULTY_HINTS.get(difficulty, DIFFICULTY_HINTS["Normal"])
+    return (
+        "Decides la acción de un enemigo en un RPG por turnos. "
+        f"{hint}\n{LEGEND}\n"
+        "Responde solo con el nombre exacto de una acción."
+    )
+
+
+class BuiltPrompt:
+    """Mensajes listos para la API y su coste en tokens"""
+
+    def __init__(self, messages, tokens, budget, trimmed):
+        self.messages = messages
+        self.tokens = tokens
+        self.budget = budget
+        # Recortes aplicados para caber en el presupuesto, en orden
+        self.trimmed = trimmed
+
+    @property
+    def over_budget(self):
+        return bool(self.budget) and self.tokens > self.budget
+
+
+class PromptBuilder:
+    """
+    Codifica el estado del juego de forma compacta y estable
+
+    Args:
+        difficulty: Dificultad del juego (elige la cabecera)
+        model: Modelo para el que se cuentan los tokens
+        token_budget: Máximo de tokens de entrada (0 o None = sin límite)
+    """
+
+    def __init__(self, difficulty="Normal", model="gpt-3.5-turbo", token_budget=None):
+        self.difficulty = difficulty
+        self.model = model
+        self.token_budget = token_budget
+        self.header = system_header(difficulty)
+        self.header_tokens = TOKENS_PER_MESSAGE + count_tokens(self.header, model)
+        # Prompts del último resumen versionado (AIStateSnapshot): mientras el
+        # estado no cambie, el mismo objeto y las mismas acciones dan el mismo prompt
+        self._cached_state = None
+        self._cached_prompts = {}
+
+    def build(self, game_state, available_actions):
+        """Devuelve el BuiltPrompt más detallado que cabe en el presupuesto"""
+        if getattr(game_state, "version", None) is None:
+            # Un dict normal puede cambiar entre llamadas: sin caché
+            return self._build_prompt(game_state, available_actions)
+
+        if game_state is not self._cached_state:
+            self._cached_state = game_state
+            self._cached_prompts = {}
+        key = (tuple(available_actions), self.token_budget)
+        prompt = self._cached_prompts.get(key)
+        telemetry.record_cache("prompt_cache", prompt is not None)
+        if prompt is None:
+            prompt = self._build_prompt(game_state, available_actions)
+            self._cached_prompts[key] = prompt
+        return prompt
+
+    def _build_prompt(self, game_state, available_actions):
+        enemies = game_state.get("enemies", [])
+        options = {"enemy_effects": True, "biome": True, "max_enemies": len(enemies)}
+        trimmed = []
+
+        messages, tokens = self._build(game_state, available_actions, options)
+        if self.token_budget:
+            # Recortes de menor a mayor pérdida de información
+            for step in ("biome", "enemy_effects"):
+                if tokens <= self.token_budget:
+                    break
+                options[step] = False
+                trimmed.append(step)
+                messages, tokens = self._build(game_state, available_actions, options)
+
+            if tokens > self.token_budget:
+                # Búsqueda binaria del mayor número de enemigos que cabe
+                low, high = 0, len(enemies) - 1
+                while low < high:
+                    middle = (low + high + 1) // 2
+                    options["max_enemies"] = middle
+                    _, size = self._build(game_state, available_actions, options)
+                    if size <= self.token_budget:
+                        low = middle
+                    else:
+                        high = middle - 1
+                options["max_enemies"] = low
+                messages, tokens = self._build(game_state, available_actions, options)
+                trimmed.append(f"enemies:{len(enemies) - low}")
+
+        return BuiltPrompt(messages, tokens, self.token_budget, trimmed)
+
+    def _build(self, game_state, available_actions, options):
+        lines = [self._player_line(game_state), f"P {game_state.get('potions', 0)}"]
+
+        ally = game_state.get("ally")
+        if ally:
+            lines.append(f"A {ally['health']}/{ally['max_health']}")
+
+        enemies = game_state.get("enemies", [])
+        for i, enemy in enumerate(enemies[: options["max_enemies"]]):
+            line = f"E{i + 1} {enemy['name']} {enemy['health']}/{enemy['max_health']}"
+            if options["enemy_effects"] and enemy.get("status_effects"):
+                line += " " + ",".join(enemy["status_effects"])
+            lines.append(line)
+        hidden = len(enemies) - options["max_enemies"]
+        if hidden > 0:
+            lines.append(f"E+{hidden}")
+
+        if options["biome"] and "biome" in game_state:
+            lines.append(f"B {game_state['biome']}")
+
+        lines.append("Acciones:")
+        lines.append(", ".join(available_actions))
+
+        state = "\n".join(lines)
+        messages = [
+            {"role": "system", "content": self.header},
+            {"role": "user", "content": state},
+        ]
+        tokens = (
+            TOKENS_PER_REPLY
+            + self.header_tokens
+            + TOKENS_PER_MESSAGE
+            + count_tokens(state, self.model)
+        )
+        return messages, tokens
+
+    @staticmethod
+    def _player_line(game_state):
+        line = (
+            f"J {game_state.get('player_health', 0)}/"
+            f"{game_state.get('player_max_health', 100)}"
+        )
+        if game_state.get("player_defending"):
+            line += " D"
+        if game_state.get("player_status_effects"):
+            line += " " + ",".join(game_state["player_status_effects"])
+        return line
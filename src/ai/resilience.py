@@ -0,0 +1,259 @@
+"""
+Capa de resiliencia compartida para las llamadas a la API de IA: limitador de
+peticiones (token bucket), reintentos con espera aleatoria dentro de un plazo
+por llamada y un cortocircuito (circuit breaker) que deja de llamar a un
+backend caído y lo vuelve a probar pasado un tiempo.
+
+Todas las instancias de ChatGPTClient que hablan con el mismo backend comparten
+el mismo ResilientCaller, así que una caída cuesta un único timeout en lugar de
+uno por enemigo y turno.
+"""
+
+import random
+import threading
+import time
+
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """El backend está marcado como caído; hay que usar la alternativa local"""
+
+
+class RateLimitedError(Exception):
+    """No hubo cupo en el limitador antes de que venciera el plazo de la llamada"""
+
+
+class DeadlineExceededError(Exception):
+    """Se agotó el plazo de la llamada sin una respuesta válida"""
+
+
+class AttemptCancelled(Exception):
+    """
+    Quien hizo la llamada la canceló (otra petición en cobertura ya respondió):
+    no dice nada del backend, así que no cuenta ni como éxito ni como fallo
+    """
+
+
+class TokenBucket:
+    """Limitador de peticiones: `rate` fichas por segundo con ráfagas de hasta `capacity`"""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Toma una ficha si hay; devuelve los segundos a esperar si no (0 = concedida)"""
+        with self.lock:
+            now = self.clock()
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate > 0 else float("inf")
+
+    def acquire(self, timeout):
+        """Espera una ficha durante como mucho `timeout` segundos"""
+        deadline = self.clock() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            remaining = deadline - self.clock()
+            if wait > remaining:
+                return False
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Cortocircuito de tres estados:
+        closed: las llamadas pasan; tras `failure_threshold` fallos seguidos se abre
+        open: las llamadas se rechazan hasta que pasan `reset_timeout` segundos
+        half_open: se deja pasar una única llamada de prueba; si va bien se cierra
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Indica si se puede intentar una llamada ahora"""
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open":
+                if self.clock() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = "half_open"
+                self.probe_in_flight = False
+            # half_open: una sola llamada de prueba a la vez
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def release_probe(self):
+        """Devuelve la llamada de prueba sin contarla como éxito ni como fallo"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def record_success(self):
+        with self.lock:
+            self.state = "closed"
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self, trip=False):
+        """Registra un fallo; con trip=True se abre de inmediato"""
+        with self.lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if trip or self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    log.warning(
+                        "Backend de IA marcado como caído",
+                        failures=self.failures,
+                        retry_in_s=round(self.reset_timeout),
+                    )
+                self.state = "open"
+                self.opened_at = self.clock()
+
+
+class RetryPolicy:
+    """Reintentos acotados con espera exponencial y jitter completo"""
+
+    def __init__(self, max_retries=2, base_delay=0.25, max_delay=2.0, rng=None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt):
+        """Espera antes del reintento número `attempt` (empezando en 1)"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def is_timeout(error):
+    """Reconoce timeouts tanto del SDK de OpenAI como de Python"""
+    return isinstance(error, TimeoutError) or "Timeout" in type(error).__name__
+
+
+def is_retryable(error):
+    """Los errores 4xx (salvo 408, 409 y 429) no mejoran reintentando"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return True
+    return status >= 500 or status in (408, 409, 429)
+
+
+class ResilientCaller:
+    """
+    Ejecuta llamadas a un backend pasando por limitador, reintentos y cortocircuito
+
+    `fn(timeout)` debe lanzar la petición con el timeout indicado (el menor entre
+    el timeout por intento y lo que quede del plazo de la llamada). Los
+    reintentos no cuentan para el cortocircuito: una llamada que agota sus
+    reintentos es un único fallo, y una cancelada (AttemptCancelled) no cuenta.
+    """
+
+    def __init__(self, name, limiter=None, breaker=None, retry=None, clock=time.monotonic):
+        self.name = name
+        self.limiter = limiter
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.retry = retry or RetryPolicy()
+        self.clock = clock
+
+    def call(self, fn, attempt_timeout, deadline=None):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"Backend {self.name} no disponible")
+
+        start = self.clock()
+        deadline_at = start + (deadline if deadline is not None else attempt_timeout)
+        attempt = 0
+
+        while True:
+            remaining = deadline_at - self.clock()
+            if self.limiter and not self.limiter.acquire(max(0.0, remaining)):
+                self.breaker.release_probe()
+                raise RateLimitedError(f"Sin cupo para {self.name} dentro del plazo")
+
+            remaining = deadline_at - self.clock()
+            if remaining <= 0:
+                self.breaker.record_failure()
+                raise DeadlineExceededError(f"Plazo agotado llamando a {self.name}")
+
+            try:
+                result = fn(min(attempt_timeout, remaining))
+            except AttemptCancelled:
+                self.breaker.release_probe()
+                raise
+            except Exception as e:
+                attempt += 1
+                retry = not (
+                    is_timeout(e)
+                    or not is_retryable(e)
+                    or attempt > self.retry.max_retries
+                    or not self.breaker.allow()
+                )
+                delay = self.retry.backoff(attempt) if retry else 0.0
+                if not retry or self.clock() + delay >= deadline_at:
+                    # Un solo fallo por llamada, cuando ya no quedan reintentos. Un
+                    # timeout ya ha consumido el plazo: abrir el circuito de
+                    # inmediato para que el resto de llamadas no paguen otro
+                    self.breaker.record_failure(trip=is_timeout(e))
+                    raise
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
+
+
+# Una instancia por backend, compartida por todos los clientes del proceso
+_CALLERS = {}
+_CALLERS_LOCK = threading.Lock()
+
+
+def get_resilient_caller(api_base, model, config):
+    """Devuelve el ResilientCaller compartido para un backend (api_base + modelo)"""
+    key = (api_base or "", model)
+    with _CALLERS_LOCK:
+        caller = _CALLERS.get(key)
+        if caller is None:
+            rate = config.get("rate_limit_per_sec", 0)
+            caller = ResilientCaller(
+                name=model,
+                limiter=(
+                    TokenBucket(rate, config.get("rate_limit_burst"))
+                    if rate
+                    else None
+                ),
+                breaker=CircuitBreaker(
+                    failure_threshold=config.get("breaker_failure_threshold", 3),
+                    reset_timeout=config.get("breaker_reset_timeout", 30),
+                ),
+                retry=RetryPolicy(
+                    max_retries=config.get("max_retries", 2),
+                    base_delay=config.get("retry_base_delay", 0.25),
+                    max_delay=config.get("retry_max_delay", 2.0),
+                ),
+            )
+            _CALLERS[key] = caller
+        return caller
@@ -0,0 +1,200 @@
+"""
+Selección de objetivo de los enemigos para un turno completo.
+
+En lugar de recalcular para cada enemigo la salud de los objetivos y si el aliado
+puede curar, se calcula una vez por turno una matriz de prioridad enemigos x
+objetivos (jugador, aliado) a partir de:
+    - Daño esperado del ataque más fuerte de cada enemigo, relativo a la salud
+      que le queda al objetivo (con la defensa aplicada).
+    - Probabilidad de matar al objetivo de un golpe (distribuciones de
+      src/sim/rules.py, cacheadas).
+    - Prioridad extra para el aliado si puede curar.
+Cada enemigo ataca al objetivo de mayor prioridad (argmax por fila). Los
+enemigos sin ataques de dados no tienen fila y atacan al jugador.
+
+Con NumPy instalado y grupos grandes la matriz se calcula vectorizada; si no,
+con bucles de Python (más rápidos para los 3 enemigos habituales).
+"""
+
+import importlib.util
+from functools import lru_cache
+
+from src.sim.rules import damage_distribution, expected_damage
+
+# Peso de la probabilidad de muerte frente a la fracción de salud quitada
+KILL_WEIGHT = 2.0
+# Multiplicador de prioridad del aliado si puede curar (antes: su peso * 0.7)
+HEALER_PRIORITY = 1 / 0.7
+# A partir de cuántos enemigos compensa usar NumPy
+NUMPY_MIN_ENEMIES = 32
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Módulo numpy, o None si no está instalado (se importa solo si hace falta)"""
+    if importlib.util.find_spec("numpy") is None:
+        return None
+    import numpy
+
+    return numpy
+
+
+@lru_cache(maxsize=1024)
+def strongest_attack(signatures):
+    """(dados, caras) de mayor daño esperado entre los de un enemigo, o None si no tiene"""
+    if not signatures:
+        return None
+    return max(signatures, key=lambda s: expected_damage(*s))
+
+
+def _signature(enemy):
+    return strongest_attack(
+        tuple(
+            (attack["dice"], attack["sides"])
+            for attack in enemy.attacks.values()
+            if "dice" in attack
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def kill_probability(dice, sides, health, defending=False):
+    """Probabilidad de que un ataque deje a 0 a un objetivo con `health` de vida"""
+    if health <= 0:
+        return 1.0
+    return sum(
+        p
+        for value, p in damage_distribution(dice, sides)
+        if (max(1, value // 2) if defending else value) >= health
+    )
+
+
+@lru_cache(maxsize=None)
+def _expected_received(dice, sides, defending=False):
+    if not defending:
+        return expected_damage(dice, sides)
+    return sum(p * max(1, value // 2) for value, p in damage_distribution(dice, sides))
+
+
+class TargetPlan:
+    """Objetivo elegido para cada enemigo del turno"""
+
+    def __init__(self, targets, choices, scores, rows=None):
+        self.targets = targets
+        self.choices = choices
+        self.scores = scores
+        # {índice de enemigo: fila}, si algún enemigo se quedó sin fila
+        self.rows = rows
+
+    def target_for(self, index, game_state):
+        """Objetivo del enemigo `index`; el jugador si el elegido ya ha caído"""
+        row = index if self.rows is None else self.rows.get(index)
+        if row is None or row >= len(self.choices):
+            return game_state.player
+        target = self.targets[int(self.choices[row])]
+        if target is not game_state.player and not (
+            game_state.ally is target and target.is_alive()
+        ):
+            return game_state.player
+        return target
+
+
+def _targets(game_state):
+    targets = [game_state.player]
+    ally = game_state.ally
+    if ally and ally.is_alive():
+        targets.append(ally)
+    return targets
+
+
+def _target_weights(game_state, targets):
+    weights = [1.0] * len(targets)
+    if len(targets) > 1 and any("heal" in a for a in targets[1].attacks.values()):
+        weights[1] = HEALER_PRIORITY
+    return weights
+
+
+def plan_targets(game_state, use_numpy=None):
+    """
+    Calcula la matriz de prioridad del turno y el objetivo de cada enemigo
+
+    Args:
+        use_numpy: Forzar (True) o desactivar (False) NumPy; por defecto se usa
+            con NUMPY_MIN_ENEMIES enemigos o más si está instalado
+    """
+    targets = _targets(game_state)
+    signatures = [_signature(enemy) for enemy in game_state.enemies]
+    rows = None
+    if None in signatures:
+        # Enemigos sin ataques de dados: se saltan sus filas
+        armed = [i for i, signature in enumerate(signatures) if signature is not None]
+        rows = {index: row for row, index in enumerate(armed)}
+        signatures = [signatures[i] for i in armed]
+    if not signatures:
+        return TargetPlan(targets, [], [], rows)
+
+    if use_numpy is None:
+        use_numpy = len(signatures) >= NUMPY_MIN_ENEMIES
+    np = _numpy() if use_numpy else None
+    if np is not None:
+        plan = _plan_numpy(np, targets, signatures, _target_weights(game_state, targets))
+    else:
+        plan = _plan_python(targets, signatures, _target_weights(game_state, targets))
+    plan.rows = rows
+    return plan
+
+
+def _plan_python(targets, signatures, weights):
+    scores = []
+    choices = []
+    for dice, sides in signatures:
+        row = [
+            weight
+            * (
+                KILL_WEIGHT * kill_probability(dice, sides, t.health, t.defending)
+                + min(1.0, _expected_received(dice, sides, t.defending) / max(1, t.health))
+            )
+            for t, weight in zip(targets, weights)
+        ]
+        scores.append(row)
+        choices.append(max(range(len(row)), key=row.__getitem__))
+    return TargetPlan(targets, choices, scores)
+
+
+@lru_cache(maxsize=64)
+def _survival_table(unique):
+    """
+    Para cada firma (dados, caras): P(daño >= h) para h = 0..máximo+1, sin y con
+    defensa, y el daño esperado recibido sin y con defensa
+    """
+    np = _numpy()
+    top = max(dice * sides * 2 for dice, sides in unique) + 2
+    survival = np.zeros((2, len(unique), top))
+    expected = np.zeros((2, len(unique)))
+    for row, (dice, sides) in enumerate(unique):
+        for defending in (0, 1):
+            pmf = np.zeros(top)
+            for value, p in damage_distribution(dice, sides):
+                pmf[max(1, value // 2) if defending else value] += p
+            # survival[h] = P(daño >= h)
+            survival[defending, row] = np.cumsum(pmf[::-1])[::-1]
+            expected[defending, row] = _expected_received(dice, sides, bool(defending))
+    return survival, expected
+
+
+def _plan_numpy(np, targets, signatures, weights):
+    unique = tuple(sorted(set(signatures)))
+    survival, expected = _survival_table(unique)
+    index = {signature: i for i, signature in enumerate(unique)}
+    rows = np.fromiter((index[s] for s in signatures), dtype=np.intp, count=len(signatures))
+
+    health = np.array([max(0, t.health) for t in targets], dtype=np.intp)
+    defending = np.array([1 if t.defending else 0 for t in targets], dtype=np.intp)
+    # Salud por encima del daño máximo -> última columna (probabilidad 0)
+    columns = np.minimum(health, survival.shape[2] - 1)
+
+    kill = survival[defending[None, :], rows[:, None], columns[None, :]]
+    damage = expected[defending[None, :], rows[:, None]]
+    fraction = np.minimum(1.0, damage / np.maximum(1, health)[None, :])
+    scores = (KILL_WEIGHT * kill + fraction) * np.array(weights)[None, :]
+    return TargetPlan(targets, scores.argmax(axis=1), scores)
@@ -0,0 +1,263 @@
+"""
+Telemetría de las llamadas de IA, agrupada por punto de llamada
+(get_decision, generate_boss_phrase, get_completion, WisdomGenerator...).
+
+Por cada punto se registran histogramas de latencia, tokens de entrada y salida
+(de `response.usage`, incluidos los servidos desde la caché del proveedor),
+tokens de los prompts compactos contados en local (BuiltPrompt.tokens) y
+cuántos hubo que recortar,
+timeouts, errores, cortocircuitos, fallos al interpretar la respuesta, aciertos
+de caché y peticiones agrupadas con otra idéntica en vuelo. Las cachés propias
+cuentan en sus puntos: "prompt_cache" (prompts por versión del estado) y
+get_decision (una petición agrupada es un acierto). Se consulta en el propio
+proceso con `telemetry.snapshot()` y se vuelca a JSON al salir si
+`telemetry_file` está configurado.
+
+Uso:
+    with telemetry.track("get_decision") as call:
+        try:
+            response = ...
+            telemetry.record_usage(response.usage)
+        except Exception as e:
+            call.fail(e)
+            call.fallback()
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from src.ai.resilience import CircuitOpenError, is_timeout
+from src.utils.stats import summarize_latencies
+
+# Límites superiores (ms) de los cubos del histograma de latencia
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# Latencias recientes conservadas por punto de llamada para los percentiles
+LATENCY_WINDOW = 1000
+
+
+class SiteStats:
+    """Contadores de un punto de llamada"""
+
+    COUNTERS = (
+        "calls",
+        "ok",
+        "timeouts",
+        "errors",
+        "circuit_open",
+        "fallbacks",
+        "parse_failures",
+        "prompt_tokens",
+        "completion_tokens",
+        "cached_prompt_tokens",
+        "built_prompts",
+        "built_prompt_tokens",
+        "trimmed_prompts",
+        "cache_hits",
+        "cache_misses",
+        "coalesced",
+    )
+
+    def __init__(self):
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms):
+        self.latencies.append(ms)
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def snapshot(self):
+        counters = dict(self.counters)
+        observed = sum(self.buckets)
+        lookups = counters["cache_hits"] + counters["cache_misses"]
+        histogram = {f"le_{bound}": n for bound, n in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        histogram["inf"] = self.buckets[-1]
+        return {
+            **counters,
+            "latency_ms": {
+                **summarize_latencies(list(self.latencies)),
+                "mean": self.total_ms / observed if observed else 0.0,
+                "max": self.max_ms,
+                "histogram": histogram,
+            },
+            "cache_hit_rate": counters["cache_hits"] / lookups if lookups else None,
+            "mean_built_prompt_tokens": (
+                counters["built_prompt_tokens"] / counters["built_prompts"]
+                if counters["built_prompts"]
+                else None
+            ),
+            "prompt_cache_rate": (
+                counters["cached_prompt_tokens"] / counters["prompt_tokens"]
+                if counters["prompt_tokens"]
+                else None
+            ),
+        }
+
+
+class TrackedCall:
+    """Resultado de una llamada en curso; lo devuelve AITelemetry.track"""
+
+    def __init__(self, site):
+        self.site = site
+        self.outcome = "ok"
+        self.used_fallback = False
+
+    def fail(self, error):
+        """Clasifica un error capturado por el llamador como resultado de la llamada"""
+        if isinstance(error, CircuitOpenError):
+            self.outcome = "circuit_open"
+        elif is_timeout(error):
+            self.outcome = "timeouts"
+        else:
+            self.outcome = "errors"
+
+    def fallback(self):
+        """Marca que la llamada terminó usando la respuesta local o predefinida"""
+        self.used_fallback = True
+
+
+class AITelemetry:
+    """Registro de métricas de IA, seguro entre hilos"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sites = {}
+        self.local = threading.local()
+        self.dump_path = None
+
+    def _site(self, site):
+        stats = self.sites.get(site)
+        if stats is None:
+            stats = self.sites[site] = SiteStats()
+        return stats
+
+    def count(self, site, counter, amount=1):
+        with self.lock:
+            self._site(site).counters[counter] += amount
+
+    def record_cache(self, site, hit):
+        """Registra una consulta a una caché de respuestas"""
+        self.count(site, "cache_hits" if hit else "cache_misses")
+
+    def current_site(self):
+        """Punto de llamada activo en este hilo (o None)"""
+        call = getattr(self.local, "call", None)
+        return call.site if call else None
+
+    def record_usage(self, usage, site=None):
+        """Suma los tokens de un objeto `usage` de la API al punto de llamada activo"""
+        site = site or self.current_site()
+        if usage is None or site is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.record_tokens(
+            getattr(usage, "prompt_tokens", 0) or 0,
+            getattr(usage, "completion_tokens", 0) or 0,
+            getattr(details, "cached_tokens", 0) or 0,
+            site,
+        )
+
+    def record_prompt(self, prompt, site=None):
+        """
+        Registra un BuiltPrompt (src/ai/prompt_builder.py): sus tokens contados
+        en local y si hubo que recortarlo para caber en el presupuesto
+        """
+        site = site or self.current_site()
+        if site is None:
+            return
+        with self.lock:
+            counters = self._site(site).counters
+            counters["built_prompts"] += 1
+            counters["built_prompt_tokens"] += prompt.tokens
+            counters["trimmed_prompts"] += bool(prompt.trimmed)
+
+    def record_tokens(self, prompt, completion, cached=0, site=None):
+        """Suma tokens contados a mano (p. ej. un stream cortado antes del uso final)"""
+        site = site or self.current_site()
+        if site is None:
+            return
+        with self.lock:
+            counters = self._site(site).counters
+            counters["prompt_tokens"] += prompt
+            counters["completion_tokens"] += completion
+            counters["cached_prompt_tokens"] += cached
+
+    @contextmanager
+    def track(self, site):
+        """
+        Mide una llamada y clasifica su resultado
+
+        Las llamadas anidadas se atribuyen al punto más externo: así una
+        frase de WisdomGenerator no cuenta también como get_completion.
+        """
+        outer = getattr(self.local, "call", None)
+        if outer is not None:
+            yield outer
+            return
+
+        call = TrackedCall(site)
+        self.local.call = call
+        start = time.perf_counter()
+        try:
+            yield call
+        except Exception as e:
+            call.fail(e)
+            raise
+        finally:
+            self.local.call = None
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                stats = self._site(site)
+                stats.counters["calls"] += 1
+                stats.counters[call.outcome] += 1
+                if call.used_fallback:
+                    stats.counters["fallbacks"] += 1
+                stats.observe(elapsed_ms)
+
+    def snapshot(self):
+        """Copia de todas las métricas, por punto de llamada"""
+        with self.lock:
+            return {site: stats.snapshot() for site, stats in self.sites.items()}
+
+    def reset(self):
+        with self.lock:
+            self.sites.clear()
+
+    def dump(self, path=None):
+        """Escribe las métricas en un archivo JSON"""
+        path = path or self.dump_path
+        if not path:
+            return
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {"timestamp": time.time(), "sites": self.snapshot()},
+                f,
+                indent=4,
+            )
+
+    def dump_at_exit(self, path):
+        """Vuelca las métricas a `path` cuando termine el proceso"""
+        if self.dump_path is None:
+            atexit.register(self.dump)
+        self.dump_path = path
+
+
+# Instancia compartida por todo el proceso
+telemetry = AITelemetry()
@@ -2,6 +2,10 @@
 import pygame
 import os
 
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
 
 def load_character_images():
     """Carga las imágenes de los personajes"""
@@ -12,31 +16,30 @@ def load_character_images():
         os.path.dirname(os.path.dirname(__file__)), "assets", "images"
     )
 
-    # Debug para ver la ruta
-    print(f"Buscando imágenes en: {image_dir}")
+    log.debug("Buscando imágenes", path=image_dir)
 
     # Intentar cargar las imágenes
     try:
         player_path = os.path.join(image_dir, "player.jpg")
         ally_path = os.path.join(image_dir, "ally.jpg")
 
-        print(f"Ruta de player: {player_path}, existe: {os.path.exists(player_path)}")
-        print(f"Ruta de ally: {ally_path}, existe: {os.path.exists(ally_path)}")
+        log.debug("Ruta de imagen", personaje="player", path=player_path)
+        log.debug("Ruta de imagen", personaje="ally", path=ally_path)
 
         if os.path.exists(player_path):
             player_img = pygame.image.load(player_path)
             player_img = pygame.transform.scale(player_img, (80, 80))
             images["player"] = player_img
-            print("Imagen del jugador cargada correctamente")
+            log.debug("Imagen del jugador cargada")
 
         if os.path.exists(ally_path):
             ally_img = pygame.image.load(ally_path)
             ally_img = pygame.transform.scale(ally_img, (80, 80))
             images["ally"] = ally_img
-            print("Imagen del aliado cargada correctamente")
+            log.debug("Imagen del aliado cargada")
 
     except Exception as e:
-        print(f"Error cargando imágenes de personajes: {e}")
+        log.error("Error cargando imágenes de personajes", error=str(e))
 
     return images
     """Carga las imágenes de los personajes"""
@@ -45,31 +48,30 @@ def load_character_images():
     # Rutas a las imágenes (directamente en assets, sin subcarpeta images)
     image_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets")
 
-    # Debug para ver la ruta
-    print(f"Buscando imágenes en: {image_dir}")
+    log.debug("Buscando imágenes", path=image_dir)
 
     # Intentar cargar las imágenes
     try:
         player_path = os.path.join(image_dir, "player.jpg")
         ally_path = os.path.join(image_dir, "ally.jpg")
 
-        print(f"Ruta de player: {player_path}, existe: {os.path.exists(player_path)}")
-        print(f"Ruta de ally: {ally_path}, existe: {os.path.exists(ally_path)}")
+        log.debug("Ruta de imagen", personaje="player", path=player_path)
+        log.debug("Ruta de imagen", personaje="ally", path=ally_path)
 
         if os.path.exists(player_path):
             player_img = pygame.image.load(player_path)
             player_img = pygame.transform.scale(player_img, (80, 80))
             images["player"] = player_img
-            print("Imagen del jugador cargada correctamente")
+            log.debug("Imagen del jugador cargada")
 
         if os.path.exists(ally_path):
             ally_img = pygame.image.load(ally_path)
             ally_img = pygame.transform.scale(ally_img, (80, 80))
             images["ally"] = ally_img
-            print("Imagen del aliado cargada correctamente")
+            log.debug("Imagen del aliado cargada")
 
     except Exception as e:
-        print(f"Error cargando imágenes de personajes: {e}")
+        log.error("Error cargando imágenes de personajes", error=str(e))
 
     return images
 
@@ -99,8 +101,70 @@ class CharacterType(Enum):
 
 # Añade este atributo al inicializador de Character
 
+# Campos de un personaje que forman parte del resumen para la IA
+AI_TRACKED_FIELDS = frozenset(("name", "health", "max_health", "defending", "status_effects"))
+
+
+class StatusEffects(dict):
+    """Efectos de estado (efecto -> turnos) que avisan a su personaje al cambiar"""
+
+    owner = None
+
+    def __init__(self, owner=None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.owner = owner
+
+    def _changed(self):
+        if self.owner is not None:
+            self.owner.mark_ai_dirty()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
 
 class Character:
+    def __setattr__(self, name, value):
+        if name == "status_effects" and not isinstance(value, StatusEffects):
+            value = StatusEffects(self, value)
+        object.__setattr__(self, name, value)
+        if name in AI_TRACKED_FIELDS:
+            self.mark_ai_dirty()
+
+    def mark_ai_dirty(self):
+        """Avisa al estado del juego de que el resumen de este personaje ha cambiado"""
+        game_state = self.__dict__.get("game_state")
+        mark = getattr(game_state, "mark_ai_dirty", None)
+        if mark is not None:
+            mark(self)
+
     def __init__(self, name, health, max_health, attacks, character_type):
         self.name = name
         self.health = health
@@ -164,8 +228,44 @@ class Character:
         return self.health > 0
 
 
+# A partir de cuántos enemigos se usa el modo de batalla grande (rejilla con
+# desplazamiento, turnos enemigos en bloque y sin animaciones por ataque)
+LARGE_BATTLE_THRESHOLD = 6
+
+
+class AIStateSnapshot(dict):
+    """
+    Resumen del estado para la IA. Es un dict normal (se serializa igual) con el
+    número de versión del estado del que sale; no se debe modificar.
+    """
+
+    version = 0
+
+
+# Campos del GameState que forman parte del resumen para la IA
+AI_TRACKED_STATE = frozenset(("player", "ally", "enemies", "potions", "biome"))
+
+
 class GameState:
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name in AI_TRACKED_STATE:
+            self.mark_ai_dirty()
+
     def __init__(self):
+        # Resumen incremental para la IA (ver get_game_state_for_ai)
+        self.ai_state_version = 0
+        self._ai_snapshot = None
+        self._ai_dirty = True
+        self._ai_dirty_characters = set()
+        self._ai_entries = {}
+        self._ai_enemies_list = None
+        self._ai_enemies_size = -1
+        self._ai_ally = None
+
+        # Multiplicadores de salud de la dificultad (config/difficulty_tuning.json)
+        self.difficulty_multipliers = {}
+
         # Jugador con más ataques
         self.player = Character(
             name="Brujo",
@@ -220,18 +320,74 @@ class GameState:
         self.tutorial = True
         self.using_ai = True
         self.biome = 0
+        self.enemy_scroll = 0  # Primera fila visible en el modo de batalla grande
+
+        # Mapa id(enemigo) -> índice, reconstruido solo cuando cambia la lista
+        self._enemy_index = {}
+        self._enemy_index_list = None
+        self._enemy_index_size = -1
 
         # Ahora carga y asigna las imágenes DESPUÉS de crear los personajes
         try:
             character_images = load_character_images()
             if "player" in character_images:
                 self.player.image = character_images["player"]
-                print("Imagen asignada al jugador")
+                log.debug("Imagen asignada al jugador")
             if "ally" in character_images and self.ally:
                 self.ally.image = character_images["ally"]
-                print("Imagen asignada al aliado")
+                log.debug("Imagen asignada al aliado")
         except Exception as e:
-            print(f"Error asignando imágenes a personajes: {e}")
+            log.error("Error asignando imágenes a personajes", error=str(e))
+
+    def is_large_battle(self):
+        return len(self.enemies) > LARGE_BATTLE_THRESHOLD
+
+    def enemy_index(self, enemy):
+        """Índice de un enemigo en la lista (None si no está), en O(1)"""
+        if (
+            self._enemy_index_list is not self.enemies
+            or self._enemy_index_size != len(self.enemies)
+        ):
+            self._enemy_index = {id(e): i for i, e in enumerate(self.enemies)}
+            self._enemy_index_list = self.enemies
+            self._enemy_index_size = len(self.enemies)
+        return self._enemy_index.get(id(enemy))
+
+    def remove_enemy(self, enemy):
+        """
+        Quita un enemigo de la lista; devuelve False si no estaba
+
+        En una batalla grande el último enemigo ocupa el hueco (intercambio y
+        pop): solo cambia una entrada del mapa de índices, así que las bajas de
+        un turno cuestan O(1) cada una en vez de desplazar la lista y rehacer el
+        mapa entero. Con pocos enemigos se conserva el orden en pantalla.
+        """
+        index = self.enemy_index(enemy)
+        if index is None:
+            return False
+        enemies = self.enemies
+        del self._enemy_index[id(enemy)]
+        if self.is_large_battle():
+            last = enemies.pop()
+            if last is not enemy:
+                enemies[index] = last
+                self._enemy_index[id(last)] = index
+                # La selección sigue al enemigo que cambia de sitio
+                if self.selected_enemy == len(enemies):
+                    self.selected_enemy = index
+        else:
+            del enemies[index]
+            for i in range(index, len(enemies)):
+                self._enemy_index[id(enemies[i])] = i
+        self._enemy_index_size = len(enemies)
+        self.mark_ai_dirty()
+        return True
+
+    def mark_ai_dirty(self, character=None):
+        """Marca el resumen para la IA como desactualizado (solo `character` si se indica)"""
+        self._ai_dirty = True
+        if character is not None:
+            self._ai_dirty_characters.add(character)
 
     def add_message(self, text, color=(0, 0, 0)):
         """Añade un mensaje al registro del juego"""
@@ -239,38 +395,83 @@ class GameState:
         if len(self.messages) > 5:
             self.messages.pop()
 
-    def get_game_state_for_ai(self):
-        """Prepara un resumen del estado del juego para enviar a la IA"""
-        enemy_info = []
-        for enemy in self.enemies:
-            enemy_info.append(
-                {
-                    "name": enemy.name,
-                    "health": enemy.health,
-                    "max_health": enemy.max_health,
-                    "status_effects": (
-                        list(enemy.status_effects.keys())
-                        if hasattr(enemy, "status_effects")
-                        else []
-                    ),
-                }
-            )
-
+    @staticmethod
+    def _enemy_ai_entry(enemy):
         return {
-            "player_health": self.player.health,
-            "player_max_health": self.player.max_health,
-            "player_defending": self.player.defending,
-            "player_status_effects": (
-                list(self.player.status_effects.keys())
-                if hasattr(self.player, "status_effects")
+            "name": enemy.name,
+            "health": enemy.health,
+            "max_health": enemy.max_health,
+            "status_effects": (
+                list(enemy.status_effects.keys())
+                if hasattr(enemy, "status_effects")
                 else []
             ),
-            "enemies": enemy_info,
-            "ally": (
+        }
+
+    def get_game_state_for_ai(self):
+        """
+        Prepara un resumen del estado del juego para enviar a la IA
+
+        El resumen se mantiene de forma incremental: los cambios de salud,
+        efectos, defensa, pociones y enemigos lo marcan como sucio y solo se
+        reconstruyen los personajes afectados. Si nada ha cambiado se devuelve el
+        mismo objeto; su atributo `version` sirve de clave para cachés.
+        """
+        enemies = self.enemies
+        structure_changed = (
+            enemies is not self._ai_enemies_list
+            or len(enemies) != self._ai_enemies_size
+        )
+        if not self._ai_dirty and not structure_changed and self._ai_snapshot is not None:
+            return self._ai_snapshot
+
+        previous = self._ai_snapshot
+        dirty = self._ai_dirty_characters
+        if structure_changed or previous is None:
+            # Lista de enemigos nueva o con bajas: se rehace entera
+            for character in [self.player, self.ally] + enemies:
+                if character is not None and character.__dict__.get("game_state") is not self:
+                    character.game_state = self
+            enemy_info = [self._enemy_ai_entry(enemy) for enemy in enemies]
+            self._ai_enemies_list = enemies
+            self._ai_enemies_size = len(enemies)
+        else:
+            # Solo se rehacen las entradas de los enemigos marcados
+            enemy_info = previous["enemies"]
+            changed = [i for i in map(self.enemy_index, dirty) if i is not None]
+            if changed:
+                enemy_info = list(enemy_info)
+                for i in changed:
+                    enemy_info[i] = self._enemy_ai_entry(enemies[i])
+
+        if previous is None or self.ally is not self._ai_ally or self.ally in dirty:
+            ally_info = (
                 {"health": self.ally.health, "max_health": self.ally.max_health}
                 if self.ally
                 else None
+            )
+            self._ai_ally = self.ally
+        else:
+            ally_info = previous["ally"]
+
+        snapshot = AIStateSnapshot(
+            player_health=self.player.health,
+            player_max_health=self.player.max_health,
+            player_defending=self.player.defending,
+            player_status_effects=(
+                list(self.player.status_effects.keys())
+                if hasattr(self.player, "status_effects")
+                else []
             ),
-            "potions": self.potions,
-            "biome": self.biome,
-        }
+            enemies=enemy_info,
+            ally=ally_info,
+            potions=self.potions,
+            biome=self.biome,
+        )
+        self.ai_state_version += 1
+        snapshot.version = self.ai_state_version
+
+        self._ai_snapshot = snapshot
+        self._ai_dirty = False
+        dirty.clear()
+        return snapshot
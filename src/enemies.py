@@ -1,5 +1,8 @@
 import pygame
 from src.characters import Character, CharacterType
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
 
 
 # Cargar imágenes
@@ -130,7 +133,7 @@ def create_enemies_for_biome(biome):
             elif "Esqueleto 2" in enemy.name:
                 enemy.image = images["skeleton_archer"]
     except Exception as e:
-        print(f"Error cargando imágenes: {e}")
+        log.error("Error cargando imágenes de enemigos", error=str(e))
 
     return enemies
 
@@ -205,7 +208,7 @@ def create_enemies_for_tutorial():
         enemies[1].image = images["skeleton_archer"]
         enemies[2].image = images["skeleton_mage"]
     except Exception as e:
-        print(f"Error cargando imágenes: {e}")
+        log.error("Error cargando imágenes de enemigos", error=str(e))
 
     return enemies
 
@@ -280,15 +283,25 @@ def create_enemies_for_tutorial():
         enemies[1].image = images["skeleton_archer"]
         enemies[2].image = images["skeleton_mage"]
     except Exception as e:
-        print(f"Error asignando imágenes a enemigos: {e}")
+        log.error("Error asignando imágenes a enemigos", error=str(e))
 
     return enemies
 
 
-def create_boss(player):
+def scale_health(characters, multiplier):
+    """Multiplica la salud (actual y máxima) de varios personajes"""
+    if multiplier == 1.0:
+        return characters
+    for character in characters:
+        character.max_health = max(1, int(character.max_health * multiplier))
+        character.health = min(character.max_health, max(1, int(character.health * multiplier)))
+    return characters
+
+
+def create_boss(player, health_multiplier=1.0):
     """Crea el jefe final, adaptado al nivel del jugador"""
     # Calcular estadísticas basadas en el jugador (para equilibrar dificultad)
-    boss_health = max(200, player.max_health * 2)
+    boss_health = max(1, int(max(200, player.max_health * 2) * health_multiplier))
 
     # Crear el jefe con ataques poderosos
     boss = Character(
@@ -343,6 +356,27 @@ def create_boss(player):
             )  # Un poco más grande
             boss.image = boss_img
     except Exception as e:
-        print(f"Error cargando imagen del jefe: {e}")
+        log.error("Error cargando imagen del jefe", error=str(e))
 
     return boss
+
+
+def create_horde(count=500):
+    """
+    Crea una horda de `count` enemigos para batallas grandes y pruebas de carga.
+    Se repiten los tipos del tutorial; las imágenes y los ataques se comparten.
+    """
+    templates = create_enemies_for_tutorial()
+    horde = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        enemy = Character(
+            f"{template.name} {i + 1}",
+            template.max_health,
+            template.max_health,
+            template.attacks,
+            CharacterType.ENEMY,
+        )
+        enemy.image = template.image
+        horde.append(enemy)
+    return horde
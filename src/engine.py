@@ -1,12 +1,38 @@
 import pygame
 import sys
 import random
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
 from src.characters import CharacterType
 from src.enemies import create_enemies_for_biome
 from src.scenarios import load_scenario
-from src.ui import draw_health_bar, draw_combat_ui, draw_characters, show_message
+from src.ui import (
+    draw_health_bar,
+    draw_combat_ui,
+    draw_characters,
+    show_message,
+    enemy_at,
+    ensure_enemy_visible,
+    grid_shape,
+    scroll_enemies,
+)
+from src.utils.log import get_logger
+from src.utils.pacing import frames, render_fps, wait_events
+from src.utils.profiler import profiler
+from src.utils.metrics import (
+    ACTIVE_SESSIONS,
+    ENEMY_TURN_SECONDS,
+    FRAME_SECONDS,
+    TURNS_RESOLVED,
+    UPDATE_SECONDS,
+    start_metrics_server,
+)
+
+log = get_logger(__name__)
+
+# Evento que despierta la espera del hilo principal cuando llega la decisión de la IA
+AI_DECISION_READY = pygame.event.custom_type()
 
 # Inicializar pygame
 pygame.init()
@@ -53,6 +79,8 @@ class GameEngine:
         # Inicializar variables importantes que faltan
         self.running = True
         self.clock = pygame.time.Clock()
+        # Límite de fps del render ("fps" de la configuración; 0 = sin límite)
+        self.fps = render_fps(self.config)
 
         # Inicializar cliente de IA
 
@@ -61,6 +89,8 @@ class GameEngine:
 
         # Inicializar cliente de IA
         self.ai_client = None
+        # Hilo de las decisiones remotas (se crea con la primera)
+        self.ai_executor = None
         try:
             from src.ai.chatgpt_client import ChatGPTClient
 
@@ -70,22 +100,47 @@ class GameEngine:
 
             # Crear cliente con parámetros correctos
             self.ai_client = ChatGPTClient(difficulty=difficulty, model_id=model_id)
-            print(
-                f"Cliente IA inicializado con modelo: {model_id} y dificultad: {difficulty}"
-            )
+            log.info("Cliente IA inicializado", model=model_id, difficulty=difficulty)
         except Exception as e:
-            print(f"Error inicializando cliente IA: {e}")
-            print("El juego funcionará sin asistencia de IA")
+            log.error(
+                "Error inicializando cliente IA; el juego funcionará sin asistencia de IA",
+                error=str(e),
+            )
+
+        # Exportador de métricas de Prometheus (0 = desactivado)
+        if self.config.get("metrics_port"):
+            start_metrics_server(self.config["metrics_port"])
+
+        # Controlador de la Curandera (reglas fijas o búsqueda)
+        from src.ai.ally_controller import create_ally_controller
+
+        self.ally_controller = create_ally_controller(
+            self.config.get("ally_controller", "rules")
+        )
 
         # Inicializar estado del juego
         from src.characters import GameState
 
         self.game_state = GameState()
 
+        # Salud de enemigos y jefe ajustada para la dificultad (src/sim/tuner.py),
+        # solo si se pide con "tuned_difficulty"
+        if self.config.get("tuned_difficulty"):
+            from src.sim.tuner import load_difficulty_multipliers
+
+            self.game_state.difficulty_multipliers = load_difficulty_multipliers(
+                self.config.get("difficulty", "Normal")
+            )
+
         # Cargar escenario inicial
         from src.scenarios import load_scenario
 
-        load_scenario(self.game_state, "tutorial")
+        # Con "horde_size" se empieza en una horda (pruebas de batallas grandes)
+        horde_size = self.config.get("horde_size", 0)
+        if horde_size:
+            load_scenario(self.game_state, "horda", count=horde_size)
+        else:
+            load_scenario(self.game_state, "tutorial")
 
     # def init_game(self, game_state):
     #     self.game_state = game_state
@@ -100,35 +155,57 @@ class GameEngine:
         if self.game_state.current_turn != CharacterType.PLAYER:
             waiting_for_input = False
 
+        # La pantalla de combate no cambia sola mientras se espera al jugador:
+        # se redibuja tras cada evento (o si alguien pidió un frame) y el resto
+        # del tiempo el proceso duerme en pygame.event.wait
+        dirty = waiting_for_input
         while waiting_for_input and not self.game_state.game_over:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    return False
-
-                if event.type == pygame.KEYDOWN:
-                    # Procesar teclas cuando es el turno del jugador
-                    action_taken = self.handle_player_input(event.key)
-                    if action_taken:
-                        waiting_for_input = (
-                            False  # Salir del bucle después de procesar una acción
-                        )
-
-                # Manejo de clics en los botones
-                if (
-                    event.type == pygame.MOUSEBUTTONDOWN and event.button == 1
-                ):  # Clic izquierdo
-                    mouse_pos = pygame.mouse.get_pos()
-
-                    # Verificar si se hizo clic en algún botón de ataque
-                    click_handled = self.handle_button_click(mouse_pos)
-                    if click_handled:
-                        waiting_for_input = False
-
-            # Pequeña pausa para no saturar la CPU
-            pygame.time.delay(30)
-
-            # Actualizar pantalla mientras esperamos entrada
+            if dirty or frames.due():
+                self.render()
+                dirty = False
+
+            events = wait_events(frames.timeout())
+            # Sin eventos venció la espera: toca un frame programado
+            dirty = not events
+            with profiler.scope("events"):
+                for event in events:
+                    # El movimiento del ratón no cambia nada en el combate
+                    if event.type != pygame.MOUSEMOTION:
+                        dirty = True
+
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                        return False
+
+                    # F3: superposición del perfilador de frames
+                    if profiler.handle_event(event):
+                        continue
+
+                    # Rueda del ratón: desplazar la rejilla de enemigos
+                    if event.type == pygame.MOUSEWHEEL:
+                        scroll_enemies(self.game_state, -event.y, self.screen.get_size())
+
+                    if event.type == pygame.KEYDOWN:
+                        # Procesar teclas cuando es el turno del jugador
+                        action_taken = self.handle_player_input(event.key)
+                        if action_taken:
+                            waiting_for_input = (
+                                False  # Salir del bucle después de procesar una acción
+                            )
+
+                    # Manejo de clics en los botones
+                    if (
+                        event.type == pygame.MOUSEBUTTONDOWN and event.button == 1
+                    ):  # Clic izquierdo
+                        mouse_pos = pygame.mouse.get_pos()
+
+                        # Verificar si se hizo clic en algún botón de ataque
+                        click_handled = self.handle_button_click(mouse_pos)
+                        if click_handled:
+                            waiting_for_input = False
+
+        # Mostrar el resultado de la acción antes del turno enemigo
+        if dirty:
             self.render()
 
         return True
@@ -139,11 +216,24 @@ class GameEngine:
         if self.game_state.current_turn != CharacterType.PLAYER:
             return False
 
+        # Desplazar la rejilla de enemigos en batallas grandes (no gasta turno)
+        if key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+            _, rows = grid_shape(self.screen.get_size())
+            scroll_enemies(
+                self.game_state,
+                -rows if key == pygame.K_PAGEUP else rows,
+                self.screen.get_size(),
+            )
+            return False
+
         # Cambiar objetivo (no gasta turno)
         if key == pygame.K_TAB and len(self.game_state.enemies) > 0:
             self.game_state.selected_enemy = (self.game_state.selected_enemy + 1) % len(
                 self.game_state.enemies
             )
+            ensure_enemy_visible(
+                self.game_state, self.game_state.selected_enemy, self.screen.get_size()
+            )
             return False  # No cuenta como acción, solo cambio de objetivo
 
         # Teclas numéricas para ataques (1-5)
@@ -221,12 +311,11 @@ class GameEngine:
             self.defend()
             return True
 
-        # Clics en enemigos para seleccionarlos
-        for i, enemy in enumerate(self.game_state.enemies):
-            enemy_rect = pygame.Rect(450, 150 + i * 120, 80, 80)
-            if enemy_rect.collidepoint(mouse_pos):
-                self.game_state.selected_enemy = i
-                return False  # No cuenta como acción, solo selección
+        # Clics en enemigos para seleccionarlos (misma disposición que al dibujar)
+        index = enemy_at(self.game_state, mouse_pos, self.screen.get_size())
+        if index is not None:
+            self.game_state.selected_enemy = index
+            return False  # No cuenta como acción, solo selección
 
         return False
 
@@ -270,9 +359,19 @@ class GameEngine:
         self.game_state.current_turn = CharacterType.ENEMY
         return True
 
+    @ENEMY_TURN_SECONDS.time()
     def handle_enemy_turn(self):
         """Maneja el turno de los enemigos"""
-        for enemy in self.game_state.enemies:
+        if self.game_state.is_large_battle():
+            self.handle_enemy_turn_batch()
+            return
+
+        from src.ai.targeting import plan_targets
+
+        # Matriz de prioridad de objetivos, calculada una vez por turno
+        target_plan = None
+
+        for index, enemy in enumerate(self.game_state.enemies):
             # Obtener acciones disponibles
             available_attacks = list(enemy.attacks.keys())
 
@@ -281,47 +380,30 @@ class GameEngine:
             if self.game_state.ally and self.game_state.ally.is_alive():
                 possible_targets.append(self.game_state.ally)
 
-            if self.ai_client and self.game_state.using_ai:
+            planner = getattr(self.ai_client, "planner", None)
+            if planner and self.game_state.using_ai:
+                # El planificador elige ataque y objetivo buscando sobre las reglas
+                best_attack, target = planner.plan(self.game_state, enemy)
+                self.game_state.add_message(
+                    f"{enemy.name} elige atacar a {target.name}", (30, 144, 255)
+                )
+
+            elif self.ai_client and self.game_state.using_ai:
                 # Preparar estado para IA
                 game_state_for_ai = self.game_state.get_game_state_for_ai()
 
                 # Obtener decisión de la IA (ataque)
-                best_attack = self.ai_client.get_decision(
+                best_attack = self.request_ai_decision(
                     game_state_for_ai, available_attacks
                 )
+                if not self.running:
+                    return
 
-                # Decidir objetivo usando IA avanzada
+                # Objetivo: el de mayor prioridad en la matriz del turno
                 if len(possible_targets) > 1:
-                    # Calcular factores estratégicos para ambos objetivos
-                    player_threat = (
-                        self.game_state.player.health
-                        / self.game_state.player.max_health
-                    )
-                    ally_threat = (
-                        self.game_state.ally.health / self.game_state.ally.max_health
-                    )
-
-                    # La IA prefiere atacar:
-                    # - Al objetivo con menos salud (más fácil eliminar)
-                    # - Si el aliado puede curar, tiene prioridad más alta
-                    # - Objetivos debilitados son preferidos
-
-                    ally_weight = ally_threat
-                    player_weight = player_threat
-
-                    # Si el aliado tiene habilidades de curación, aumenta su prioridad
-                    if any(
-                        "heal" in attack
-                        for attack in self.game_state.ally.attacks.values()
-                    ):
-                        ally_weight *= 0.7  # Prioriza eliminar al curandero
-
-                    # Elegir objetivo basado en la ponderación
-                    target = (
-                        self.game_state.ally
-                        if ally_weight < player_weight
-                        else self.game_state.player
-                    )
+                    if target_plan is None:
+                        target_plan = plan_targets(self.game_state)
+                    target = target_plan.target_for(index, self.game_state)
 
                     self.game_state.add_message(
                         f"{enemy.name} elige atacar a {target.name}", (30, 144, 255)
@@ -354,6 +436,109 @@ class GameEngine:
             # También ejecutar acciones del aliado si existe
             self.handle_ally_turn()
 
+    def request_ai_decision(self, game_state_for_ai, available_attacks):
+        """
+        Decisión de la IA de los enemigos
+
+        Una llamada remota puede tardar segundos: se hace en un hilo aparte y,
+        mientras tanto, el hilo principal sigue atendiendo la ventana (cerrar,
+        F3) y redibujando lo que se pida, sin sondeo. El modelo local responde
+        al momento y se consulta aquí mismo (así la demo grabada es repetible).
+        """
+        if getattr(self.ai_client, "is_local", True):
+            return self.ai_client.get_decision(game_state_for_ai, available_attacks)
+
+        if self.ai_executor is None:
+            self.ai_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enemy-ai")
+        future = self.ai_executor.submit(
+            self.ai_client.get_decision, game_state_for_ai, available_attacks
+        )
+        future.add_done_callback(
+            lambda _: pygame.event.post(pygame.event.Event(AI_DECISION_READY))
+        )
+
+        dirty = False
+        while not future.done():
+            if dirty or frames.due():
+                self.render()
+                dirty = False
+            events = wait_events(frames.timeout())
+            for event in events:
+                if event.type == pygame.QUIT:
+                    # La petición en curso termina sola (tiene su propio timeout)
+                    self.running = False
+                    return random.choice(available_attacks)
+                if profiler.handle_event(event):
+                    dirty = True
+        pygame.event.clear(AI_DECISION_READY)
+        return future.result()
+
+    def handle_enemy_turn_batch(self):
+        """
+        Turno enemigo de una batalla grande: una decisión de ataque por tipo de
+        enemigo, objetivos de la matriz de prioridad y todos los ataques seguidos,
+        sin animaciones ni pausas entre ellos
+        """
+        from src.abilities import execute_attack
+        from src.ai.targeting import plan_targets
+
+        game_state = self.game_state
+        player = game_state.player
+        ally = game_state.ally if game_state.ally and game_state.ally.is_alive() else None
+        player_health = player.health
+        ally_health = ally.health if ally else 0
+
+        use_ai = self.ai_client and game_state.using_ai
+        planner = getattr(self.ai_client, "planner", None) if use_ai else None
+        game_state_for_ai = None
+        target_plan = None
+        if use_ai and not planner:
+            game_state_for_ai = game_state.get_game_state_for_ai()
+            target_plan = plan_targets(game_state)
+
+        # Enemigos con los mismos ataques comparten decisión: (ataque, objetivo o None)
+        decisions = {}
+        attacks = 0
+        for index, enemy in enumerate(list(game_state.enemies)):
+            if use_ai:
+                kind = tuple(enemy.attacks)
+                if kind not in decisions:
+                    if planner:
+                        decisions[kind] = planner.plan(game_state, enemy)
+                    else:
+                        decisions[kind] = (
+                            self.request_ai_decision(game_state_for_ai, list(kind)),
+                            None,
+                        )
+                        if not self.running:
+                            return
+                best_attack, target = decisions[kind]
+                if target is None:
+                    target = target_plan.target_for(index, game_state)
+            else:
+                # IA simple: elegir ataque y objetivo aleatorio
+                best_attack = random.choice(list(enemy.attacks))
+                target = random.choice([player] + ([game_state.ally] if game_state.ally else []))
+
+            # El objetivo elegido puede haber caído durante el turno
+            if target is not player and not (game_state.ally is target and target.is_alive()):
+                target = player
+
+            execute_attack(game_state, enemy, target, best_attack, animate=False)
+            attacks += 1
+            if game_state.game_over:
+                break
+
+        summary = f"La horda ataca {attacks} veces: -{player_health - player.health} HP a {player.name}"
+        if ally:
+            summary += f", -{ally_health - ally.health} HP a {ally.name}"
+        game_state.add_message(summary, COLORS["RED"])
+        self.render()
+
+        if not game_state.game_over and len(game_state.enemies) > 0:
+            game_state.current_turn = CharacterType.PLAYER
+            self.handle_ally_turn()
+
     def handle_ally_turn(self):
         """Maneja las acciones del aliado si está presente"""
         if not self.game_state.ally or not self.game_state.ally.is_alive():
@@ -362,7 +547,7 @@ class GameEngine:
         # Usar sistema de IA para el aliado
         from src.abilities import perform_ally_action
 
-        perform_ally_action(self.game_state)
+        perform_ally_action(self.game_state, self.ally_controller)
 
         # Actualizar pantalla después de la acción del aliado
         self.render()
@@ -408,6 +593,7 @@ class GameEngine:
                         f"{character.name} ya no sufre de {effect}", COLORS["WHITE"]
                     )
 
+    @UPDATE_SECONDS.time()
     def update(self):
         # Actualizar efectos de estado al inicio de cada turno
         if self.game_state.current_turn == CharacterType.PLAYER:
@@ -417,6 +603,7 @@ class GameEngine:
         if not self.game_state.game_over:
             if self.game_state.current_turn == CharacterType.ENEMY:
                 self.handle_enemy_turn()
+                TURNS_RESOLVED.inc(1, "engine")
 
         # Verificar condiciones de victoria/derrota
         self.check_game_state()
@@ -430,21 +617,24 @@ class GameEngine:
         elif len(self.game_state.enemies) == 0:
             advance_to_next_biome(self.game_state, self.screen)
 
+    @FRAME_SECONDS.time()
     def render(self):
         # Limpiar pantalla
         self.screen.fill(COLORS["BLACK"])  # Fondo negro
 
         # Dibujar personajes
-        draw_characters(self.screen, self.game_state)
+        with profiler.scope("characters"):
+            draw_characters(self.screen, self.game_state)
 
         # Dibujar UI
-        draw_combat_ui(self.screen, self.game_state, COLORS)
+        with profiler.scope("combat_ui"):
+            draw_combat_ui(self.screen, self.game_state, COLORS)
 
         # Mostrar pantalla de game over/victoria
         if self.game_state.game_over:
             self.show_game_over_screen()
 
-        pygame.display.flip()
+        profiler.present()
 
     def show_game_over_screen(self):
         overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
@@ -469,23 +659,30 @@ class GameEngine:
             )
 
     def run(self):
-        while self.running and not self.game_state.game_over:
-            # El handle_events ahora maneja la espera de entrada del jugador
-            if not self.handle_events():
-                break
+        ACTIVE_SESSIONS.inc()
+        try:
+            while self.running and not self.game_state.game_over:
+                # El handle_events ahora maneja la espera de entrada del jugador
+                if not self.handle_events():
+                    break
 
-            # El update ahora solo se ejecuta cuando no es el turno del jugador
-            self.update()
+                # El update ahora solo se ejecuta cuando no es el turno del jugador
+                with profiler.scope("update"):
+                    self.update()
 
-            # Render se llama continuamente para mantener la pantalla actualizada
-            self.render()
+                # Render se llama continuamente para mantener la pantalla actualizada
+                self.render()
 
-            self.clock.tick(30)
+                profiler.tick(self.clock, self.fps)
+        finally:
+            ACTIVE_SESSIONS.dec()
+            if self.ai_executor is not None:
+                self.ai_executor.shutdown(wait=False)
 
         # Mostrar pantalla final si es game over
         if self.game_state.game_over:
             self.show_game_over_screen()
+            profiler.present()
             pygame.time.wait(3000)
 
-        pygame.quit()
         return self.game_state.victory
@@ -6,13 +6,19 @@ import math
 import random
 import threading
 from src.ui import COLORS, font_large, font_medium, font_small
+from src.utils.log import get_logger
+from src.utils.pacing import FixedTimestep, render_fps
+from src.utils.profiler import profiler
+
+log = get_logger(__name__)
 
 # Intentar importar los modelos, con fallback si no están disponibles
 try:
     from src.ai.list_models import MODEL_NAMES, get_model_index, get_model_id
     from src.ai.chatgpt_client import ChatGPTClient
+    from src.ai.telemetry import telemetry
 except ImportError:
-    print("Módulos de IA no encontrados. Usando valores por defecto.")
+    log.warning("Módulos de IA no encontrados. Usando valores por defecto")
     MODEL_NAMES = ["GPT-3.5", "GPT-4", "Local"]
 
     def get_model_index(model_id):
@@ -36,7 +42,16 @@ _CONFIG = {
     "music": True,
     "sound_effects": True,
     "ai_model": "gpt-3.5-turbo",
+    "ally_controller": "rules",
+    "metrics_port": 0,
+    "profiler": False,
+    "fps": 60,
+    "vsync": False,
+    "tuned_difficulty": False,
 }
+# Con la configuración en memoria (grabación y reproducción de partidas) no se
+# lee ni se escribe config/game_config.json
+_MEMORY_ONLY = False
 
 
 # Generador de consejos y frases épicas por IA
@@ -63,8 +78,9 @@ class WisdomGenerator:
             self.client = ChatGPTClient(model_id=self.model_id)
             self.initialized = True
         except Exception as e:
-            print(
-                f"No se pudo inicializar el cliente de IA para el generador de frases: {e}"
+            log.warning(
+                "No se pudo inicializar el cliente de IA para el generador de frases",
+                error=str(e),
             )
 
     def get_random_phrase(self):
@@ -77,29 +93,33 @@ class WisdomGenerator:
             self.current_phrase = self.get_random_phrase()
             return self.current_phrase
 
-        try:
-            prompts = [
-                "Genera un consejo corto y útil para un jugador de RPG táctico con combate por turnos.",
-                "Crea una frase épica y motivadora para un héroe que se embarca en una aventura.",
-                "Ofrece una perla de sabiduría sobre estrategia de combate en un juego RPG.",
-                "Comparte un secreto que todo aventurero debería conocer en una frase corta.",
-                "Da un consejo místico sobre el poder de la magia y la estrategia en batalla.",
-            ]
-
-            response = self.client.get_completion(random.choice(prompts))
-
-            if response and len(response) > 10:
-                # Truncar si es demasiado largo
-                if len(response) > 120:
-                    response = response[:120] + "..."
-                self.current_phrase = response
-                # Añadir a la colección para futuras referencias
-                self.phrases.append(response)
-            else:
+        with telemetry.track("WisdomGenerator") as call:
+            try:
+                prompts = [
+                    "Genera un consejo corto y útil para un jugador de RPG táctico con combate por turnos.",
+                    "Crea una frase épica y motivadora para un héroe que se embarca en una aventura.",
+                    "Ofrece una perla de sabiduría sobre estrategia de combate en un juego RPG.",
+                    "Comparte un secreto que todo aventurero debería conocer en una frase corta.",
+                    "Da un consejo místico sobre el poder de la magia y la estrategia en batalla.",
+                ]
+
+                response = self.client.get_completion(random.choice(prompts))
+
+                if response and len(response) > 10:
+                    # Truncar si es demasiado largo
+                    if len(response) > 120:
+                        response = response[:120] + "..."
+                    self.current_phrase = response
+                    # Añadir a la colección para futuras referencias
+                    self.phrases.append(response)
+                else:
+                    call.fallback()
+                    self.current_phrase = self.get_random_phrase()
+            except Exception as e:
+                call.fail(e)
+                call.fallback()
+                log.warning("Error generando frase", error=str(e))
                 self.current_phrase = self.get_random_phrase()
-        except Exception as e:
-            print(f"Error generando frase: {e}")
-            self.current_phrase = self.get_random_phrase()
 
         return self.current_phrase
 
@@ -240,7 +260,7 @@ class MainMenu:
                     self.background, (self.width, self.height)
                 )
         except Exception as e:
-            print(f"Error cargando imagen de fondo: {e}")
+            log.warning("Error cargando imagen de fondo", error=str(e))
 
         # Generador de frases sabias
         config = get_config()
@@ -271,7 +291,7 @@ class MainMenu:
                         img = pygame.image.load(os.path.join(deco_path, file))
                         self.decoration_images.append(img)
         except Exception as e:
-            print(f"No se pudieron cargar decoraciones: {e}")
+            log.warning("No se pudieron cargar decoraciones", error=str(e))
 
     def reset(self):
         """Reinicia elementos del menú para una nueva sesión"""
@@ -430,7 +450,7 @@ class MainMenu:
         self.screen.blit(version_text, (self.width - version_text.get_width() - 15, 15))
 
         # Actualizar pantalla
-        pygame.display.flip()
+        profiler.present()
 
     def _update_wisdom_display(self):
         """Actualiza y muestra el mensaje de sabiduría"""
@@ -447,17 +467,6 @@ class MainMenu:
         #     self.wisdom_opacity = 0
         #     self.wisdom_visible = True
 
-        # Fade in/out (mantener esta parte)
-        if self.wisdom_visible and self.wisdom_opacity < 255:
-            self.wisdom_opacity = min(255, self.wisdom_opacity + 5)
-        elif not self.wisdom_visible and self.wisdom_opacity > 0:
-            self.wisdom_opacity = max(0, self.wisdom_opacity - 5)
-
-        # MODIFICADO: No cambiar la frase, solo la visibilidad
-        if not self.wisdom_visible and self.wisdom_opacity == 0:
-            self.wisdom_visible = True
-            # self.current_wisdom = self.wisdom.generate_new_phrase()
-
         if self.show_wisdom and self.wisdom_opacity > 0:
             # Determinar tamaño y posición
             max_width = self.width - 80
@@ -521,12 +530,28 @@ class MainMenu:
             # Mostrar en pantalla
             self.screen.blit(wisdom_surf, wisdom_box)
 
+    def update(self):
+        """Un paso de simulación: fundido de la frase sabia"""
+        # Fade in/out (mantener esta parte)
+        if self.wisdom_visible and self.wisdom_opacity < 255:
+            self.wisdom_opacity = min(255, self.wisdom_opacity + 5)
+        elif not self.wisdom_visible and self.wisdom_opacity > 0:
+            self.wisdom_opacity = max(0, self.wisdom_opacity - 5)
+
+        # MODIFICADO: No cambiar la frase, solo la visibilidad
+        if not self.wisdom_visible and self.wisdom_opacity == 0:
+            self.wisdom_visible = True
+            # self.current_wisdom = self.wisdom.generate_new_phrase()
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
                 return "QUIT"
 
+            if profiler.handle_event(event):
+                continue
+
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
                     self.selected = (self.selected - 1) % len(self.options)
@@ -560,11 +585,14 @@ class MainMenu:
         # Generar nueva frase al iniciar
         self.reset()
 
+        # Animaciones a paso fijo; el render al ritmo configurado
+        loop = FixedTimestep(fps=render_fps(get_config()), clock=self.clock)
         while self.running:
-            self.clock.tick(60)  # 60 FPS
+            steps = loop.advance()
 
             # Manejar eventos
-            result = self.handle_events()
+            with profiler.scope("events"):
+                result = self.handle_events()
             if result == "QUIT":
                 return "QUIT"
             elif result == "Jugar":
@@ -578,8 +606,13 @@ class MainMenu:
             elif result == "MENU":  # Manejar retorno desde submenús
                 return "MENU"
 
+            with profiler.scope("update"):
+                for _ in range(steps):
+                    self.update()
+
             # Dibujar el menú
-            self.draw()
+            with profiler.scope("draw"):
+                self.draw()
 
         return "QUIT"
 
@@ -608,6 +641,8 @@ class OptionsMenu:
         # Obtener índice del modelo actual
         model_idx = get_model_index(config["ai_model"])
 
+        ally_idx = 1 if config.get("ally_controller") == "lookahead" else 0
+
         # Opciones
         self.options = [
             {
@@ -634,6 +669,12 @@ class OptionsMenu:
                 "selected": model_idx,
                 "description": "Selecciona el modelo de IA que controla a los enemigos y genera contenido",
             },
+            {
+                "name": "Curandera",
+                "values": ["Reglas", "Previsión"],
+                "selected": ally_idx,
+                "description": "Reglas fijas o búsqueda de varios turnos para decidir las acciones de la Curandera",
+            },
             {
                 "name": "Volver",
                 "values": None,
@@ -735,33 +776,6 @@ class OptionsMenu:
                 )
                 self.screen.blit(highlight_surf, highlight_rect)
 
-                # Actualizar descripción objetivo con suavizado
-                self.target_description = option["description"]
-                if self.description_timer < 10:
-                    self.description_timer += 1
-
-                # Transición de descripción
-                if self.current_description != self.target_description:
-                    if self.description_timer >= 10:  # Después de un breve retraso
-                        chars_to_copy = max(1, len(self.target_description) // 10)
-                        current_len = len(self.current_description)
-                        target_len = len(self.target_description)
-
-                        if current_len < target_len:
-                            # Añadir caracteres
-                            self.current_description = self.target_description[
-                                : current_len + chars_to_copy
-                            ]
-                        else:
-                            # Eliminar caracteres
-                            self.current_description = self.current_description[
-                                : current_len - chars_to_copy
-                            ]
-                            if len(self.current_description) <= 0:
-                                self.current_description = self.target_description[
-                                    :chars_to_copy
-                                ]
-
             # Color según selección
             color = COLORS["GOLD"] if i == self.selected_option else COLORS["WHITE"]
 
@@ -868,7 +882,7 @@ class OptionsMenu:
             (self.width // 2 - instructions.get_width() // 2, self.height - 70),
         )
 
-        pygame.display.flip()
+        profiler.present()
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -877,6 +891,9 @@ class OptionsMenu:
                 self.running = False
                 return "QUIT"
 
+            if profiler.handle_event(event):
+                continue
+
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     save_options(self)
@@ -916,13 +933,49 @@ class OptionsMenu:
 
         return None
 
+    def update(self):
+        """Un paso de simulación: escritura animada de la descripción"""
+        # Actualizar descripción objetivo con suavizado
+        self.target_description = self.options[self.selected_option]["description"]
+        if self.description_timer < 10:
+            self.description_timer += 1
+
+        # Transición de descripción
+        if self.current_description != self.target_description:
+            if self.description_timer >= 10:  # Después de un breve retraso
+                chars_to_copy = max(1, len(self.target_description) // 10)
+                current_len = len(self.current_description)
+                target_len = len(self.target_description)
+
+                if current_len < target_len:
+                    # Añadir caracteres
+                    self.current_description = self.target_description[
+                        : current_len + chars_to_copy
+                    ]
+                else:
+                    # Eliminar caracteres
+                    self.current_description = self.current_description[
+                        : current_len - chars_to_copy
+                    ]
+                    if len(self.current_description) <= 0:
+                        self.current_description = self.target_description[
+                            :chars_to_copy
+                        ]
+
     def run(self):
+        # Animaciones a paso fijo; el render al ritmo configurado
+        loop = FixedTimestep(fps=render_fps(get_config()), clock=self.clock)
         while self.running:
-            self.clock.tick(60)
-            result = self.handle_events()
+            steps = loop.advance()
+            with profiler.scope("events"):
+                result = self.handle_events()
             if result:
                 return result
-            self.draw()
+            with profiler.scope("update"):
+                for _ in range(steps):
+                    self.update()
+            with profiler.scope("draw"):
+                self.draw()
 
         save_options(self)
         return "MENU"
@@ -938,6 +991,7 @@ def save_options(options_menu):
         "Música": "music",
         "Efectos": "sound_effects",
         "Modelo IA": "ai_model",
+        "Curandera": "ally_controller",
     }
 
     value_mapping = {
@@ -946,6 +1000,8 @@ def save_options(options_menu):
         "Difícil": "Hard",
         "On": True,
         "Off": False,
+        "Reglas": "rules",
+        "Previsión": "lookahead",
     }
 
     # Guardar opciones
@@ -960,7 +1016,9 @@ def save_options(options_menu):
             else:
                 _CONFIG[config_key] = value_mapping.get(selected_value, selected_value)
 
-    print(f"Configuración guardada: {_CONFIG}")
+    log.info("Configuración guardada", config=_CONFIG)
+    if _MEMORY_ONLY:
+        return
 
     # Guardar en archivo
     try:
@@ -973,7 +1031,7 @@ def save_options(options_menu):
         with open(config_path, "w") as f:
             json.dump(_CONFIG, f, indent=4)
     except Exception as e:
-        print(f"Error guardando configuración: {e}")
+        log.error("Error guardando configuración", error=str(e))
 
 
 def get_config():
@@ -986,11 +1044,18 @@ def get_config():
     )
 
     try:
-        if os.path.exists(config_path):
+        if not _MEMORY_ONLY and os.path.exists(config_path):
             with open(config_path, "r") as f:
                 loaded_config = json.load(f)
                 _CONFIG.update(loaded_config)
     except Exception as e:
-        print(f"Error cargando configuración: {e}")
+        log.error("Error cargando configuración", error=str(e))
 
     return _CONFIG.copy()
+
+
+def use_memory_config(config):
+    """Fija la configuración en memoria: a partir de aquí no se lee ni guarda el archivo"""
+    global _MEMORY_ONLY
+    _CONFIG.update(config)
+    _MEMORY_ONLY = True
@@ -1,23 +1,52 @@
 from src.ui import COLORS
-from src.enemies import create_enemies_for_tutorial, create_boss
+from src.enemies import create_enemies_for_tutorial, create_boss, scale_health
+from src.utils.log import get_logger
 
+log = get_logger(__name__)
 
-def load_scenario(game_state, biome_name):
-    """Carga un escenario específico en el estado del juego"""
+# Enemigos del escenario "horda" si no se indica otro número
+HORDE_SIZE = 500
+
+
+def load_scenario(game_state, biome_name, count=None):
+    """
+    Carga un escenario específico en el estado del juego
+
+    `count` es el número de enemigos del escenario "horda" (500 por defecto) y
+    solo vale para ese escenario. La salud de los enemigos y del jefe se ajusta
+    con game_state.difficulty_multipliers.
+    """
+    if count is not None and biome_name != "horda":
+        raise ValueError(f"count solo se aplica al escenario 'horda', no a '{biome_name}'")
+    multipliers = game_state.difficulty_multipliers
     if biome_name == "tutorial":
         # Cargar enemigos del tutorial
         from src.enemies import create_enemies_for_tutorial
 
-        game_state.enemies = create_enemies_for_tutorial()
+        game_state.enemies = scale_health(
+            create_enemies_for_tutorial(), multipliers.get("enemy_hp", 1.0)
+        )
         game_state.selected_enemy = 0
         game_state.add_message(
             "¡Bienvenido al juego! Enfrenta a tus enemigos.", COLORS["GOLD"]
         )
+    elif biome_name == "horda":
+        # Batalla grande: cientos de enemigos en rejilla
+        from src.enemies import create_horde
+
+        if count is None:
+            count = HORDE_SIZE
+        game_state.enemies = scale_health(create_horde(count), multipliers.get("enemy_hp", 1.0))
+        game_state.selected_enemy = 0
+        game_state.enemy_scroll = 0
+        game_state.add_message(f"¡Una horda de {count} enemigos!", COLORS["RED"])
     elif biome_name == "boss":
         # Cargar jefe final
         from src.enemies import create_boss
 
-        game_state.enemies = [create_boss(game_state.player)]
+        game_state.enemies = [
+            create_boss(game_state.player, multipliers.get("boss_hp", 1.0))
+        ]
         game_state.selected_enemy = 0
         game_state.add_message("¡Te enfrentas al jefe final!", COLORS["RED"])
 
@@ -26,7 +55,7 @@ def load_scenario(game_state, biome_name):
             boss_phrase = generate_boss_phrase(game_state)
             game_state.add_message(f"Jefe: {boss_phrase}", COLORS["RED"])
         except Exception as e:
-            print(f"Error generando frase del jefe: {e}")
+            log.warning("Error generando frase del jefe", error=str(e))
             game_state.add_message("Jefe: ¡No escaparás con vida!", COLORS["RED"])
 
     # Asignar referencia al estado del juego a todos los personajes
@@ -61,6 +90,8 @@ def show_boss_intro(screen, game_state):
     """Muestra una pantalla de introducción para el jefe"""
     import pygame
     from src.ui import font_large, font_medium
+    from src.utils.pacing import wait_for_key
+    from src.utils.profiler import profiler
 
     # Fondo negro
     screen.fill((0, 0, 0))
@@ -98,18 +129,12 @@ def show_boss_intro(screen, game_state):
         ),
     )
 
-    pygame.display.flip()
+    profiler.present()
 
-    # Esperar entrada del usuario
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                waiting = False
-        pygame.time.delay(10)
+    # Esperar entrada del usuario (bloqueado en pygame.event.wait, sin sondeo)
+    if not wait_for_key():
+        pygame.quit()
+        exit()
 
 
 def generate_boss_phrase(game_state):
@@ -158,5 +183,5 @@ def generate_boss_phrase(game_state):
         return "¡He destruido a guerreros más fuertes que ustedes!"
 
     except Exception as e:
-        print(f"Error generando frase con IA: {e}")
+        log.warning("Error generando frase con IA", error=str(e))
         return "¡Sus esfuerzos son inútiles contra mi poder!"
@@ -0,0 +1,208 @@
+"""
+Servidor de combates con asyncio: muchas partidas independientes en un proceso.
+
+Protocolo JSON lines sobre TCP local (o un socket Unix con --unix): cada línea
+es una petición y cada respuesta lleva el mismo "id". Las peticiones de una
+conexión se atienden en paralelo (una conexión puede llevar miles de
+sesiones), pero las acciones de una misma sesión se aplican en orden.
+
+    {"id": 1, "op": "new_game", "difficulty": "Normal", "seed": 7}
+    {"id": 2, "op": "action", "session": 1, "action": "attack", "slot": 3}
+    {"id": 3, "op": "action", "session": 1, "action": "tab"}
+    {"id": 4, "op": "state", "session": 1}
+    {"id": 5, "op": "close", "session": 1}
+    {"id": 6, "op": "stats"}
+
+Respuestas: {"id": ..., "ok": true, "state": {...}, "events": [...]} o
+{"id": ..., "ok": false, "error": "..."}.
+
+Con --ai policy (por defecto) los enemigos usan las políticas simuladas de cada
+dificultad; con --ai llm usan ChatGPTClient en un grupo de hilos y la espera de
+la respuesta no bloquea al resto de sesiones.
+
+Uso:
+    python -m src.server.battle_server --port 8766
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.server.session import BattleSession, LLMEnemyAI, PolicyEnemyAI
+from src.utils.log import configure_logging, get_logger
+from src.utils.metrics import ACTIVE_SESSIONS, TURNS_RESOLVED, start_metrics_server
+
+log = get_logger(__name__)
+
+
+class BattleServer:
+    """
+    Sesiones de combate y despacho de peticiones
+
+    Args:
+        enemy_ai: PolicyEnemyAI o LLMEnemyAI
+        max_sessions: Máximo de partidas abiertas a la vez
+        tuned_difficulty: Aplicar la salud de config/difficulty_tuning.json
+    """
+
+    def __init__(self, enemy_ai=None, max_sessions=100000, tuned_difficulty=False):
+        from src.ai.ally_controller import RuleAllyController
+
+        self.enemy_ai = enemy_ai or PolicyEnemyAI()
+        self.max_sessions = max_sessions
+        self.tuned_difficulty = tuned_difficulty
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        # Las reglas fijas no guardan estado: un controlador para todas las sesiones
+        self.ally_controller = RuleAllyController()
+        self.started = time.time()
+        self.stats = {"requests": 0, "errors": 0, "turns": 0, "games": 0, "connections": 0}
+
+    def new_game(self, request):
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError("Demasiadas partidas abiertas")
+        session = BattleSession(
+            next(self.ids),
+            request.get("difficulty", "Normal"),
+            request.get("seed"),
+            self.ally_controller,
+            self.tuned_difficulty,
+        )
+        self.sessions[session.id] = session
+        self.stats["games"] += 1
+        ACTIVE_SESSIONS.inc()
+        return {"state": session.view()}
+
+    def session(self, request):
+        session = self.sessions.get(request.get("session"))
+        if session is None:
+            raise ValueError(f"Sesión desconocida: {request.get('session')}")
+        return session
+
+    async def action(self, request):
+        session = self.session(request)
+        async with session.lock:
+            events = await session.play(request, self.enemy_ai)
+        if events:
+            self.stats["turns"] += 1
+            TURNS_RESOLVED.inc(1, "server")
+        return {"state": session.view(), "events": events}
+
+    async def dispatch(self, request):
+        """Atiende una petición y devuelve el cuerpo de la respuesta"""
+        op = request.get("op")
+        if op == "action":
+            return await self.action(request)
+        if op == "new_game":
+            return self.new_game(request)
+        if op == "state":
+            return {"state": self.session(request).view()}
+        if op == "close":
+            self.sessions.pop(self.session(request).id)
+            ACTIVE_SESSIONS.dec()
+            return {}
+        if op == "stats":
+            return {
+                "stats": dict(
+                    self.stats,
+                    sessions=len(self.sessions),
+                    uptime=time.time() - self.started,
+                )
+            }
+        raise ValueError(f"Operación desconocida: {op}")
+
+    async def respond(self, request, writer):
+        self.stats["requests"] += 1
+        try:
+            response = dict(await self.dispatch(request), ok=True)
+        except (ValueError, KeyError, TypeError) as e:
+            self.stats["errors"] += 1
+            response = {"ok": False, "error": str(e)}
+        response["id"] = request.get("id")
+        writer.write((json.dumps(response) + "\n").encode())
+        await writer.drain()
+
+    async def handle_client(self, reader, writer):
+        """Lee peticiones de una conexión y atiende cada una en su propia tarea"""
+        self.stats["connections"] += 1
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("La petición debe ser un objeto JSON")
+                except ValueError as e:
+                    self.stats["errors"] += 1
+                    writer.write((json.dumps({"ok": False, "error": str(e)}) + "\n").encode())
+                    continue
+                task = asyncio.create_task(self.respond(request, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server, host="127.0.0.1", port=8766, unix=None):
+    if unix:
+        listener = await asyncio.start_unix_server(server.handle_client, path=unix)
+        log.info(f"Servidor de combates en {unix}")
+    else:
+        listener = await asyncio.start_server(server.handle_client, host, port)
+        log.info(f"Servidor de combates en {host}:{port}")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de combates multi-sesión")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--unix", help="Ruta de un socket Unix en lugar de TCP")
+    parser.add_argument("--ai", choices=("policy", "llm"), default="policy")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Modelo con --ai llm")
+    parser.add_argument(
+        "--llm-threads", type=int, default=32, help="Llamadas a la IA en paralelo con --ai llm"
+    )
+    parser.add_argument("--max-sessions", type=int, default=100000)
+    parser.add_argument(
+        "--tuned-difficulty",
+        action="store_true",
+        help="Aplicar la salud ajustada de config/difficulty_tuning.json",
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=0, help="Servir métricas de Prometheus (0 = no)"
+    )
+    parser.add_argument("--log-level", default="INFO", help="DEBUG, INFO, WARNING, ERROR u OFF")
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    # Sin ventana ni audio: el servidor no dibuja nada
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    enemy_ai = PolicyEnemyAI()
+    if args.ai == "llm":
+        enemy_ai = LLMEnemyAI(args.model, ThreadPoolExecutor(args.llm_threads))
+    server = BattleServer(enemy_ai, args.max_sessions, args.tuned_difficulty)
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        log.info("Servidor detenido", **server.stats)
+
+
+if __name__ == "__main__":
+    main()
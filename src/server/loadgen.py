@@ -0,0 +1,278 @@
+"""
+Generador de carga para el servidor de combates (src/server/battle_server.py).
+
+Lanza N jugadores simulados a la vez, cada uno jugando partidas seguidas con las
+mismas acciones que GameEngine.handle_player_input (ataques 1-5, poción,
+defensa y TAB para cambiar de objetivo). Al terminar informa de las acciones
+por segundo, la latencia de los turnos (p50/p95/p99) y la tasa de errores.
+
+Políticas de los jugadores:
+    random    acción al azar
+    greedy    poción por debajo del 35%, TAB hasta el enemigo más débil y el
+              ataque de más daño medio
+    scripted  repite la secuencia de --script (por ejemplo "3,4,tab,p,d")
+
+Uso:
+    python -m src.server.loadgen --players 1000 --duration 30 --policy greedy
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from src.utils.stats import summarize_latencies
+
+KEYS = {"p": {"action": "potion"}, "d": {"action": "defend"}, "tab": {"action": "tab"}}
+
+
+def parse_key(key):
+    """Tecla del guion ("1".."5", "p", "d", "tab") -> acción del protocolo"""
+    key = key.strip().lower()
+    if key.isdigit():
+        return {"action": "attack", "slot": int(key)}
+    if key not in KEYS:
+        raise ValueError(f"Tecla desconocida en el guion: {key}")
+    return KEYS[key]
+
+
+def random_policy(view, rng, step):
+    options = [{"action": "attack", "slot": i} for i in range(1, len(view["attacks"]) + 1)]
+    options.append({"action": "defend"})
+    options.append({"action": "tab"})
+    if view["potions"] > 0:
+        options.append({"action": "potion"})
+    return rng.choice(options)
+
+
+def greedy_policy(view, rng, step):
+    player = view["player"]
+    if player["health"] / player["max_health"] < 0.35 and view["potions"] > 0:
+        return {"action": "potion"}
+    enemies = view["enemies"]
+    weakest = min(range(len(enemies)), key=lambda i: enemies[i]["health"])
+    if view["selected"] != weakest:
+        return {"action": "tab"}
+    slot = max(
+        range(len(view["attack_dice"])),
+        key=lambda i: view["attack_dice"][i][0] * (view["attack_dice"][i][1] + 1),
+    )
+    return {"action": "attack", "slot": slot + 1}
+
+
+def scripted_policy(script):
+    actions = [parse_key(key) for key in script.split(",")]
+
+    def policy(view, rng, step):
+        return actions[step % len(actions)]
+
+    return policy
+
+
+class Connection:
+    """Conexión con el servidor que admite muchas peticiones en vuelo"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count(1)
+        self.waiting = {}
+        self.listener = asyncio.create_task(self._listen())
+
+    @classmethod
+    async def open(cls, host, port, unix=None):
+        if unix:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self.waiting.pop(response.get("id"), None)
+                if future and not future.done():
+                    future.set_result(response)
+        finally:
+            error = ConnectionError("Conexión cerrada por el servidor")
+            for future in self.waiting.values():
+                if not future.done():
+                    future.set_exception(error)
+            self.waiting.clear()
+
+    async def request(self, timeout=10.0, **body):
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request_id] = future
+        self.writer.write((json.dumps(dict(body, id=request_id)) + "\n").encode())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.waiting.pop(request_id, None)
+
+    async def close(self):
+        self.listener.cancel()
+        self.writer.close()
+
+
+class LoadStats:
+    """Contadores y latencias de toda la prueba"""
+
+    def __init__(self):
+        self.turn_ms = []
+        self.other_ms = []
+        self.actions = 0
+        self.turns = 0
+        self.games = 0
+        self.victories = 0
+        self.rejected = 0
+        self.failures = 0
+
+    def report(self, elapsed):
+        requests = self.actions + self.games
+        return {
+            "elapsed_s": elapsed,
+            "actions": self.actions,
+            "actions_per_s": self.actions / elapsed if elapsed else 0.0,
+            "turns": self.turns,
+            "games": self.games,
+            "win_rate": self.victories / self.games if self.games else 0.0,
+            "turn_ms": summarize_latencies(self.turn_ms),
+            "other_ms": summarize_latencies(self.other_ms),
+            "rejected_rate": self.rejected / requests if requests else 0.0,
+            "failure_rate": self.failures / requests if requests else 0.0,
+        }
+
+
+async def run_player(connection, policy, stats, rng, deadline, args):
+    """Un jugador: partidas seguidas hasta el final de la prueba"""
+    while time.perf_counter() < deadline:
+        try:
+            response = await connection.request(
+                op="new_game", difficulty=args.difficulty, seed=rng.randrange(2**31)
+            )
+        except (asyncio.TimeoutError, ConnectionError):
+            stats.failures += 1
+            return
+        if not response["ok"]:
+            stats.rejected += 1
+            await asyncio.sleep(0.1)
+            continue
+        view = response["state"]
+        step = 0
+        while not view["over"] and time.perf_counter() < deadline:
+            action = policy(view, rng, step)
+            step += 1
+            start = time.perf_counter()
+            try:
+                response = await connection.request(op="action", session=view["session"], **action)
+            except asyncio.TimeoutError:
+                stats.failures += 1
+                continue
+            except ConnectionError:
+                stats.failures += 1
+                return
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stats.actions += 1
+            if not response["ok"]:
+                stats.rejected += 1
+                continue
+            if response["events"]:
+                stats.turns += 1
+                stats.turn_ms.append(elapsed_ms)
+            else:
+                stats.other_ms.append(elapsed_ms)
+            view = response["state"]
+            if args.think_ms:
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_ms) / 1000)
+        if view["over"]:
+            stats.games += 1
+            stats.victories += view["victory"]
+        try:
+            await connection.request(op="close", session=view["session"])
+        except (asyncio.TimeoutError, ConnectionError):
+            stats.failures += 1
+
+
+async def run(args):
+    if args.policy == "scripted":
+        policy = scripted_policy(args.script)
+    else:
+        policy = {"random": random_policy, "greedy": greedy_policy}[args.policy]
+
+    connections = [
+        await Connection.open(args.host, args.port, args.unix) for _ in range(args.connections)
+    ]
+    stats = LoadStats()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(
+        *(
+            run_player(
+                connections[i % len(connections)],
+                policy,
+                stats,
+                random.Random(args.seed * 1_000_003 + i),
+                deadline,
+                args,
+            )
+            for i in range(args.players)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    server_stats = (await connections[0].request(op="stats")).get("stats")
+    for connection in connections:
+        await connection.close()
+    return stats.report(elapsed), server_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de carga del servidor de combates")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--unix", help="Ruta del socket Unix del servidor")
+    parser.add_argument("--players", type=int, default=100, help="Jugadores simultáneos")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos de prueba")
+    parser.add_argument("--policy", choices=("random", "greedy", "scripted"), default="greedy")
+    parser.add_argument("--script", default="3,4,tab,3,p,d", help="Teclas de la política scripted")
+    parser.add_argument("--difficulty", default="Normal")
+    parser.add_argument(
+        "--think-ms", type=float, default=0.0, help="Pausa media entre acciones de cada jugador"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="Guardar resultados en JSON")
+    args = parser.parse_args()
+    if args.policy == "scripted":
+        # Errores en el guion antes de conectar
+        [parse_key(key) for key in args.script.split(",")]
+
+    results, server_stats = asyncio.run(run(args))
+    turn = results["turn_ms"]
+    print(
+        f"{args.players} jugadores ({args.policy}), {results['elapsed_s']:.1f} s: "
+        f"{results['actions_per_s']:.0f} acciones/s, {results['games']} partidas "
+        f"({results['win_rate']:.1%} victorias)"
+    )
+    print(
+        f"turno: p50 {turn['p50']:.2f} ms  p95 {turn['p95']:.2f} ms  "
+        f"p99 {turn['p99']:.2f} ms  máx {turn['max']:.2f} ms"
+    )
+    print(
+        f"rechazadas {results['rejected_rate']:.2%}  fallos {results['failure_rate']:.2%}"
+    )
+    print(f"servidor: {server_stats}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results, "server": server_stats}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
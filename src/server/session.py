@@ -0,0 +1,303 @@
+"""
+Partidas independientes sin pygame para el servidor de combates.
+
+Cada BattleSession es una campaña (enemigos del tutorial y después el jefe
+final) sobre las reglas de src/sim/rules.py, con su propio generador aleatorio.
+Los datos que no cambian durante la partida (tablas de ataques y plantillas de
+enemigos por dificultad) se crean una vez y se comparten entre todas las
+sesiones; cada sesión solo copia la salud, los efectos y la defensa.
+
+Las acciones del jugador son las mismas que en GameEngine.handle_player_input:
+    {"action": "attack", "slot": 1..5}   ataque 1-5 contra el objetivo elegido
+    {"action": "potion"}                 poción (tecla P)
+    {"action": "defend"}                 defensa (tecla D)
+    {"action": "tab"}                    siguiente objetivo (no gasta turno)
+"""
+
+import asyncio
+import random
+from functools import lru_cache
+from types import MappingProxyType
+
+from src.sim.battle import ENEMY_POLICIES, campaign_templates, mixed_enemy_action
+from src.sim.rules import apply_action, roll_damage, tick_status_effects
+
+DIFFICULTIES = ("Easy", "Normal", "Hard")
+
+
+def _freeze(attacks):
+    return MappingProxyType(
+        {name: MappingProxyType(dict(attack)) for name, attack in attacks.items()}
+    )
+
+
+@lru_cache(maxsize=None)
+def session_templates(difficulty="Normal", tuned=False):
+    """
+    Plantillas de solo lectura de una dificultad: (estado inicial, jefe), con los
+    ataques congelados y, con tuned=True, la salud ajustada de
+    config/difficulty_tuning.json
+    """
+    from src.sim.tuner import load_difficulty_multipliers
+
+    multipliers = load_difficulty_multipliers(difficulty) if tuned else {}
+    state, boss = campaign_templates(
+        boss_hp=multipliers.get("boss_hp", 1.0),
+        enemy_hp=multipliers.get("enemy_hp", 1.0),
+    )
+    state = state.copy()
+    boss = boss.copy()
+    for character in [state.player, state.ally, boss] + state.enemies:
+        if character is not None:
+            character.attacks = _freeze(character.attacks)
+    return state, boss
+
+
+def ai_state_for(state, biome):
+    """El mismo resumen que GameState.get_game_state_for_ai, a partir de un CombatState"""
+    return {
+        "player_health": state.player.health,
+        "player_max_health": state.player.max_health,
+        "player_defending": state.player.defending,
+        "player_status_effects": list(state.player.effects),
+        "enemies": [
+            {
+                "name": enemy.name,
+                "health": enemy.health,
+                "max_health": enemy.max_health,
+                "status_effects": list(enemy.effects),
+            }
+            for enemy in state.enemies
+        ],
+        "ally": (
+            {"health": state.ally.health, "max_health": state.ally.max_health}
+            if state.ally
+            else None
+        ),
+        "potions": state.potions,
+        "biome": biome,
+    }
+
+
+class PolicyEnemyAI:
+    """Enemigos con las políticas simuladas de cada dificultad (sin red)"""
+
+    name = "policy"
+
+    async def decide(self, session, enemy):
+        policy = ENEMY_POLICIES.get(session.difficulty, mixed_enemy_action)
+        return policy(session.state, enemy, session.rng)
+
+
+class LLMEnemyAI:
+    """
+    Enemigos con ChatGPTClient. La llamada bloqueante se ejecuta en un hilo del
+    `executor` y se espera sin bloquear al resto de sesiones; el objetivo sale
+    de la matriz de prioridad (src/ai/targeting.py), como en el motor.
+    """
+
+    name = "llm"
+
+    def __init__(self, model_id, executor=None):
+        self.model_id = model_id
+        self.executor = executor
+        self.clients = {}
+
+    def client(self, difficulty):
+        if difficulty not in self.clients:
+            from src.ai.chatgpt_client import ChatGPTClient
+
+            self.clients[difficulty] = ChatGPTClient(
+                difficulty=difficulty, model_id=self.model_id
+            )
+        return self.clients[difficulty]
+
+    async def decide(self, session, enemy):
+        from src.ai.targeting import plan_targets
+
+        state = session.state
+        attacks = list(enemy.attacks)
+        loop = asyncio.get_running_loop()
+        name = await loop.run_in_executor(
+            self.executor,
+            self.client(session.difficulty).get_decision,
+            ai_state_for(state, session.stage),
+            attacks,
+        )
+        # La partida puede haber cambiado mientras se esperaba (no debería:
+        # cada sesión procesa sus acciones de una en una)
+        if name not in enemy.attacks:
+            name = session.rng.choice(attacks)
+        target = plan_targets(state).target_for(state.enemies.index(enemy), state)
+        return ("attack", name, "ally" if target is state.ally else "player")
+
+
+class BattleSession:
+    """
+    Una campaña en curso
+
+    Args:
+        session_id: Identificador de la sesión
+        difficulty: Easy, Normal o Hard
+        seed: Semilla de las tiradas (al azar si es None)
+        ally_controller: Controlador de la Curandera (ver src/ai/ally_controller.py)
+        tuned_difficulty: Aplicar la salud de config/difficulty_tuning.json
+    """
+
+    def __init__(
+        self,
+        session_id,
+        difficulty="Normal",
+        seed=None,
+        ally_controller=None,
+        tuned_difficulty=False,
+    ):
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(f"Dificultad desconocida: {difficulty}")
+        if ally_controller is None:
+            from src.ai.ally_controller import RuleAllyController
+
+            ally_controller = RuleAllyController()
+        template, self._boss = session_templates(difficulty, tuned_difficulty)
+        self.id = session_id
+        self.difficulty = difficulty
+        self.rng = random.Random(seed)
+        self.ally_controller = ally_controller
+        self.state = template.copy()
+        self.stage = "tutorial"
+        self.selected = 0
+        self.turns = 0
+        self.lock = asyncio.Lock()
+
+    @property
+    def over(self):
+        return self.stage in ("victory", "defeat")
+
+    def _act(self, actor, action, events):
+        damage = None
+        if action[0] == "attack":
+            damage = roll_damage(actor.attacks[action[1]], self.rng)
+        target = action[2]
+        target_name = None
+        if target is not None:
+            target_name = self.state.target(target).name
+        apply_action(self.state, actor, action, damage)
+        events.append(
+            {
+                "actor": actor.name,
+                "action": action[0],
+                "name": action[1],
+                "target": target_name,
+                "damage": damage,
+            }
+        )
+
+    def _player_action(self, command):
+        """Traduce una acción del protocolo; None si no gasta turno"""
+        state = self.state
+        kind = command.get("action")
+        if kind == "tab":
+            if state.enemies:
+                self.selected = (self.selected + 1) % len(state.enemies)
+            return None
+        if kind == "attack":
+            attacks = list(state.player.attacks)
+            slot = command.get("slot")
+            if not isinstance(slot, int) or not 1 <= slot <= len(attacks):
+                raise ValueError(f"Ataque no válido: {slot}")
+            return ("attack", attacks[slot - 1], self.selected)
+        if kind == "potion":
+            if state.potions <= 0:
+                raise ValueError("No quedan pociones")
+            return ("potion", None, None)
+        if kind == "defend":
+            return ("defend", None, None)
+        raise ValueError(f"Acción desconocida: {kind}")
+
+    def _check_stage(self):
+        state = self.state
+        if state.player.health <= 0:
+            self.stage = "defeat"
+        elif not state.enemies:
+            if self.stage == "tutorial":
+                # Como advance_to_next_biome: aparece el jefe con lo que quede
+                state.enemies = [self._boss.copy()]
+                state.initial_enemies = 1
+                self.stage = "boss"
+            else:
+                self.stage = "victory"
+        if state.enemies:
+            self.selected = min(self.selected, len(state.enemies) - 1)
+        return self.over
+
+    async def play(self, command, enemy_ai):
+        """
+        Aplica una acción del jugador y, si gasta turno, el turno de los enemigos,
+        el del aliado y los efectos de estado del turno siguiente
+
+        Returns:
+            Lista de eventos del turno (vacía si la acción no gasta turno)
+        """
+        if self.over:
+            raise ValueError("La partida ha terminado")
+        action = self._player_action(command)
+        if action is None:
+            return []
+
+        state = self.state
+        stage = self.stage
+        events = []
+        self.turns += 1
+        self._act(state.player, action, events)
+        if self._check_stage() or self.stage != stage:
+            # Si el jefe acaba de aparecer, el jugador vuelve a tener el turno
+            return events
+
+        for enemy in list(state.enemies):
+            if enemy not in state.enemies:
+                continue
+            self._act(enemy, await enemy_ai.decide(self, enemy), events)
+            if self._check_stage():
+                return events
+
+        if state.ally:
+            ally_action = self.ally_controller.decide(state)
+            if ally_action is not None:
+                self._act(state.ally, ally_action, events)
+                if self._check_stage():
+                    return events
+
+        tick_status_effects(state)
+        self._check_stage()
+        return events
+
+    def view(self):
+        """Estado de la partida serializable a JSON"""
+        state = self.state
+
+        def character(c):
+            return {
+                "name": c.name,
+                "health": c.health,
+                "max_health": c.max_health,
+                "status_effects": dict(c.effects),
+                "defending": c.defending,
+            }
+
+        return {
+            "session": self.id,
+            "difficulty": self.difficulty,
+            "stage": self.stage,
+            "over": self.over,
+            "victory": self.stage == "victory",
+            "turns": self.turns,
+            "potions": state.potions,
+            "selected": self.selected,
+            "attacks": list(state.player.attacks),
+            "attack_dice": [
+                [attack["dice"], attack["sides"]] for attack in state.player.attacks.values()
+            ],
+            "player": character(state.player),
+            "ally": character(state.ally) if state.ally else None,
+            "enemies": [character(enemy) for enemy in state.enemies],
+        }
@@ -0,0 +1,244 @@
+"""
+Combates completos simulados con las reglas de src/sim/rules.py, sin pantalla
+ni pausas. Sirven para comparar políticas (del aliado, de los enemigos o del
+jugador) sobre muchos combates en poco tiempo.
+
+Cada combate recibe su propio generador aleatorio: con la misma semilla, dos
+políticas distintas se enfrentan a las mismas tiradas iniciales.
+"""
+
+import time
+from functools import lru_cache
+
+from src.sim.rules import (
+    Combatant,
+    CombatState,
+    apply_action,
+    expected_damage,
+    roll_damage,
+    tick_status_effects,
+)
+
+
+def greedy_player_action(state, rng):
+    """Jugador sencillo: poción por debajo del 35% y si no el ataque de más daño medio al más débil"""
+    player = state.player
+    if player.health / player.max_health < 0.35 and state.potions > 0:
+        return ("potion", None, None)
+    target = min(range(len(state.enemies)), key=lambda i: state.enemies[i].health)
+    name = max(
+        player.attacks,
+        key=lambda n: expected_damage(player.attacks[n]["dice"], player.attacks[n]["sides"]),
+    )
+    return ("attack", name, target)
+
+
+def random_enemy_action(state, enemy, rng):
+    """La IA simple del motor: ataque y objetivo al azar"""
+    targets = ["player"] + (["ally"] if state.ally else [])
+    return ("attack", rng.choice(list(enemy.attacks)), rng.choice(targets))
+
+
+def greedy_enemy_action(state, enemy, rng):
+    """
+    Enemigo cuidadoso: su ataque de más daño medio contra el objetivo con menos
+    salud relativa (la curandera cuenta como si tuviera un 30% menos). Sin
+    ataques de dados no hay nada que elegir y juega como la mitad al azar de
+    mixed_enemy_action.
+    """
+    damaging = [n for n, a in enemy.attacks.items() if "dice" in a]
+    if not damaging:
+        return random_enemy_action(state, enemy, rng)
+    name = max(
+        damaging,
+        key=lambda n: expected_damage(enemy.attacks[n]["dice"], enemy.attacks[n]["sides"]),
+    )
+    target = "player"
+    if state.ally:
+        ally_weight = state.ally.health / state.ally.max_health
+        if any("heal" in a for a in state.ally.attacks.values()):
+            ally_weight *= 0.7
+        if ally_weight < state.player.health / state.player.max_health:
+            target = "ally"
+    return ("attack", name, target)
+
+
+def mixed_enemy_action(state, enemy, rng):
+    """Mitad de las veces cuidadoso, mitad al azar"""
+    if rng.random() < 0.5:
+        return random_enemy_action(state, enemy, rng)
+    return greedy_enemy_action(state, enemy, rng)
+
+
+# Aproximación sin red de cómo juegan los enemigos en cada dificultad
+ENEMY_POLICIES = {
+    "Easy": random_enemy_action,
+    "Normal": mixed_enemy_action,
+    "Hard": greedy_enemy_action,
+}
+
+
+def initial_state(scenario="tutorial"):
+    """Estado inicial de un escenario del juego (carga las mismas tablas que el motor)"""
+    from src.characters import GameState
+    from src.scenarios import load_scenario
+
+    game_state = GameState()
+    load_scenario(game_state, scenario)
+    return CombatState.from_game_state(game_state)
+
+
+@lru_cache(maxsize=None)
+def _scenario_template(scenario):
+    return initial_state(scenario)
+
+
+def _with_dice_bonus(attacks, bonus):
+    if not bonus:
+        return attacks
+    return {
+        name: dict(attack, dice=max(1, attack["dice"] + bonus)) if "dice" in attack else attack
+        for name, attack in attacks.items()
+    }
+
+
+@lru_cache(maxsize=256)
+def campaign_templates(max_health=150, potions=5, boss_hp=1.0, enemy_dice=0, enemy_hp=1.0):
+    """
+    Estados de partida de la campaña (tutorial y jefe final) con los parámetros
+    de equilibrio aplicados. Se calculan una vez por combinación.
+
+    Args:
+        max_health: Salud máxima (e inicial) del jugador
+        potions: Pociones iniciales
+        boss_hp: Multiplicador de la salud del jefe (create_boss)
+        enemy_dice: Dados de más (o de menos) en cada ataque enemigo
+        enemy_hp: Multiplicador de la salud de los enemigos del tutorial
+
+    Returns:
+        (estado del tutorial, jefe)
+    """
+    from src.enemies import create_boss, scale_health
+
+    state = _scenario_template("tutorial").copy()
+    state.player.max_health = state.player.health = max_health
+    state.potions = potions
+    scale_health(state.enemies, enemy_hp)
+    for enemy in state.enemies:
+        enemy.attacks = _with_dice_bonus(enemy.attacks, enemy_dice)
+
+    boss = Combatant.from_character(create_boss(state.player, boss_hp), "enemy")
+    boss.attacks = _with_dice_bonus(boss.attacks, enemy_dice)
+    return state, boss
+
+
+def simulate_campaign(params, ally_controller, rng, player_policy=greedy_player_action):
+    """
+    Partida completa como en el juego: enemigos del tutorial y después el jefe
+    final, conservando la salud, las pociones y los efectos del jugador
+
+    Args:
+        params: dict con difficulty, max_health, potions, boss_hp, enemy_dice
+            y enemy_hp
+
+    Returns:
+        dict con victory, stage ("tutorial", "boss" o "victory"), rounds,
+        player_health y potions_used
+    """
+    state, boss = campaign_templates(
+        params.get("max_health", 150),
+        params.get("potions", 5),
+        params.get("boss_hp", 1.0),
+        params.get("enemy_dice", 0),
+        params.get("enemy_hp", 1.0),
+    )
+    state = state.copy()
+    enemy_policy = ENEMY_POLICIES.get(params.get("difficulty", "Normal"), mixed_enemy_action)
+
+    first = simulate_battle(state, ally_controller, rng, player_policy, enemy_policy)
+    result = {
+        "victory": False,
+        "stage": "tutorial",
+        "rounds": first["rounds"],
+        "player_health": state.player.health,
+        "potions_used": first["potions_used"],
+    }
+    if not first["victory"]:
+        return result
+
+    state.enemies = [boss.copy()]
+    state.initial_enemies = 1
+    second = simulate_battle(state, ally_controller, rng, player_policy, enemy_policy)
+    result.update(
+        victory=second["victory"],
+        stage="victory" if second["victory"] else "boss",
+        rounds=first["rounds"] + second["rounds"],
+        player_health=state.player.health,
+        potions_used=first["potions_used"] + second["potions_used"],
+    )
+    return result
+
+
+def _act(state, actor, action, rng):
+    damage = None
+    if action[0] == "attack":
+        damage = roll_damage(actor.attacks[action[1]], rng)
+    apply_action(state, actor, action, damage)
+
+
+def simulate_battle(
+    state,
+    ally_controller,
+    rng,
+    player_policy=greedy_player_action,
+    enemy_policy=random_enemy_action,
+    max_rounds=200,
+):
+    """
+    Juega un combate hasta el final sobre `state` (se modifica)
+
+    Returns:
+        dict con victory, rounds, player_health, ally_alive, potions_used,
+        ally_ms (tiempo total de decisión del aliado) y ally_decisions
+    """
+    potions = state.potions
+    ally_seconds = 0.0
+    ally_decisions = 0
+    rounds = 0
+
+    while not state.is_over() and rounds < max_rounds:
+        rounds += 1
+        tick_status_effects(state)
+        if state.is_over():
+            break
+
+        _act(state, state.player, player_policy(state, rng), rng)
+        if state.is_over():
+            break
+
+        for enemy in list(state.enemies):
+            if enemy not in state.enemies:
+                continue
+            _act(state, enemy, enemy_policy(state, enemy, rng), rng)
+            if state.is_over():
+                break
+        if state.is_over():
+            break
+
+        if state.ally:
+            start = time.perf_counter()
+            action = ally_controller.decide(state)
+            ally_seconds += time.perf_counter() - start
+            ally_decisions += 1
+            if action is not None:
+                _act(state, state.ally, action, rng)
+
+    return {
+        "victory": state.player.health > 0 and not state.enemies,
+        "rounds": rounds,
+        "player_health": state.player.health,
+        "ally_alive": state.ally is not None,
+        "potions_used": potions - state.potions,
+        "ally_ms": ally_seconds * 1000,
+        "ally_decisions": ally_decisions,
+    }
@@ -0,0 +1,396 @@
+"""
+Reglas de combate sin pygame, fieles a src/abilities.py y src/engine.py.
+
+Sirven para simular y planificar turnos sin tocar el estado real del juego:
+    - Tiradas de dados con crítico del 5% (daño doble).
+    - Defensa: el daño recibido se reduce a la mitad (mínimo 1).
+    - Efectos: veneno/sangrado (3 turnos, 5% de la vida máxima por turno),
+      congelado, debilitado y bendecido (sin efecto mecánico), drenaje (el
+      atacante se cura lo que hace de daño) y ataque doble (segundo golpe con
+      la mitad del daño tirado).
+    - Poción: +30 HP (sin pasar del máximo).
+    - Turno: jugador, enemigos en orden, aliado; los efectos de estado se
+      aplican al empezar el turno del jugador.
+
+Las distribuciones de daño se calculan una sola vez por (dados, caras) y se
+comparten entre todos los que las usan.
+"""
+
+from functools import lru_cache
+
+CRIT_CHANCE = 0.05
+POTION_HEAL = 30
+DOT_EFFECTS = ("veneno", "sangrado")
+DOT_FRACTION = 0.05
+
+# Efecto del ataque -> (estado aplicado, turnos, ¿se aplica al atacante?)
+STATUS_EFFECTS = {
+    "veneno": ("veneno", 3, False),
+    "sangrado": ("sangrado", 3, False),
+    "congelado": ("congelado", 2, False),
+    "debilitar": ("debilitado", 2, False),
+    "bendición": ("bendecido", 3, True),
+}
+
+
+@lru_cache(maxsize=None)
+def dice_distribution(dice, sides):
+    """Distribución exacta de la suma de `dice` dados de `sides` caras: ((valor, p), ...)"""
+    distribution = {0: 1.0}
+    for _ in range(dice):
+        rolled = {}
+        for total, p in distribution.items():
+            for face in range(1, sides + 1):
+                rolled[total + face] = rolled.get(total + face, 0.0) + p / sides
+        distribution = rolled
+    return tuple(sorted(distribution.items()))
+
+
+@lru_cache(maxsize=None)
+def damage_distribution(dice, sides, crit_chance=CRIT_CHANCE):
+    """Distribución del daño de un ataque, con críticos incluidos"""
+    distribution = {}
+    for value, p in dice_distribution(dice, sides):
+        distribution[value] = distribution.get(value, 0.0) + p * (1 - crit_chance)
+        distribution[value * 2] = distribution.get(value * 2, 0.0) + p * crit_chance
+    return tuple(sorted(distribution.items()))
+
+
+@lru_cache(maxsize=None)
+def damage_buckets(dice, sides, buckets=3, crit_chance=CRIT_CHANCE):
+    """
+    Resumen de la distribución de daño para búsquedas: `buckets` tramos de igual
+    probabilidad de la tirada normal (cada uno con su daño medio) más el crítico
+    como resultado aparte, para no perder las muertes por crítico.
+    """
+    outcomes = []
+    size = 1.0 / buckets
+    mass, weighted = 0.0, 0.0
+    for value, p in dice_distribution(dice, sides):
+        while p > 1e-12:
+            take = min(p, size - mass)
+            mass += take
+            weighted += take * value
+            p -= take
+            if mass >= size - 1e-12:
+                outcomes.append((round(weighted / mass), size))
+                mass, weighted = 0.0, 0.0
+    if mass > 1e-12:
+        outcomes.append((round(weighted / mass), mass))
+
+    merged = {}
+    for value, p in outcomes:
+        merged[value] = merged.get(value, 0.0) + p * (1 - crit_chance)
+    if crit_chance:
+        crit = round(2 * sum(v * p for v, p in dice_distribution(dice, sides)))
+        merged[crit] = merged.get(crit, 0.0) + crit_chance
+    return tuple(sorted(merged.items()))
+
+
+@lru_cache(maxsize=None)
+def expected_damage(dice, sides, crit_chance=CRIT_CHANCE):
+    return sum(v * p for v, p in damage_distribution(dice, sides, crit_chance))
+
+
+def roll_damage(attack, rng):
+    """Tira el daño de un ataque como execute_attack (dados y crítico)"""
+    damage = sum(rng.randint(1, attack["sides"]) for _ in range(attack["dice"]))
+    if rng.random() < CRIT_CHANCE:
+        damage *= 2
+    return damage
+
+
+def dot_damage(max_health):
+    """Daño por turno de veneno y sangrado"""
+    return max(1, int(max_health * DOT_FRACTION))
+
+
+class Combatant:
+    """Copia ligera de un personaje para simular (los ataques se comparten)"""
+
+    __slots__ = ("name", "health", "max_health", "attacks", "kind", "effects", "defending")
+
+    def __init__(
+        self, name, health, max_health, attacks, kind, effects=None, defending=False
+    ):
+        self.name = name
+        self.health = health
+        self.max_health = max_health
+        self.attacks = attacks
+        self.kind = kind  # "player", "ally" o "enemy"
+        self.effects = dict(effects or {})
+        self.defending = defending
+
+    @classmethod
+    def from_character(cls, character, kind):
+        return cls(
+            character.name,
+            character.health,
+            character.max_health,
+            character.attacks,
+            kind,
+            getattr(character, "status_effects", {}),
+            getattr(character, "defending", False),
+        )
+
+    def copy(self):
+        return Combatant(
+            self.name,
+            self.health,
+            self.max_health,
+            self.attacks,
+            self.kind,
+            self.effects,
+            self.defending,
+        )
+
+    def is_alive(self):
+        return self.health > 0
+
+    def take_damage(self, damage):
+        """Igual que Character.take_damage: la defensa divide el daño entre dos"""
+        if self.defending:
+            damage = max(1, damage // 2)
+        self.health = max(0, self.health - damage)
+        return damage
+
+    def key(self):
+        return (
+            self.name,
+            self.health,
+            self.defending,
+            tuple(sorted(self.effects.items())) if self.effects else (),
+        )
+
+
+class CombatState:
+    """Estado completo de un combate, copiable y con clave hashable"""
+
+    __slots__ = ("player", "ally", "enemies", "potions", "initial_enemies")
+
+    def __init__(self, player, ally, enemies, potions, initial_enemies=None):
+        self.player = player
+        self.ally = ally
+        self.enemies = enemies
+        self.potions = potions
+        self.initial_enemies = initial_enemies or max(1, len(enemies))
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        """Instantánea de un GameState del juego"""
+        ally = game_state.ally
+        return cls(
+            Combatant.from_character(game_state.player, "player"),
+            (
+                Combatant.from_character(ally, "ally")
+                if ally and ally.is_alive()
+                else None
+            ),
+            [Combatant.from_character(e, "enemy") for e in game_state.enemies],
+            game_state.potions,
+        )
+
+    def copy(self):
+        return CombatState(
+            self.player.copy(),
+            self.ally.copy() if self.ally else None,
+            [enemy.copy() for enemy in self.enemies],
+            self.potions,
+            self.initial_enemies,
+        )
+
+    def shallow_copy(self):
+        """Copia que comparte los personajes; se copian con own() antes de modificarlos"""
+        return CombatState(
+            self.player, self.ally, list(self.enemies), self.potions, self.initial_enemies
+        )
+
+    def own(self, ref):
+        """Sustituye un personaje de una copia superficial por una copia propia"""
+        if ref == "player":
+            self.player = self.player.copy()
+            return self.player
+        if ref == "ally":
+            self.ally = self.ally.copy()
+            return self.ally
+        self.enemies[ref] = self.enemies[ref].copy()
+        return self.enemies[ref]
+
+    def key(self):
+        return (
+            self.player.key(),
+            self.ally.key() if self.ally else None,
+            tuple(enemy.key() for enemy in self.enemies),
+            self.potions,
+        )
+
+    def is_over(self):
+        return self.player.health <= 0 or not self.enemies
+
+    def target(self, ref):
+        """Personaje al que apunta una referencia: "player", "ally" o índice de enemigo"""
+        if ref == "player":
+            return self.player
+        if ref == "ally":
+            return self.ally
+        return self.enemies[ref]
+
+
+def remove_if_dead(state, character):
+    """Como check_defender_death: los enemigos y el aliado muertos desaparecen"""
+    if character.health > 0:
+        return
+    if character.kind == "enemy":
+        for i, enemy in enumerate(state.enemies):
+            if enemy is character:
+                del state.enemies[i]
+                break
+    elif character.kind == "ally":
+        state.ally = None
+
+
+def apply_attack(state, attacker, defender, attack_name, damage):
+    """
+    Aplica un ataque con la tirada ya resuelta (daño antes de la defensa,
+    con el crítico incluido). Devuelve el daño realmente recibido.
+    """
+    attack = attacker.attacks[attack_name]
+    actual = defender.take_damage(damage)
+
+    effect = attack.get("effect")
+    if effect in STATUS_EFFECTS:
+        name, turns, on_attacker = STATUS_EFFECTS[effect]
+        (attacker if on_attacker else defender).effects[name] = turns
+    elif effect == "drenaje":
+        attacker.health += min(actual, attacker.max_health - attacker.health)
+    elif effect == "ataque_doble":
+        defender.take_damage(max(1, damage // 2))
+
+    remove_if_dead(state, defender)
+    return actual
+
+
+def apply_heal(healer, target, amount):
+    healed = min(amount, target.max_health - target.health)
+    target.health += healed
+    return healed
+
+
+def use_potion(state):
+    apply_heal(state.player, state.player, POTION_HEAL)
+    state.potions -= 1
+    state.player.defending = False
+
+
+def tick_status_effects(state):
+    """Daño de veneno/sangrado y duración de los efectos (inicio del turno del jugador)"""
+    characters = [state.player] + ([state.ally] if state.ally else []) + list(state.enemies)
+    for character in characters:
+        if not character.effects:
+            continue
+        for effect in list(character.effects):
+            if effect in DOT_EFFECTS:
+                character.health = max(0, character.health - dot_damage(character.max_health))
+                remove_if_dead(state, character)
+            character.effects[effect] -= 1
+            if character.effects[effect] <= 0:
+                del character.effects[effect]
+
+
+def player_actions(state):
+    """Acciones posibles del jugador: cada ataque contra cada enemigo, poción y defensa"""
+    actions = [
+        ("attack", name, i)
+        for name in state.player.attacks
+        for i in range(len(state.enemies))
+    ]
+    if state.potions > 0:
+        actions.append(("potion", None, None))
+    actions.append(("defend", None, None))
+    return actions
+
+
+def enemy_actions(state, enemy):
+    """Ataques de un enemigo contra el jugador o el aliado"""
+    targets = ["player"] + (["ally"] if state.ally else [])
+    return [("attack", name, target) for name in enemy.attacks for target in targets]
+
+
+def ally_actions(state):
+    """Acciones posibles del aliado: curar al jugador o a sí mismo y atacar a cada enemigo"""
+    ally = state.ally
+    if not ally:
+        return []
+    actions = []
+    for name, attack in ally.attacks.items():
+        if "heal" in attack:
+            actions.append(("heal", name, "player"))
+            actions.append(("heal", name, "ally"))
+        elif "dice" in attack:
+            actions.extend(("attack", name, i) for i in range(len(state.enemies)))
+    return actions
+
+
+def default_ally_action(state):
+    """La misma decisión que perform_ally_action en src/abilities.py"""
+    ally = state.ally
+    if not ally:
+        return None
+
+    if state.player.health / state.player.max_health < 0.4 and "Toque Curativo" in ally.attacks:
+        return ("heal", "Toque Curativo", "player")
+
+    if not state.enemies:
+        return None
+
+    target = min(range(len(state.enemies)), key=lambda i: state.enemies[i].health)
+    offensive = [name for name, attack in ally.attacks.items() if "dice" in attack]
+    if not offensive:
+        return None
+    if state.enemies[target].health < 15 and "Proyectil Mágico" in offensive:
+        return ("attack", "Proyectil Mágico", target)
+    if "Agua Bendita" in offensive and any(e.health > 30 for e in state.enemies):
+        return ("attack", "Agua Bendita", target)
+    return ("attack", offensive[0], target)
+
+
+def action_outcomes(actor, action, buckets=3):
+    """Resultados posibles de una acción: ((probabilidad, daño tirado), ...)"""
+    kind, name, _ = action
+    if kind != "attack":
+        return ((1.0, None),)
+    attack = actor.attacks[name]
+    return tuple((p, value) for value, p in damage_buckets(attack["dice"], attack["sides"], buckets))
+
+
+def next_state(state, actor_ref, action, damage=None):
+    """
+    Estado resultante de una acción sin modificar `state`: solo se copian el
+    actor y su objetivo, el resto de personajes se comparte
+    """
+    child = state.shallow_copy()
+    actor = child.own(actor_ref)
+    target = action[2]
+    if target is not None and target != actor_ref:
+        child.own(target)
+    apply_action(child, actor, action, damage)
+    return child
+
+
+def apply_action(state, actor, action, damage=None):
+    """Aplica una acción de cualquier personaje; `damage` es la tirada si es un ataque"""
+    kind, name, target = action
+    if kind == "attack":
+        apply_attack(state, actor, state.target(target), name, damage)
+        if actor.kind == "player" and actor.is_alive() and state.enemies:
+            actor.defending = False
+    elif kind == "heal":
+        apply_heal(actor, state.target(target), actor.attacks[name]["heal"])
+        effect = actor.attacks[name].get("effect")
+        if effect in STATUS_EFFECTS:
+            status, turns, on_attacker = STATUS_EFFECTS[effect]
+            (actor if on_attacker else state.target(target)).effects[status] = turns
+    elif kind == "potion":
+        use_potion(state)
+    elif kind == "defend":
+        actor.defending = True
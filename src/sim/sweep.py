@@ -0,0 +1,264 @@
+"""
+Barrido de equilibrio: juega miles de campañas simuladas (tutorial + jefe final)
+para cada combinación de parámetros y resume la tasa de victorias.
+
+Ejes del barrido (listas separadas por comas):
+    --difficulty   Easy,Normal,Hard (política de los enemigos simulados)
+    --max-health   Salud máxima del jugador
+    --potions      Pociones iniciales
+    --boss-hp      Multiplicador de la salud del jefe (create_boss)
+    --enemy-dice   Dados de más o de menos en los ataques enemigos
+
+El trabajo se reparte en bloques de semillas (--chunk) entre procesos
+(ProcessPoolExecutor, todos los núcleos por defecto). Cada bloque terminado se
+escribe al momento como una línea JSON en --out; si el barrido se interrumpe,
+al relanzarlo con el mismo --out se saltan los bloques ya hechos (solo los de
+la misma --seed, el mismo --ally-controller y el mismo tamaño de bloque: con
+otros valores se repiten).
+
+La semilla i de una celda es la misma en todas las celdas, así las diferencias
+entre celdas vienen de los parámetros y no de la suerte.
+
+Uso:
+    python -m src.sim.sweep --difficulty Easy,Normal,Hard --boss-hp 0.8,1,1.2 \\
+        --seeds 5000 --out sweep.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+AXES = ("difficulty", "max_health", "potions", "boss_hp", "enemy_dice")
+
+_controller = None
+_controller_name = None
+
+
+def _init_worker(ally_controller, log_level="OFF"):
+    """Inicialización de cada proceso: sin ventana real y un controlador propio"""
+    global _controller, _controller_name
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    from src.ai.ally_controller import SIM_NODE_BUDGET, create_ally_controller
+    from src.utils.log import configure_logging
+
+    # Millones de combates: los avisos de diagnóstico se descartan antes de formatearse
+    configure_logging(log_level)
+
+    # Presupuesto por nodos y no por tiempo: un bloque reanudado da lo mismo
+    options = {"node_budget": SIM_NODE_BUDGET} if ally_controller == "lookahead" else {}
+    _controller = create_ally_controller(ally_controller, **options)
+    _controller_name = ally_controller
+
+
+def cell_key(cell):
+    """Clave estable de una celda, para reanudar"""
+    return json.dumps(cell, sort_keys=True)
+
+
+def chunk_key(cell, controller, seed, start, count):
+    """Clave de un bloque: la celda, el controlador del aliado y las semillas exactas que juega"""
+    return (cell_key(cell), controller, seed, start, count)
+
+
+def run_chunk(cell, seed, start, count):
+    """
+    Juega las campañas start..start+count-1 de una celda
+
+    Returns:
+        dict con la celda, el bloque y los totales (se suman entre bloques)
+    """
+    from src.sim.battle import simulate_campaign
+
+    if _controller is None:
+        _init_worker("rules")
+
+    totals = {"campaigns": 0, "victories": 0, "boss_reached": 0}
+    totals.update({"rounds": 0, "player_health": 0, "potions_used": 0})
+    for i in range(start, start + count):
+        rng = random.Random(seed * 1_000_003 + i)
+        result = simulate_campaign(cell, _controller, rng)
+        totals["campaigns"] += 1
+        totals["victories"] += result["victory"]
+        totals["boss_reached"] += result["stage"] != "tutorial"
+        totals["rounds"] += result["rounds"]
+        totals["player_health"] += result["player_health"]
+        totals["potions_used"] += result["potions_used"]
+    return {
+        "cell": cell,
+        "ally_controller": _controller_name,
+        "seed": seed,
+        "start": start,
+        "count": count,
+        "totals": totals,
+    }
+
+
+def build_grid(args):
+    """Producto cartesiano de los ejes"""
+    values = [
+        args.difficulty.split(","),
+        [int(v) for v in args.max_health.split(",")],
+        [int(v) for v in args.potions.split(",")],
+        [float(v) for v in args.boss_hp.split(",")],
+        [int(v) for v in args.enemy_dice.split(",")],
+    ]
+    return [dict(zip(AXES, combo)) for combo in itertools.product(*values)]
+
+
+def load_done(path):
+    """Bloques ya terminados en un barrido anterior: {chunk_key: línea}"""
+    done = {}
+    if not path or not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Última línea a medio escribir al interrumpir
+                continue
+            if "seed" not in record or "ally_controller" not in record:
+                # Formato antiguo sin semilla o controlador: no se sabe qué campañas jugó
+                continue
+            key = chunk_key(
+                record["cell"],
+                record["ally_controller"],
+                record["seed"],
+                record["start"],
+                record["count"],
+            )
+            done[key] = record
+    return done
+
+
+def summarize(records):
+    """Suma los bloques de cada celda"""
+    cells = {}
+    for record in records:
+        key = cell_key(record["cell"])
+        entry = cells.setdefault(key, {"cell": record["cell"], "totals": {}})
+        for name, value in record["totals"].items():
+            entry["totals"][name] = entry["totals"].get(name, 0) + value
+    summary = []
+    for entry in cells.values():
+        t = entry["totals"]
+        n = max(1, t["campaigns"])
+        summary.append(
+            dict(
+                entry["cell"],
+                campaigns=t["campaigns"],
+                win_rate=t["victories"] / n,
+                boss_rate=t["boss_reached"] / n,
+                mean_rounds=t["rounds"] / n,
+                mean_player_health=t["player_health"] / n,
+                mean_potions_used=t["potions_used"] / n,
+            )
+        )
+    return summary
+
+
+def print_summary(summary):
+    print(
+        f"{'dificultad':10s} {'salud':>5s} {'poc':>3s} {'jefe':>5s} {'dados':>5s} "
+        f"{'partidas':>8s} {'victorias':>9s} {'al jefe':>7s} {'rondas':>6s}"
+    )
+    for row in summary:
+        print(
+            f"{row['difficulty']:10s} {row['max_health']:5d} {row['potions']:3d} "
+            f"{row['boss_hp']:5.2f} {row['enemy_dice']:+5d} {row['campaigns']:8d} "
+            f"{row['win_rate']:9.1%} {row['boss_rate']:7.1%} {row['mean_rounds']:6.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barrido de equilibrio con combates simulados")
+    parser.add_argument("--difficulty", default="Easy,Normal,Hard")
+    parser.add_argument("--max-health", default="150")
+    parser.add_argument("--potions", default="5")
+    parser.add_argument("--boss-hp", default="1.0")
+    parser.add_argument("--enemy-dice", default="0")
+    parser.add_argument("--seeds", type=int, default=2000, help="Campañas por celda")
+    parser.add_argument("--chunk", type=int, default=250, help="Campañas por bloque de trabajo")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ally-controller", default="rules")
+    parser.add_argument(
+        "--log-level", default="OFF", help="Nivel de registro en los procesos de simulación"
+    )
+    parser.add_argument("--out", default="sweep.jsonl", help="Resultados por bloque (JSON lines)")
+    parser.add_argument("--json", dest="json_path", help="Guardar el resumen en JSON")
+    args = parser.parse_args()
+
+    grid = build_grid(args)
+    done = load_done(args.out)
+    chunks = [
+        (cell, start, min(args.chunk, args.seeds - start))
+        for cell in grid
+        for start in range(0, args.seeds, args.chunk)
+    ]
+    keys = [
+        chunk_key(cell, args.ally_controller, args.seed, start, count)
+        for cell, start, count in chunks
+    ]
+    pending = [chunk for chunk, key in zip(chunks, keys) if key not in done]
+    records = [done[key] for key in keys if key in done]
+    total = len(records) + len(pending)
+    print(
+        f"{len(grid)} celdas x {args.seeds} campañas: {total} bloques "
+        f"({len(records)} ya hechos), {args.workers} procesos"
+    )
+
+    start_time = time.perf_counter()
+    executor = ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.ally_controller, args.log_level),
+    )
+    try:
+        with open(args.out, "a") as out:
+            queue = iter(pending)
+            running = set()
+            while True:
+                # Pocos bloques en vuelo: al interrumpir se pierde poco trabajo
+                for cell, start, count in itertools.islice(
+                    queue, max(0, args.workers * 2 - len(running))
+                ):
+                    running.add(executor.submit(run_chunk, cell, args.seed, start, count))
+                if not running:
+                    break
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record = future.result()
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    records.append(record)
+                    print(
+                        f"\r{len(records)}/{total} bloques "
+                        f"({time.perf_counter() - start_time:.0f} s)",
+                        end="",
+                        flush=True,
+                    )
+        print()
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        print(f"\nInterrumpido. Relanza con --out {args.out} para continuar")
+        sys.exit(130)
+    executor.shutdown()
+
+    summary = summarize(records)
+    print_summary(summary)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": summary}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Ajuste automático de la dificultad con campañas simuladas.
+
+Para cada dificultad busca una escala de salud, aplicada a la vez a los
+enemigos (enemy_hp) y al jefe final (boss_hp), con la que el jugador de
+referencia (greedy_player_action) gana el porcentaje de campañas objetivo, por
+ejemplo 90% en Easy, 65% en Normal y 35% en Hard. Con un solo parámetro por
+dificultad la búsqueda está bien definida (dos multiplicadores libres para un
+único objetivo admiten infinitas soluciones, muchas absurdas). Cada dificultad
+se ajusta por separado y la escala no tiene por qué crecer con ella: Normal y
+Hard ya dan más daño y menos pociones, así que el jugador de referencia solo
+llega al objetivo con enemigos algo más débiles que en Easy. Si una dificultad
+queda a más de --tolerance de su objetivo, la tabla no se guarda.
+
+Búsqueda por successive halving: se prueban muchos candidatos con pocas
+campañas, se queda el tercio más cercano al objetivo, se triplican las campañas
+y se repite hasta quedar uno. Todos los candidatos juegan las mismas semillas
+y al subir el presupuesto solo se juegan las campañas nuevas, así casi todo el
+tiempo se gasta en los candidatos buenos. Las campañas se reparten entre
+procesos igual que en src/sim/sweep.py.
+
+El resultado se guarda en config/difficulty_tuning.json. Es opcional: el juego
+solo lo aplica con "tuned_difficulty": true en config/game_config.json y el
+servidor de combates con --tuned-difficulty (load_difficulty_multipliers).
+
+Uso:
+    python -m src.sim.tuner --targets Easy=0.9,Normal=0.65,Hard=0.35
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+TUNING_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "config",
+    "difficulty_tuning.json",
+)
+
+DEFAULT_TARGETS = {"Easy": 0.9, "Normal": 0.65, "Hard": 0.35}
+
+# Multiplicadores que mueve la escala de cada dificultad
+MULTIPLIERS = ("enemy_hp", "boss_hp")
+# Rango de búsqueda de la escala (rejilla en escala logarítmica)
+SCALE_RANGE = (0.35, 2.0)
+
+# Penalización por alejarse de los valores originales, para desempatar
+# candidatos igual de cerca del objetivo
+REGULARIZATION = 0.01
+
+
+def load_difficulty_multipliers(difficulty, path=TUNING_PATH):
+    """
+    Multiplicadores ajustados para una dificultad ({} si no hay tabla)
+
+    Returns:
+        dict con enemy_hp y boss_hp
+    """
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            tables = json.load(f)["tables"]
+    except (OSError, ValueError, KeyError) as e:
+        log.error("Error cargando el ajuste de dificultad", path=path, error=str(e))
+        return {}
+    table = tables.get(difficulty, {})
+    return {name: float(table[name]) for name in MULTIPLIERS if name in table}
+
+
+def candidate_scales(count, low=SCALE_RANGE[0], high=SCALE_RANGE[1]):
+    """Rejilla logarítmica de escalas entre low y high, con 1.0 incluido"""
+    scales = {1.0} if low <= 1.0 <= high else set()
+    step = (math.log(high) - math.log(low)) / max(1, count - 1)
+    scales.update(round(math.exp(math.log(low) + i * step), 3) for i in range(count))
+    return [{name: scale for name in MULTIPLIERS} for scale in sorted(scales)]
+
+
+def _score(win_rate, target, candidate):
+    return abs(win_rate - target) + REGULARIZATION * abs(math.log(candidate["enemy_hp"]))
+
+
+class Tuner:
+    """
+    Successive halving sobre los multiplicadores de una o varias dificultades
+
+    Args:
+        executor: ProcessPoolExecutor inicializado con sweep._init_worker
+        base: Parámetros fijos de la campaña (max_health, potions, ...)
+        seed: Semilla de las campañas (la misma para todos los candidatos)
+        chunk: Campañas por bloque de trabajo
+    """
+
+    def __init__(self, executor, base=None, seed=0, chunk=100):
+        self.executor = executor
+        self.base = base or {}
+        self.seed = seed
+        self.chunk = chunk
+        self.campaigns = 0
+
+    def evaluate(self, cells, totals, start, stop):
+        """Juega las campañas start..stop-1 de cada celda y las suma a sus totales"""
+        from src.sim.sweep import run_chunk
+
+        futures = [
+            (
+                i,
+                self.executor.submit(
+                    run_chunk, cell, self.seed, first, min(self.chunk, stop - first)
+                ),
+            )
+            for i, cell in enumerate(cells)
+            for first in range(start, stop, self.chunk)
+        ]
+        for i, future in futures:
+            result = future.result()["totals"]
+            totals[i]["campaigns"] += result["campaigns"]
+            totals[i]["victories"] += result["victories"]
+            self.campaigns += result["campaigns"]
+
+    def tune(self, difficulty, target, candidates, budget=30, eta=3):
+        """
+        Busca el candidato con la tasa de victorias más cercana a `target`
+
+        Returns:
+            dict con los multiplicadores, win_rate y campaigns (las del ganador)
+        """
+        alive = list(candidates)
+        cells = [dict(self.base, difficulty=difficulty, **c) for c in alive]
+        totals = [{"campaigns": 0, "victories": 0} for _ in alive]
+        played = 0
+        while True:
+            self.evaluate(cells, totals, played, budget)
+            played = budget
+            ranked = sorted(
+                range(len(alive)),
+                key=lambda i: _score(
+                    totals[i]["victories"] / totals[i]["campaigns"], target, alive[i]
+                ),
+            )
+            best = alive[ranked[0]]
+            win_rate = totals[ranked[0]]["victories"] / totals[ranked[0]]["campaigns"]
+            print(
+                f"  {difficulty}: {len(alive):3d} candidatos x {budget:5d} campañas -> "
+                f"escala {best['enemy_hp']:.3f} victorias {win_rate:.1%}"
+            )
+            if len(alive) == 1:
+                return dict(best, win_rate=win_rate, campaigns=played)
+            keep = ranked[: max(1, len(alive) // eta)]
+            alive = [alive[i] for i in keep]
+            cells = [cells[i] for i in keep]
+            totals = [totals[i] for i in keep]
+            budget *= eta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajustar la dificultad con combates simulados")
+    parser.add_argument(
+        "--targets",
+        default=",".join(f"{k}={v}" for k, v in DEFAULT_TARGETS.items()),
+        help="Tasa de victorias objetivo por dificultad",
+    )
+    parser.add_argument("--candidates", type=int, default=81, help="Escalas de la rejilla")
+    parser.add_argument("--budget", type=int, default=90, help="Campañas de la primera ronda")
+    parser.add_argument("--eta", type=int, default=3, help="Factor de reducción por ronda")
+    parser.add_argument("--chunk", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="Máxima distancia al objetivo para guardar la tabla",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ally-controller", default="rules")
+    parser.add_argument(
+        "--log-level", default="OFF", help="Nivel de registro en los procesos de simulación"
+    )
+    parser.add_argument("--out", default=TUNING_PATH)
+    args = parser.parse_args()
+
+    from src.sim.sweep import _init_worker
+
+    targets = {
+        name: float(value)
+        for name, value in (item.split("=") for item in args.targets.split(","))
+    }
+    candidates = candidate_scales(args.candidates)
+
+    start = time.perf_counter()
+    tables = {}
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args.ally_controller, args.log_level),
+    ) as executor:
+        tuner = Tuner(executor, seed=args.seed, chunk=args.chunk)
+        for difficulty, target in targets.items():
+            tables[difficulty] = tuner.tune(
+                difficulty, target, candidates, args.budget, args.eta
+            )
+    elapsed = time.perf_counter() - start
+
+    print(f"{tuner.campaigns} campañas simuladas en {elapsed:.1f} s")
+    for difficulty, table in tables.items():
+        print(
+            f"{difficulty:8s} objetivo {targets[difficulty]:5.0%}  "
+            f"escala {table['enemy_hp']:.3f}  victorias {table['win_rate']:5.1%}"
+        )
+
+    missed = [
+        difficulty
+        for difficulty, table in tables.items()
+        if abs(table["win_rate"] - targets[difficulty]) > args.tolerance
+    ]
+    if missed:
+        raise SystemExit(
+            f"Objetivo no alcanzado en {', '.join(missed)} (tolerancia {args.tolerance:.0%}); "
+            f"no se guarda {args.out}"
+        )
+
+    with open(args.out, "w") as f:
+        json.dump(
+            {
+                "targets": targets,
+                "player_policy": "greedy",
+                "ally_controller": args.ally_controller,
+                "seed": args.seed,
+                "tables": tables,
+            },
+            f,
+            indent=4,
+        )
+    print(f"Tabla guardada en {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,11 @@ import math
 import random
 import os
 from src.ui import COLORS, font_large, font_medium, font_small, draw_button
+from src.utils.log import get_logger
+from src.utils.pacing import FixedTimestep, lerp, render_fps
+from src.utils.profiler import profiler
+
+log = get_logger(__name__)
 
 # Colores temáticos para Tavern AI
 TAVERN_COLORS = {
@@ -18,15 +23,18 @@ TAVERN_COLORS = {
     "BUTTON_ACTIVE": (70, 40, 90),  # Botón activo
     "BUTTON_HOVER": (90, 50, 120),  # Botón con hover
     "BUTTON_INACTIVE": (50, 30, 70),  # Botón inactivo
+    "GRAY": (120, 120, 120),  # Texto de botón desactivado
 }
+# Grados que gira el borde del logo por paso de animación
+LOGO_SPEED = 0.5
 
 
 class TutorialParticle:
     """Clase para partículas decorativas en el tutorial"""
 
     def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
+        self.x = self.prev_x = x
+        self.y = self.prev_y = y
         self.color = color
         self.size = random.uniform(1.5, 4)
         self.speed = random.uniform(0.2, 1)
@@ -35,35 +43,34 @@ class TutorialParticle:
         self.max_life = self.life
 
     def update(self):
+        self.prev_x, self.prev_y = self.x, self.y
         self.x += math.cos(self.direction) * self.speed
         self.y += math.sin(self.direction) * self.speed
         self.life -= 0.01
         return self.life > 0
 
-    def draw(self, surface):
+    def draw(self, surface, interpolation=1.0):
         alpha = int(255 * (self.life / self.max_life))
         color = (self.color[0], self.color[1], self.color[2], alpha)
         s = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
         pygame.draw.circle(s, color, (self.size, self.size), self.size)
-        surface.blit(s, (self.x - self.size, self.y - self.size))
+        x = lerp(self.prev_x, self.x, interpolation)
+        y = lerp(self.prev_y, self.y, interpolation)
+        surface.blit(s, (x - self.size, y - self.size))
 
 
 class Tutorial:
     def __init__(self, screen):
-        print("Inicializando tutorial de Tavern AI...")
+        log.debug("Inicializando tutorial de Tavern AI")
         self.screen = screen
         self.width, self.height = screen.get_size()
         self.running = True
         self.clock = pygame.time.Clock()
 
-        # Crear superficie para partículas
-        self.particle_surface = pygame.Surface(
-            (self.width, self.height), pygame.SRCALPHA
-        )
         self.particles = []
 
         # Efecto de transición
-        self.fade_alpha = 255
+        self.fade_alpha = self.prev_fade_alpha = 255
         self.fade_direction = -1  # -1 = fade in, 1 = fade out
         self.transition_speed = 5
         self.transitioning = True
@@ -74,11 +81,16 @@ class Tutorial:
 
         # Logo de DarkChris
         self.logo_font = pygame.font.SysFont("Arial", 20, bold=True)
-        self.logo_angle = 0
+        self.logo_angle = self.prev_logo_angle = 0
 
         # Variables para transición de página
         self.next_step = None
-        self.page_offset = 0
+        self.page_offset = self.prev_page_offset = 0
+
+        # Puntos donde el último frame dibujó la imagen y el nombre del autor:
+        # la simulación hace brotar partículas a su alrededor
+        self.image_rect = None
+        self.credit_pos = None
 
         # Etapas del tutorial
         self.steps = [
@@ -182,11 +194,11 @@ class Tutorial:
         # Cargar imágenes del tutorial
         self.images = {}
         self.load_images()
-        print("Tutorial inicializado correctamente")
+        log.debug("Tutorial inicializado")
 
     def load_images(self):
         """Carga las imágenes para el tutorial con manejo de errores mejorado"""
-        print("Cargando imágenes para el tutorial...")
+        log.debug("Cargando imágenes para el tutorial")
         try:
             image_dir = os.path.join(
                 os.path.dirname(os.path.dirname(__file__)), "assets", "images"
@@ -194,7 +206,7 @@ class Tutorial:
 
             # Asegurar que el directorio existe
             if not os.path.exists(image_dir):
-                print(f"Creando directorio de imágenes: {image_dir}")
+                log.info("Creando directorio de imágenes", path=image_dir)
                 os.makedirs(image_dir, exist_ok=True)
 
             for step in self.steps:
@@ -209,9 +221,9 @@ class Tutorial:
                             bordered_img.fill(TAVERN_COLORS["GOLD"])
                             bordered_img.blit(img, (8, 8))
                             self.images[step["image"]] = bordered_img
-                            print(f"Imagen cargada: {step['image']}")
+                            log.debug("Imagen cargada", image=step["image"])
                         else:
-                            print(f"Imagen no encontrada: {img_path}")
+                            log.warning("Imagen no encontrada", path=img_path)
                             # Crear una imagen placeholder con texto
                             placeholder = pygame.Surface((300, 300))
                             placeholder.fill(TAVERN_COLORS["PANEL"])
@@ -231,13 +243,10 @@ class Tutorial:
                             bordered_img.blit(placeholder, (8, 8))
                             self.images[step["image"]] = bordered_img
                     except Exception as e:
-                        print(f"Error cargando imagen {step['image']}: {e}")
+                        log.warning("Error cargando imagen", image=step["image"], error=str(e))
                         # No lanzar excepción, solo registrar el error
-        except Exception as e:
-            print(f"Error general cargando imágenes: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            log.exception("Error general cargando imágenes")
 
     def create_particles(self, x, y, count=5):
         """Crea partículas decorativas en la posición dada"""
@@ -251,16 +260,24 @@ class Tutorial:
             self.particles.append(TutorialParticle(x, y, particle_color))
 
     def update_particles(self):
-        """Actualiza y dibuja todas las partículas activas"""
-        self.particle_surface.fill((0, 0, 0, 0))
+        """Actualiza todas las partículas activas"""
         self.particles = [p for p in self.particles if p.update()]
+
+    def draw_particles(self, interpolation=1.0):
+        # Directamente en pantalla: una capa a pantalla completa costaba dos
+        # operaciones de 1024x768 por frame
         for particle in self.particles:
-            particle.draw(self.particle_surface)
+            particle.draw(self.screen, interpolation)
 
-    def draw_developer_logo(self):
+    def draw_developer_logo(self, interpolation=1.0):
         """Dibuja un logo animado para DarkChris"""
         try:
-            self.logo_angle = (self.logo_angle + 0.5) % 360
+            # Interpolar entre los dos últimos pasos; tras dar la vuelta (359.8 ->
+            # 0.3) el actual se desenrolla para no girar hacia atrás
+            current = self.logo_angle
+            if current < self.prev_logo_angle:
+                current += 360
+            logo_angle = lerp(self.prev_logo_angle, current, interpolation)
             logo_text = self.logo_font.render("DarkChris", True, TAVERN_COLORS["GOLD"])
 
             # Crear superficie rotada
@@ -284,7 +301,7 @@ class Tutorial:
 
             # Dibujar un borde decorativo con efecto de rotación
             for i in range(4):
-                angle = self.logo_angle + i * 90
+                angle = logo_angle + i * 90
                 rad = math.radians(angle)
                 start = (
                     rect.centerx + math.cos(rad) * (size // 2),
@@ -299,11 +316,18 @@ class Tutorial:
             # Posicionar en esquina
             self.screen.blit(logo_surf, (self.width - logo_surf.get_width() - 10, 10))
         except Exception as e:
-            print(f"Error dibujando logo del desarrollador: {e}")
+            log.warning("Error dibujando logo del desarrollador", error=str(e))
 
     def update_animations(self):
-        """Actualiza todas las animaciones y efectos visuales"""
+        """Avanza un paso de simulación de las animaciones y efectos visuales"""
         try:
+            # Valores del paso anterior para interpolar al dibujar
+            self.prev_fade_alpha = self.fade_alpha
+            self.prev_page_offset = self.page_offset
+            self.prev_logo_angle = self.logo_angle
+
+            self.logo_angle = (self.logo_angle + LOGO_SPEED) % 360
+
             # Actualizar animación del título
             self.title_scale += self.title_direction
             if self.title_scale > 1.05:
@@ -337,10 +361,22 @@ class Tutorial:
                 y = random.randint(0, self.height)
                 self.create_particles(x, y, 2)
 
+            # Partículas ocasionales alrededor de la imagen
+            if self.image_rect is not None and random.random() < 0.1:
+                angle = random.uniform(0, 2 * math.pi)
+                radius = self.image_rect.width // 2 + 10
+                x = self.image_rect.centerx + math.cos(angle) * radius
+                y = self.image_rect.centery + math.sin(angle) * radius
+                self.create_particles(x, y, 3)
+
+            # Partículas alrededor del nombre del desarrollador
+            if self.credit_pos is not None and random.random() < 0.2:
+                self.create_particles(*self.credit_pos, 2)
+
             self.update_particles()
             return False
         except Exception as e:
-            print(f"Error en animaciones: {e}")
+            log.warning("Error en animaciones", error=str(e))
             return False
 
     def start_transition(self, direction):
@@ -364,9 +400,20 @@ class Tutorial:
         # Ajustar desplazamiento para animación
         self.page_offset = -300 if new_step > self.current_step else 300
 
-    def draw(self):
-        """Dibuja la interfaz completa del tutorial"""
+    def draw(self, interpolation=1.0):
+        """
+        Dibuja la interfaz completa del tutorial
+
+        Args:
+            interpolation: Fracción del siguiente paso de simulación ya
+                transcurrida (0 = último paso, 1 = siguiente)
+        """
         try:
+            page_offset = lerp(self.prev_page_offset, self.page_offset, interpolation)
+            fade_alpha = lerp(self.prev_fade_alpha, self.fade_alpha, interpolation)
+            self.image_rect = None
+            self.credit_pos = None
+
             # Fondo con degradado y textura
             for y in range(0, self.height, 2):
                 color_value = int(y / self.height * 50)
@@ -394,7 +441,7 @@ class Tutorial:
 
             # Marco del tutorial con efecto de madera de taberna
             tutorial_rect = pygame.Rect(
-                50 + self.page_offset, 50, self.width - 100, self.height - 100
+                50 + page_offset, 50, self.width - 100, self.height - 100
             )
 
             # Panel principal con borde decorativo
@@ -485,14 +532,7 @@ class Tutorial:
                     center=(self.width // 4, self.height // 2 + offset)
                 )
                 self.screen.blit(img, img_rect)
-
-                # Crear partículas ocasionales alrededor de la imagen
-                if random.random() < 0.1:
-                    angle = random.uniform(0, 2 * math.pi)
-                    radius = img_rect.width // 2 + 10
-                    x = img_rect.centerx + math.cos(angle) * radius
-                    y = img_rect.centery + math.sin(angle) * radius
-                    self.create_particles(x, y, 3)
+                self.image_rect = img_rect
 
             # Texto explicativo con mejor formato
             text_x = (
@@ -523,13 +563,11 @@ class Tutorial:
                     text_rect = text.get_rect(center=(text_x, text_y))
                     self.screen.blit(text, text_rect)
 
-                    # Añadir partículas alrededor del nombre del desarrollador
-                    if random.random() < 0.2:
-                        # Encontrar la posición de "DarkChris" en el texto
-                        dc_pos = line.find("DarkChris")
-                        if dc_pos >= 0:
-                            dc_x = text_rect.x + dc_pos * 14  # Estimación aproximada
-                            self.create_particles(dc_x + 40, text_y, 2)
+                    # Posición de "DarkChris" en el texto (para las partículas)
+                    dc_pos = line.find("DarkChris")
+                    if dc_pos >= 0:
+                        dc_x = text_rect.x + dc_pos * 14  # Estimación aproximada
+                        self.credit_pos = (dc_x + 40, text_y)
                 else:
                     # Determinar si es un punto de lista
                     if line.startswith("•"):
@@ -622,25 +660,22 @@ class Tutorial:
             )
 
             # Dibujar logo de desarrollador
-            self.draw_developer_logo()
+            self.draw_developer_logo(interpolation)
 
             # Dibujar partículas
-            self.screen.blit(self.particle_surface, (0, 0))
+            self.draw_particles(interpolation)
 
             # Aplicar efecto de transición si está activo
             if self.transitioning:
                 fade_surface = pygame.Surface(
                     (self.width, self.height), pygame.SRCALPHA
                 )
-                fade_surface.fill((0, 0, 0, self.fade_alpha))
+                fade_surface.fill((0, 0, 0, int(fade_alpha)))
                 self.screen.blit(fade_surface, (0, 0))
 
-            pygame.display.flip()
-        except Exception as e:
-            print(f"Error en método draw(): {e}")
-            import traceback
-
-            traceback.print_exc()
+            profiler.present()
+        except Exception:
+            log.exception("Error en método draw()")
 
     def draw_fancy_button(self, x, y, text, color, width=150, height=40, enabled=True):
         """Dibuja un botón decorativo con efectos visuales"""
@@ -690,7 +725,7 @@ class Tutorial:
 
             return button_rect
         except Exception as e:
-            print(f"Error dibujando botón: {e}")
+            log.warning("Error dibujando botón", error=str(e))
             # Devolver un rectángulo vacío en caso de error
             return pygame.Rect(x, y, width, height)
 
@@ -699,31 +734,34 @@ class Tutorial:
         try:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    print("Evento QUIT detectado")
+                    log.debug("Evento QUIT detectado")
                     self.running = False
                     return "QUIT"
 
+                if profiler.handle_event(event):
+                    continue
+
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        print("ESC presionado - volviendo al menú")
+                        log.debug("ESC presionado - volviendo al menú")
                         return "BACK"
 
                     elif event.key == pygame.K_LEFT and not self.transitioning:
                         if self.current_step > 0:
-                            print(f"Cambiando al paso anterior: {self.current_step-1}")
+                            log.debug("Cambiando al paso anterior", step=self.current_step - 1)
                             self.change_step(self.current_step - 1)
 
                     elif event.key == pygame.K_RIGHT and not self.transitioning:
                         if self.current_step < self.max_steps - 1:
-                            print(f"Cambiando al siguiente paso: {self.current_step+1}")
+                            log.debug("Cambiando al siguiente paso", step=self.current_step + 1)
                             self.change_step(self.current_step + 1)
                         else:
-                            print("Último paso - iniciando juego")
+                            log.debug("Último paso - iniciando juego")
                             return "PLAY"  # Último paso, comenzar el juego
 
                     elif event.key == pygame.K_RETURN and not self.transitioning:
                         if self.current_step == self.max_steps - 1:
-                            print("ENTER presionado en último paso - iniciando juego")
+                            log.debug("ENTER presionado en último paso - iniciando juego")
                             return "PLAY"  # Último paso, comenzar el juego
 
                 # Clic en botones
@@ -733,64 +771,65 @@ class Tutorial:
                     # Verificar botón anterior
                     prev_rect = pygame.Rect(100, self.height - 80, 150, 40)
                     if prev_rect.collidepoint(mouse_pos) and self.current_step > 0:
-                        print(
-                            f"Clic en 'Anterior' - cambiando al paso {self.current_step-1}"
-                        )
+                        log.debug("Clic en 'Anterior'", step=self.current_step - 1)
                         self.change_step(self.current_step - 1)
 
                     # Verificar botón siguiente/comenzar
                     next_rect = pygame.Rect(self.width - 250, self.height - 80, 150, 40)
                     if next_rect.collidepoint(mouse_pos):
                         if self.current_step < self.max_steps - 1:
-                            print(
-                                f"Clic en 'Siguiente' - cambiando al paso {self.current_step+1}"
-                            )
+                            log.debug("Clic en 'Siguiente'", step=self.current_step + 1)
                             self.change_step(self.current_step + 1)
                         else:
-                            print("Clic en 'Comenzar' - iniciando juego")
+                            log.debug("Clic en 'Comenzar' - iniciando juego")
                             return "PLAY"  # Último paso, comenzar el juego
 
-            # Actualizar animaciones
-            change_complete = self.update_animations()
-
-            # Si la transición de fade out terminó, aplicar el cambio
-            if change_complete and hasattr(self, "next_step"):
-                print(f"Transición completa - cambiando al paso {self.next_step}")
-                self.current_step = self.next_step
-                del self.next_step
-                self.start_transition(-1)  # Iniciar fade in
-
             return None
-        except Exception as e:
-            print(f"Error en handle_events: {e}")
-            import traceback
-
-            traceback.print_exc()
+        except Exception:
+            log.exception("Error en handle_events")
             return None
 
+    def update(self):
+        """Un paso de simulación: animaciones y fin de las transiciones"""
+        change_complete = self.update_animations()
+
+        # Si la transición de fade out terminó, aplicar el cambio
+        if change_complete and hasattr(self, "next_step"):
+            log.debug("Transición completa", step=self.next_step)
+            self.current_step = self.next_step
+            del self.next_step
+            self.start_transition(-1)  # Iniciar fade in
+
     def run(self):
         """Ejecuta el bucle principal del tutorial"""
         try:
-            print("Iniciando tutorial de Tavern AI...")
+            log.debug("Iniciando tutorial de Tavern AI")
             # Iniciar con un fade in
             self.start_transition(-1)
 
+            # Animaciones a paso fijo; el render al ritmo configurado
+            from src.menu import get_config
+
+            loop = FixedTimestep(fps=render_fps(get_config()), clock=self.clock)
             while self.running:
-                self.clock.tick(60)
+                steps = loop.advance()
 
-                result = self.handle_events()
+                with profiler.scope("events"):
+                    result = self.handle_events()
                 if result:
-                    print(f"Tutorial terminado con resultado: {result}")
+                    log.debug("Tutorial terminado", result=result)
                     return result
 
-                self.draw()
+                with profiler.scope("update"):
+                    for _ in range(steps):
+                        self.update()
 
-            print("Bucle del tutorial finalizado - retornando a MENU")
-            return "BACK"
+                with profiler.scope("draw"):
+                    self.draw(loop.alpha)
 
-        except Exception as e:
-            print(f"Error fatal en tutorial: {e}")
-            import traceback
+            log.debug("Bucle del tutorial finalizado - retornando a MENU")
+            return "BACK"
 
-            traceback.print_exc()
+        except Exception:
+            log.exception("Error fatal en tutorial")
             return "BACK"  # En caso de error, volver al menú
@@ -3,6 +3,9 @@ import random
 import pygame.font
 import math
 
+from src.utils.profiler import profiler
+from src.utils.pacing import FixedTimestep, lerp, render_fps, wait_for_key
+
 # Inicializar fuentes
 pygame.font.init()
 font_small = pygame.font.SysFont("Arial", 16)
@@ -114,6 +117,151 @@ def draw_status_effects(screen, character, x, y):
         screen.blit(effect_name, (x, y + 15))
 
 
+# Disposición de los enemigos: columna para combates normales
+ENEMY_COLUMN_X = 500
+ENEMY_COLUMN_Y = 150
+ENEMY_COLUMN_SPACING = 160
+ENEMY_SPRITE = 80
+
+# Modo de batalla grande: rejilla que se desplaza por filas y solo dibuja lo visible
+GRID_LEFT, GRID_TOP = 310, 40
+GRID_CELL_W, GRID_CELL_H = 48, 58
+GRID_SPRITE = 36
+GRID_BOTTOM_MARGIN = 170  # Espacio del registro de mensajes
+PANEL_WIDTH = 350
+
+# Sprites reducidos para la rejilla: id(imagen) -> (imagen, reducida)
+_grid_images = {}
+
+
+def grid_shape(screen_size):
+    """Columnas y filas visibles de la rejilla de enemigos"""
+    width, height = screen_size
+    columns = max(1, (width - PANEL_WIDTH - 10 - GRID_LEFT) // GRID_CELL_W)
+    rows = max(1, (height - GRID_BOTTOM_MARGIN - GRID_TOP) // GRID_CELL_H)
+    return columns, rows
+
+
+def clamp_enemy_scroll(game_state, screen_size):
+    columns, rows = grid_shape(screen_size)
+    total_rows = -(-len(game_state.enemies) // columns)
+    game_state.enemy_scroll = max(0, min(game_state.enemy_scroll, total_rows - rows))
+    return columns, rows
+
+
+def scroll_enemies(game_state, delta_rows, screen_size):
+    """Desplaza la rejilla de enemigos `delta_rows` filas"""
+    game_state.enemy_scroll += delta_rows
+    clamp_enemy_scroll(game_state, screen_size)
+
+
+def ensure_enemy_visible(game_state, index, screen_size):
+    """Desplaza la rejilla lo justo para que se vea el enemigo `index`"""
+    if not game_state.is_large_battle():
+        return
+    columns, rows = grid_shape(screen_size)
+    row = index // columns
+    if row < game_state.enemy_scroll:
+        game_state.enemy_scroll = row
+    elif row >= game_state.enemy_scroll + rows:
+        game_state.enemy_scroll = row - rows + 1
+    clamp_enemy_scroll(game_state, screen_size)
+
+
+def visible_enemies(game_state, screen_size):
+    """Rango de índices de enemigos que caben en pantalla"""
+    if not game_state.is_large_battle():
+        return range(len(game_state.enemies))
+    columns, rows = clamp_enemy_scroll(game_state, screen_size)
+    start = game_state.enemy_scroll * columns
+    return range(start, min(len(game_state.enemies), start + rows * columns))
+
+
+def enemy_position(game_state, index, screen_size):
+    """Esquina superior izquierda del sprite del enemigo `index`"""
+    if not game_state.is_large_battle():
+        return ENEMY_COLUMN_X, ENEMY_COLUMN_Y + index * ENEMY_COLUMN_SPACING
+    columns, _ = grid_shape(screen_size)
+    row, column = divmod(index, columns)
+    return (
+        GRID_LEFT + column * GRID_CELL_W,
+        GRID_TOP + (row - game_state.enemy_scroll) * GRID_CELL_H,
+    )
+
+
+def enemy_center(game_state, index, screen_size):
+    """Centro del sprite del enemigo; en la rejilla, recortado a la zona visible"""
+    x, y = enemy_position(game_state, index, screen_size)
+    if not game_state.is_large_battle():
+        return x + ENEMY_SPRITE // 2, y + ENEMY_SPRITE // 2
+    _, rows = grid_shape(screen_size)
+    y = max(GRID_TOP, min(y, GRID_TOP + (rows - 1) * GRID_CELL_H))
+    return x + GRID_SPRITE // 2, y + GRID_SPRITE // 2
+
+
+def enemy_at(game_state, pos, screen_size):
+    """Índice del enemigo bajo un punto de la pantalla, o None"""
+    px, py = pos
+    if not game_state.is_large_battle():
+        for i in range(len(game_state.enemies)):
+            x, y = enemy_position(game_state, i, screen_size)
+            if x <= px < x + ENEMY_SPRITE and y <= py < y + ENEMY_SPRITE:
+                return i
+        return None
+
+    columns, rows = clamp_enemy_scroll(game_state, screen_size)
+    column = (px - GRID_LEFT) // GRID_CELL_W
+    row = (py - GRID_TOP) // GRID_CELL_H
+    if not (0 <= column < columns and 0 <= row < rows):
+        return None
+    index = (row + game_state.enemy_scroll) * columns + column
+    return index if index < len(game_state.enemies) else None
+
+
+def _grid_image(image):
+    cached = _grid_images.get(id(image))
+    if cached is None or cached[0] is not image:
+        cached = (image, pygame.transform.scale(image, (GRID_SPRITE, GRID_SPRITE)))
+        _grid_images[id(image)] = cached
+    return cached[1]
+
+
+def draw_enemy_grid(screen, game_state):
+    """Enemigos de una batalla grande: solo las filas visibles, sin nombres ni ataques"""
+    size = screen.get_size()
+    visible = visible_enemies(game_state, size)
+
+    for i in visible:
+        enemy = game_state.enemies[i]
+        x, y = enemy_position(game_state, i, size)
+
+        if enemy.image:
+            screen.blit(_grid_image(enemy.image), (x, y))
+        else:
+            pygame.draw.rect(screen, COLORS["RED"], (x, y, GRID_SPRITE, GRID_SPRITE))
+
+        if i == game_state.selected_enemy:
+            pygame.draw.rect(
+                screen, COLORS["GOLD"], (x - 3, y - 3, GRID_SPRITE + 6, GRID_SPRITE + 6), 2
+            )
+
+        draw_health_bar(
+            screen, x, y + GRID_SPRITE + 3, enemy.health, enemy.max_health, GRID_SPRITE, 5
+        )
+
+        # Un punto por personaje con efectos activos
+        if enemy.status_effects:
+            pygame.draw.circle(screen, COLORS["PURPLE"], (x + GRID_SPRITE - 3, y + 3), 4)
+
+    header = font_small.render(
+        f"Enemigos {visible.start + 1}-{visible.stop} de {len(game_state.enemies)}"
+        "  (RePág/AvPág o rueda)",
+        True,
+        COLORS["WHITE"],
+    )
+    screen.blit(header, (GRID_LEFT, 12))
+
+
 def draw_characters(screen, game_state):
     """Dibuja los personajes en pantalla con efectos de estado visibles"""
     # Dibujar jugador
@@ -171,11 +319,15 @@ def draw_characters(screen, game_state):
         # Mostrar efectos de estado del aliado
         draw_status_effects(screen, game_state.ally, ally_x, ally_y + 85)
 
+    # Batallas grandes: rejilla con desplazamiento
+    if game_state.is_large_battle():
+        draw_enemy_grid(screen, game_state)
+        return
+
     # Dibujar enemigos - EN VERTICAL
     for i, enemy in enumerate(game_state.enemies):
         # Posición para alineación vertical
-        x = 500
-        y = 150 + i * 160  # Mayor espaciado vertical entre enemigos
+        x, y = enemy_position(game_state, i, screen.get_size())
 
         if hasattr(enemy, "image") and enemy.image:
             screen.blit(enemy.image, (x, y))
@@ -355,302 +507,289 @@ def draw_combat_ui(screen, game_state, colors=COLORS):
     draw_clear_messages_button(screen)
 
 
+# Duración de las fases de la animación de ataque, en pasos de SIM_HZ
+EFFECT_MARK_STEPS = 42  # Líneas de origen y destino (700 ms)
+EFFECT_PROJECTILE_STEPS = 20  # Proyectil de origen a destino
+EFFECT_FLASH_STEPS = 5  # Cada destello (o pausa) sobre el objetivo
+EFFECT_HEAL_STEPS = 54  # Brillo de curación
+EFFECT_NUMBER_STEPS = 27  # Número de daño flotante
+
+ATTACK_COLORS = {
+    "physical": COLORS["RED"],
+    "magic": COLORS["BLUE"],
+    "holy": COLORS["GOLD"],
+    "veneno": (0, 180, 0),  # Verde para veneno
+    "sangrado": (220, 0, 0),  # Rojo intenso para sangrado
+    "congelado": (0, 200, 255),  # Azul cian para congelado
+    "fuego": (255, 128, 0),  # Naranja para fuego
+    "debilitar": (150, 150, 150),  # Gris para debilitar
+    "bendición": (255, 215, 0),  # Dorado para bendición
+    "fire": (255, 128, 0),
+    "ice": (0, 255, 255),
+    "healing": (50, 255, 50),
+}
+
+
 def show_attack_effect(
     screen, attacker, defender, attack_name, damage, attack_type="physical"
 ):
     """
     Muestra un efecto visual para el ataque con líneas claras de origen a destino
-    """
-    # Mantener una copia del estado original de la pantalla para restaurar después
-    original_screen = screen.copy()
 
-    # CORREGIR POSICIONES - usar exactamente las mismas que en draw_characters
-    # Jugador siempre en posición fija (centro del sprite)
-    player_x, player_y = 100, 300
-    player_center = (player_x + 40, player_y + 40)  # Centro del sprite de 80x80
-
-    # Aliado siempre en posición fija
-    ally_x, ally_y = 200, 300
-    ally_center = (ally_x + 40, ally_y + 40)  # Centro del sprite de 80x80
-
-    # Calcular posiciones de enemigos exactamente igual que en draw_characters
-    enemy_positions = []
-    if hasattr(attacker, "game_state") and attacker.game_state:
-        for i in range(len(attacker.game_state.enemies)):
-            x = 500  # Misma posición X que en draw_characters
-            y = 150 + i * 160  # Mismo espaciado que en draw_characters
-            enemy_positions.append((x + 40, y + 40))  # Centro del sprite
-
-    # Determinar posición del atacante
-    if attacker.type.name == "PLAYER":
-        attacker_pos = player_center
-    elif attacker.type.name == "ALLY":
-        attacker_pos = ally_center
-    else:
-        # Para enemigos, buscar su índice en la lista de enemigos
-        if hasattr(attacker, "game_state") and attacker.game_state:
-            enemy_index = next(
-                (i for i, e in enumerate(attacker.game_state.enemies) if e == attacker),
-                0,
-            )
-            if enemy_index < len(enemy_positions):
-                attacker_pos = enemy_positions[enemy_index]
-            else:
-                attacker_pos = (540, 190)  # Fallback
-        else:
-            attacker_pos = (540, 190)  # Fallback
+    La animación avanza en pasos fijos (FixedTimestep) y el render interpola
+    entre ellos, como los menús y el tutorial: dura lo mismo a cualquier fps.
+    """
+    from src.menu import get_config
+
+    with profiler.scope("effects"):
+        effect = AttackEffect(screen, attacker, defender, attack_name, damage, attack_type)
+        background = screen.copy()
+        loop = FixedTimestep(fps=render_fps(get_config()))
+        while not effect.done:
+            # Mantener la ventana viva sin consumir la entrada del jugador
+            pygame.event.pump()
+            for _ in range(loop.advance()):
+                effect.update()
+            screen.blit(background, (0, 0))
+            effect.draw(screen, loop.alpha)
+            profiler.present()
+        screen.blit(background, (0, 0))
+
+
+class AttackEffect:
+    """
+    Animación de un ataque: marcas de origen y destino, proyectil, efecto en el
+    objetivo y número flotante. `update` avanza un paso y `draw` dibuja el
+    instante entre el paso anterior y el actual.
+    """
 
-    # Determinar posición del defensor
-    if defender.type.name == "PLAYER":
-        defender_pos = player_center
-    elif defender.type.name == "ALLY":
-        defender_pos = ally_center
-    else:
-        # Para enemigos, buscar su índice
-        if hasattr(defender, "game_state") and defender.game_state:
-            enemy_index = next(
-                (i for i, e in enumerate(defender.game_state.enemies) if e == defender),
-                0,
-            )
-            if enemy_index < len(enemy_positions):
-                defender_pos = enemy_positions[enemy_index]
-            else:
-                defender_pos = (540, 190)  # Fallback
-        else:
-            defender_pos = (540, 190)  # Fallback
-
-    # Colores para diferentes tipos de ataque
-    attack_colors = {
-        "physical": COLORS["RED"],
-        "magic": COLORS["BLUE"],
-        "holy": COLORS["GOLD"],
-        "veneno": (0, 180, 0),  # Verde para veneno
-        "sangrado": (220, 0, 0),  # Rojo intenso para sangrado
-        "congelado": (0, 200, 255),  # Azul cian para congelado
-        "fuego": (255, 128, 0),  # Naranja para fuego
-        "debilitar": (150, 150, 150),  # Gris para debilitar
-        "bendición": (255, 215, 0),  # Dorado para bendición
-        "fire": (255, 128, 0),
-        "ice": (0, 255, 255),
-        "healing": (50, 255, 50),
-    }
+    def __init__(self, screen, attacker, defender, attack_name, damage, attack_type):
+        self.attack_name = attack_name
+        self.damage = damage
+        self.attack_type = attack_type
+        self.curved = attacker.type.name == "ALLY"
+        # Azar propio: las partículas no consumen las tiradas del juego
+        self.rng = random.Random()
 
-    # Determinar si el ataque tiene un efecto de estado
-    effect_color = None
-    if hasattr(attacker, "attacks") and attack_name in attacker.attacks:
-        attack_stats = attacker.attacks[attack_name]
-        if "effect" in attack_stats:
-            effect_name = attack_stats["effect"]
-            if effect_name in attack_colors:
-                effect_color = attack_colors[effect_name]
-
-    # Determinar si es curación en lugar de ataque
-    is_healing = "heal" in attack_name.lower() or damage < 0
-
-    # Color del efecto (prioridad al efecto sobre el tipo de ataque)
-    if effect_color:
-        color = effect_color
-    elif is_healing:
-        color = attack_colors["healing"]
-    else:
-        color = attack_colors.get(attack_type, COLORS["WHITE"])
+        # CORREGIR POSICIONES - usar exactamente las mismas que en draw_characters
+        # Jugador siempre en posición fija (centro del sprite)
+        player_x, player_y = 100, 300
+        player_center = (player_x + 40, player_y + 40)  # Centro del sprite de 80x80
 
-    # 1. LÍNEAS DE ATAQUE MEJORADAS - Mostrar claramente origen y destino
-    # ¡IMPORTANTE! - Dibujar directamente en la pantalla original en lugar de en una copia
+        # Aliado siempre en posición fija
+        ally_x, ally_y = 200, 300
+        ally_center = (ally_x + 40, ally_y + 40)  # Centro del sprite de 80x80
+
+        # Posiciones de enemigos con la misma disposición que draw_characters
+        # (índice en O(1) gracias al mapa del estado del juego)
+        def character_center(character):
+            if character.type.name == "PLAYER":
+                return player_center
+            if character.type.name == "ALLY":
+                return ally_center
+            game_state = getattr(character, "game_state", None)
+            index = game_state.enemy_index(character) if game_state else None
+            if index is None:
+                return (540, 190)  # Fallback
+            return enemy_center(game_state, index, screen.get_size())
+
+        # Determinar posición del atacante y del defensor
+        self.attacker_pos = character_center(attacker)
+        self.defender_pos = character_center(defender)
+
+        # Determinar si el ataque tiene un efecto de estado
+        self.effect_color = None
+        if hasattr(attacker, "attacks") and attack_name in attacker.attacks:
+            attack_stats = attacker.attacks[attack_name]
+            if "effect" in attack_stats:
+                effect_name = attack_stats["effect"]
+                if effect_name in ATTACK_COLORS:
+                    self.effect_color = ATTACK_COLORS[effect_name]
+
+        # Determinar si es curación en lugar de ataque
+        self.is_healing = "heal" in attack_name.lower() or damage < 0
+
+        # Color del efecto (prioridad al efecto sobre el tipo de ataque)
+        if self.effect_color:
+            self.color = self.effect_color
+        elif self.is_healing:
+            self.color = ATTACK_COLORS["healing"]
+        else:
+            self.color = ATTACK_COLORS.get(attack_type, COLORS["WHITE"])
 
-    # Dibujar marcador circular en posición del atacante - MÁS GRANDE Y VISIBLE
-    pygame.draw.circle(screen, color, attacker_pos, 15, 3)  # Más grande y más grueso
-    atk_text = font_small.render("ORIGEN", True, color)
-    screen.blit(
-        atk_text, (attacker_pos[0] - atk_text.get_width() // 2, attacker_pos[1] - 25)
-    )
+        # Trayectoria: curva Bezier cuadrática para aliados, recta para el resto
+        self.control_point = (
+            (self.attacker_pos[0] + self.defender_pos[0]) // 2,
+            min(self.attacker_pos[1], self.defender_pos[1]) - 50,
+        )
+        self.points = [self._path(t / 20) for t in range(0, 21)]
+        dx = self.defender_pos[0] - self.attacker_pos[0]
+        dy = self.defender_pos[1] - self.attacker_pos[1]
+        self.dist = max(1, (dx**2 + dy**2) ** 0.5)
+        self.direction = (dx / self.dist, dy / self.dist)
+
+        # Texto de acción - MÁS GRANDE Y CONTRASTANTE
+        action_text = "CURA" if self.is_healing else attack_name.upper()
+        self.action_text = font_medium.render(action_text, True, self.color)
+        text_color = COLORS["GREEN"] if self.is_healing else COLORS["RED"]
+        self.damage_text = font_medium.render(
+            f"+{abs(damage)}" if self.is_healing else f"-{damage}", True, text_color
+        )
 
-    # Dibujar marcador en posición del defensor - MÁS GRANDE Y VISIBLE
-    pygame.draw.circle(screen, color, defender_pos, 15, 3)  # Más grande y más grueso
-    def_text = font_small.render("DESTINO", True, color)
-    screen.blit(
-        def_text, (defender_pos[0] - def_text.get_width() // 2, defender_pos[1] - 25)
-    )
+        impact_steps = EFFECT_HEAL_STEPS if self.is_healing else EFFECT_FLASH_STEPS * 6
+        # Fases en orden: (nombre, pasos)
+        self.phases = (
+            ("mark", EFFECT_MARK_STEPS),
+            ("projectile", EFFECT_PROJECTILE_STEPS),
+            ("impact", impact_steps),
+            ("number", EFFECT_NUMBER_STEPS),
+        )
+        self.total_steps = sum(steps for _, steps in self.phases)
+        self.step = self.prev_step = 0
+
+    @property
+    def done(self):
+        return self.step >= self.total_steps
+
+    def update(self):
+        self.prev_step = self.step
+        self.step = min(self.step + 1, self.total_steps)
+
+    def _path(self, t):
+        """Punto de la trayectoria en t (0 = atacante, 1 = defensor)"""
+        (ax, ay), (bx, by) = self.attacker_pos, self.defender_pos
+        if self.curved:
+            cx, cy = self.control_point
+            x = (1 - t) ** 2 * ax + 2 * (1 - t) * t * cx + t**2 * bx
+            y = (1 - t) ** 2 * ay + 2 * (1 - t) * t * cy + t**2 * by
+            return (int(x), int(y))
+        return (ax + (bx - ax) * t, ay + (by - ay) * t)
+
+    def draw(self, screen, alpha=1.0):
+        # Paso interpolado y fase en la que cae
+        position = min(lerp(self.prev_step, self.step, alpha), self.total_steps - 1e-6)
+        for phase, steps in self.phases:
+            if position < steps:
+                break
+            position -= steps
+        progress = position / steps
+
+        if phase == "mark":
+            self._draw_marks(screen)
+        elif phase == "projectile":
+            self._draw_projectile(screen, progress)
+        elif phase == "impact":
+            self._draw_impact(screen, position)
+        else:
+            self._draw_number(screen, progress)
+
+    def _draw_marks(self, screen):
+        """1. Líneas de ataque - mostrar claramente origen y destino"""
+        color = self.color
+        attacker_pos, defender_pos = self.attacker_pos, self.defender_pos
+
+        # Dibujar marcador circular en posición del atacante - MÁS GRANDE Y VISIBLE
+        pygame.draw.circle(screen, color, attacker_pos, 15, 3)
+        atk_text = font_small.render("ORIGEN", True, color)
+        screen.blit(
+            atk_text, (attacker_pos[0] - atk_text.get_width() // 2, attacker_pos[1] - 25)
+        )
 
-    # Línea de ataque - diferente según tipo de personaje - MÁS ANCHA
-    if attacker.type.name == "ALLY":
-        # Para aliados, dibujar una curva en lugar de una línea recta
-        control_point = (
-            (attacker_pos[0] + defender_pos[0]) // 2,
-            min(attacker_pos[1], defender_pos[1]) - 50,
+        # Dibujar marcador en posición del defensor - MÁS GRANDE Y VISIBLE
+        pygame.draw.circle(screen, color, defender_pos, 15, 3)
+        def_text = font_small.render("DESTINO", True, color)
+        screen.blit(
+            def_text, (defender_pos[0] - def_text.get_width() // 2, defender_pos[1] - 25)
         )
 
-        # Dibujar curva con múltiples líneas (aproximación)
-        points = []
-        for t in range(0, 21):  # Más puntos para una curva más suave
-            t = t / 20
-            # Fórmula de curva Bezier cuadrática
-            x = (
-                (1 - t) ** 2 * attacker_pos[0]
-                + 2 * (1 - t) * t * control_point[0]
-                + t**2 * defender_pos[0]
-            )
-            y = (
-                (1 - t) ** 2 * attacker_pos[1]
-                + 2 * (1 - t) * t * control_point[1]
-                + t**2 * defender_pos[1]
-            )
-            points.append((int(x), int(y)))
-
-        # Dibujar línea de la curva - MÁS ANCHA
-        for i in range(len(points) - 1):
-            pygame.draw.line(
-                screen, color, points[i], points[i + 1], 4
-            )  # Línea más ancha
-
-        # Flechas a lo largo de la curva para indicar dirección - MÁS GRANDES
-        for i in range(1, len(points), 5):
-            if i < len(points) - 1:
-                # Calcular dirección de la flecha
+        # Línea de ataque - diferente según tipo de personaje - MÁS ANCHA
+        if self.curved:
+            points = self.points
+            for i in range(len(points) - 1):
+                pygame.draw.line(screen, color, points[i], points[i + 1], 4)
+
+            # Flechas a lo largo de la curva para indicar dirección - MÁS GRANDES
+            for i in range(1, len(points) - 1, 5):
                 dx = points[i + 1][0] - points[i - 1][0]
                 dy = points[i + 1][1] - points[i - 1][1]
-                # Normalizar
                 length = max(1, (dx**2 + dy**2) ** 0.5)
-                dx, dy = dx / length * 12, dy / length * 12  # Flechas más grandes
+                dx, dy = dx / length * 12, dy / length * 12
 
                 # Dibujar flecha perpendicular a la dirección
                 pygame.draw.line(
-                    screen,  # Dibujar en la pantalla original
+                    screen,
                     color,
                     (points[i][0] - dy, points[i][1] + dx),
                     (points[i][0] + dy, points[i][1] - dx),
-                    3,  # Línea más ancha
+                    3,
                 )
-    else:
-        # Para otros personajes, línea recta con flechas direccionales - MÁS ANCHA
-        pygame.draw.line(
-            screen, color, attacker_pos, defender_pos, 4
-        )  # Línea más ancha
-
-        # Añadir flechas a lo largo de la línea para mostrar dirección - MÁS GRANDES
-        dx = defender_pos[0] - attacker_pos[0]
-        dy = defender_pos[1] - attacker_pos[1]
-        dist = max(1, (dx**2 + dy**2) ** 0.5)
-        dx, dy = dx / dist, dy / dist
-
-        # Dibujar 3 flechas a lo largo de la línea
-        for i in range(1, 4):
-            point_x = attacker_pos[0] + dx * dist * i / 4
-            point_y = attacker_pos[1] + dy * dist * i / 4
-
-            # Flecha perpendicular a la dirección - MÁS GRANDE
-            perp_x, perp_y = -dy * 12, dx * 12  # Flechas más grandes
-            pygame.draw.line(
-                screen,  # Dibujar en la pantalla original
-                color,
-                (point_x - perp_x, point_y - perp_y),
-                (point_x + perp_x, point_y + perp_y),
-                3,  # Línea más ancha
-            )
-
-    # Texto de acción - MÁS GRANDE Y CONTRASTANTE
-    action_text = "CURA" if is_healing else attack_name.upper()
-    target_text = font_medium.render(
-        action_text, True, color
-    )  # Usar fuente medium en lugar de small
-    arrow_pos = (
-        (attacker_pos[0] + defender_pos[0]) // 2,
-        (attacker_pos[1] + defender_pos[1]) // 2,
-    )
-
-    # Agregar un fondo para que el texto sea más legible
-    text_bg = pygame.Surface(
-        (target_text.get_width() + 10, target_text.get_height() + 10), pygame.SRCALPHA
-    )
-    text_bg.fill((0, 0, 0, 150))  # Fondo semi-transparente
-    screen.blit(
-        text_bg,
-        (arrow_pos[0] - target_text.get_width() // 2 - 5, arrow_pos[1] - 20 - 5),
-    )
+        else:
+            pygame.draw.line(screen, color, attacker_pos, defender_pos, 4)
 
-    screen.blit(
-        target_text, (arrow_pos[0] - target_text.get_width() // 2, arrow_pos[1] - 20)
-    )
+            # Dibujar 3 flechas a lo largo de la línea
+            dx, dy = self.direction
+            for i in range(1, 4):
+                point_x = attacker_pos[0] + dx * self.dist * i / 4
+                point_y = attacker_pos[1] + dy * self.dist * i / 4
 
-    # IMPORTANTE: Actualizar la pantalla y dar tiempo para ver las líneas
-    pygame.display.flip()
-    pygame.time.delay(700)  # Dar más tiempo para ver las líneas (700ms)
-
-    # Continuar con el resto de la función...
-    # Usar original_screen para restaurar el estado normal para las animaciones
-
-    # 2. ANIMACIÓN DE PROYECTIL MEJORADA
-    steps = 15
-    for i in range(steps + 1):
-        # Importante: Restaurar la pantalla original antes de añadir cada frame de animación
-        screen.blit(original_screen, (0, 0))
-
-        # Posición interpolada para el proyectil
-        if attacker.type.name == "ALLY":
-            progress = i / steps
-            # Usar la misma curva Bezier
-            t = progress
-            x = (
-                (1 - t) ** 2 * attacker_pos[0]
-                + 2 * (1 - t) * t * control_point[0]
-                + t**2 * defender_pos[0]
-            )
-            y = (
-                (1 - t) ** 2 * attacker_pos[1]
-                + 2 * (1 - t) * t * control_point[1]
-                + t**2 * defender_pos[1]
-            )
-        else:
-            # Interpolación lineal para otros
-            progress = i / steps
-            x = attacker_pos[0] + (defender_pos[0] - attacker_pos[0]) * progress
-            y = attacker_pos[1] + (defender_pos[1] - attacker_pos[1]) * progress
-
-        # También dibujar una línea atenuada para mostrar la trayectoria
-        if attacker.type.name == "ALLY":
-            # Dibujar la curva con menor opacidad
-            for j in range(len(points) - 1):
+                # Flecha perpendicular a la dirección - MÁS GRANDE
+                perp_x, perp_y = -dy * 12, dx * 12
                 pygame.draw.line(
                     screen,
-                    (color[0], color[1], color[2], 100),
-                    points[j],
-                    points[j + 1],
-                    2,
+                    color,
+                    (point_x - perp_x, point_y - perp_y),
+                    (point_x + perp_x, point_y + perp_y),
+                    3,
                 )
+
+        # Texto de acción con fondo para que sea más legible
+        text = self.action_text
+        arrow_pos = (
+            (attacker_pos[0] + defender_pos[0]) // 2,
+            (attacker_pos[1] + defender_pos[1]) // 2,
+        )
+        text_bg = pygame.Surface(
+            (text.get_width() + 10, text.get_height() + 10), pygame.SRCALPHA
+        )
+        text_bg.fill((0, 0, 0, 150))  # Fondo semi-transparente
+        screen.blit(text_bg, (arrow_pos[0] - text.get_width() // 2 - 5, arrow_pos[1] - 25))
+        screen.blit(text, (arrow_pos[0] - text.get_width() // 2, arrow_pos[1] - 20))
+
+    def _draw_projectile(self, screen, progress):
+        """2. Animación del proyectil, con la trayectoria atenuada"""
+        color = self.color
+        rng = self.rng
+        name = self.attack_name.lower()
+        x, y = self._path(progress)
+
+        if self.curved:
+            for j in range(len(self.points) - 1):
+                pygame.draw.line(screen, color, self.points[j], self.points[j + 1], 2)
         else:
-            # Dibujar línea recta con menor opacidad
-            lighter_color = (color[0], color[1], color[2], 100)
-            s = pygame.Surface(
-                (screen.get_width(), screen.get_height()), pygame.SRCALPHA
-            )
-            pygame.draw.line(s, lighter_color, attacker_pos, defender_pos, 2)
-            screen.blit(s, (0, 0))
+            # Línea recta con menor opacidad
+            lighter = (color[0] // 2, color[1] // 2, color[2] // 2)
+            pygame.draw.line(screen, lighter, self.attacker_pos, self.defender_pos, 2)
 
         # Dibujar proyectil según tipo de ataque/efecto
-        if is_healing:
+        if self.is_healing:
             # Proyectil de curación con partículas
-            pygame.draw.circle(screen, attack_colors["healing"], (int(x), int(y)), 8)
+            pygame.draw.circle(screen, ATTACK_COLORS["healing"], (int(x), int(y)), 8)
             for _ in range(4):
-                offset_x = random.randint(-10, 10)
-                offset_y = random.randint(-10, 10)
+                offset_x = rng.randint(-10, 10)
+                offset_y = rng.randint(-10, 10)
                 pygame.draw.circle(
-                    screen,
-                    (200, 255, 200),
-                    (int(x + offset_x), int(y + offset_y)),
-                    2,
+                    screen, (200, 255, 200), (int(x + offset_x), int(y + offset_y)), 2
                 )
-        elif effect_color:
-            # Proyectil con efecto especial (resto igual que antes)
-            # ...código existente para efectos especiales...
-            if "veneno" in attack_name.lower() or "espinas" in attack_name.lower():
+        elif self.effect_color:
+            if "veneno" in name or "espinas" in name:
                 # Veneno: múltiples partículas verdes
-                for j in range(5):
-                    offset_x = random.randint(-8, 8)
-                    offset_y = random.randint(-8, 8)
+                for _ in range(5):
+                    offset_x = rng.randint(-8, 8)
+                    offset_y = rng.randint(-8, 8)
                     pygame.draw.circle(
                         screen, color, (int(x + offset_x), int(y + offset_y)), 4
                     )
-            elif "congelado" in attack_name.lower() or "hielo" in attack_name.lower():
+            elif "congelado" in name or "hielo" in name:
                 # Congelado: copos de hielo
                 pygame.draw.circle(screen, color, (int(x), int(y)), 6)
                 for angle in range(0, 360, 60):
@@ -658,7 +797,7 @@ def show_attack_effect(
                     ice_x = x + 8 * math.cos(rad)
                     ice_y = y + 8 * math.sin(rad)
                     pygame.draw.circle(screen, color, (int(ice_x), int(ice_y)), 2)
-            elif "sangrado" in attack_name.lower():
+            elif "sangrado" in name:
                 # Sangrado: gotas rojas
                 pygame.draw.circle(screen, color, (int(x), int(y)), 6)
                 pygame.draw.polygon(
@@ -673,13 +812,12 @@ def show_attack_effect(
             else:
                 # Efecto genérico
                 pygame.draw.circle(screen, color, (int(x), int(y)), 8)
-        elif attack_type == "physical":
-            # Resto del código para tipos de ataque...
+        elif self.attack_type == "physical":
             # Ataques físicos: línea/trazo
-            start_x = x - dx * 15
-            start_y = y - dy * 15
-            pygame.draw.line(screen, color, (start_x, start_y), (int(x), int(y)), 3)
-        elif attack_type == "magic":
+            dx, dy = self.direction
+            start = (x - dx * 15, y - dy * 15)
+            pygame.draw.line(screen, color, start, (int(x), int(y)), 3)
+        elif self.attack_type == "magic":
             # Magia: círculos concéntricos
             pygame.draw.circle(screen, color, (int(x), int(y)), 8)
             pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), 4)
@@ -687,66 +825,36 @@ def show_attack_effect(
             # Ataque genérico
             pygame.draw.circle(screen, color, (int(x), int(y)), 8)
 
-        # Actualizar pantalla
-        pygame.display.flip()
-        pygame.time.delay(20)
-
-    # Continuar con el resto de la función igual que antes
-    # Restaurar la pantalla original antes de efectos adicionales
-    screen.blit(original_screen, (0, 0))
-
-    # 3 y 4. EFECTOS FINALES DE DAÑO/CURACIÓN
-    # ... resto de la función sin cambios ...
-
-    # 3. EFECTO EN EL OBJETIVO MEJORADO
-    if is_healing:
-        # Efecto de curación: brillo verde
-        for _ in range(3):
-            for i in range(10):
-                screen_copy = screen.copy()
-                for j in range(5):
-                    offset_x = random.randint(-30, 30)
-                    particle_y = defender_pos[1] - i * 5 - 10
-                    pygame.draw.circle(
-                        screen_copy,
-                        attack_colors["healing"],
-                        (defender_pos[0] + offset_x, particle_y),
-                        3,
-                    )
-                pygame.display.flip()
-                pygame.time.delay(30)
-    else:
-        # Efecto de daño: destello en el objetivo
-        for _ in range(3):
-            # Flash sobre el objetivo
+    def _draw_impact(self, screen, position):
+        """3. Efecto en el objetivo: brillo de curación o destellos de daño"""
+        target_x, target_y = self.defender_pos
+        if self.is_healing:
+            # Partículas verdes que suben desde el objetivo
+            rise = int(position / 3) % 10
+            for _ in range(5):
+                offset_x = self.rng.randint(-30, 30)
+                pygame.draw.circle(
+                    screen,
+                    ATTACK_COLORS["healing"],
+                    (target_x + offset_x, target_y - rise * 5 - 10),
+                    3,
+                )
+        elif int(position / EFFECT_FLASH_STEPS) % 2 == 0:
+            # Destello sobre el objetivo, alternando con pausas
             flash_surface = pygame.Surface((80, 80), pygame.SRCALPHA)
             flash_surface.fill((255, 0, 0, 150))
-            screen.blit(flash_surface, (defender_pos[0] - 40, defender_pos[1] - 40))
-            pygame.display.flip()
-            pygame.time.delay(80)
-
-            # Restaurar pantalla
-            screen_copy = screen.copy()
-            pygame.display.flip()
-            pygame.time.delay(80)
-
-    # 4. NÚMERO DE DAÑO/CURACIÓN FLOTANTE
-    text_color = COLORS["GREEN"] if is_healing else COLORS["RED"]
-    damage_text = font_medium.render(
-        f"+{abs(damage)}" if is_healing else f"-{damage}", True, text_color
-    )
+            screen.blit(flash_surface, (target_x - 40, target_y - 40))
 
-    for i in range(15):
-        screen_copy = screen.copy()
-        screen_copy.blit(
-            damage_text,
+    def _draw_number(self, screen, progress):
+        """4. Número de daño/curación flotante"""
+        text = self.damage_text
+        screen.blit(
+            text,
             (
-                defender_pos[0] - damage_text.get_width() // 2,
-                defender_pos[1] - 60 - i * 2,
+                self.defender_pos[0] - text.get_width() // 2,
+                self.defender_pos[1] - 60 - progress * 30,
             ),
         )
-        pygame.display.flip()
-        pygame.time.delay(30)
 
 
 def show_message(screen, title, message):
@@ -788,15 +896,8 @@ def show_message(screen, title, message):
         ),
     )
 
-    pygame.display.flip()
-
-    # Esperar a que el usuario presione una tecla
-    waiting = True
-    while waiting:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
-            if event.type == pygame.KEYDOWN or event.type == pygame.MOUSEBUTTONDOWN:
-                waiting = False
-        pygame.time.delay(100)
+    profiler.present()
+
+    # Esperar a que el usuario presione una tecla (sin sondeo)
+    if not wait_for_key():
+        pygame.quit()
@@ -0,0 +1,216 @@
+"""
+Registro estructurado y asíncrono para sustituir los print() de diagnóstico.
+
+    from src.utils.log import get_logger
+    log = get_logger(__name__)
+    log.info("Configuración cargada", path=config_path)
+    log.debug("Ruta de imagen", personaje="player", path=path, existe=True)
+
+Los argumentos con nombre se guardan como campos del registro (en JSON con
+RPG_LOG_FORMAT=json). Quien llama solo mete el registro en una cola sin locks
+(queue.SimpleQueue); un hilo en segundo plano lo formatea y lo escribe, así la
+E/S nunca bloquea el bucle de render ni el simulador. Un nivel desactivado se
+descarta antes de formatear nada.
+
+Configuración (variables de entorno o configure_logging):
+    RPG_LOG_LEVEL=INFO                    nivel general (DEBUG, INFO, WARNING,
+                                          ERROR, CRITICAL u OFF)
+    RPG_LOG=src.sim=OFF,src.ai=DEBUG      nivel por módulo o paquete
+    RPG_LOG_FORMAT=text                   text o json
+    RPG_LOG_FILE=logs/game.log            además de la salida de errores
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+ROOT = "src"
+OFF = logging.CRITICAL + 10
+logging.addLevelName(OFF, "OFF")
+
+_listener = None
+_lock = threading.Lock()
+
+# Atributos propios de LogRecord: el resto de `extra` son campos estructurados
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+}
+
+
+def _level(value):
+    if isinstance(value, int):
+        return value
+    value = str(value).upper()
+    if value == "OFF":
+        return OFF
+    level = logging.getLevelName(value)
+    if not isinstance(level, int):
+        raise ValueError(f"Nivel de registro desconocido: {value}")
+    return level
+
+
+def _fields(record):
+    return {k: v for k, v in vars(record).items() if k not in _RESERVED}
+
+
+class TextFormatter(logging.Formatter):
+    """`HH:MM:SS NIVEL módulo: mensaje campo=valor ...`"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s", "%H:%M:%S")
+
+    def format(self, record):
+        text = super().format(record)
+        fields = _fields(record)
+        if fields:
+            text += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro"""
+
+    def format(self, record):
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update(_fields(record))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler sin el lock de Handler.handle: SimpleQueue.put ya es atómico"""
+
+    def handle(self, record):
+        if self.filter(record):
+            self.emit(record)
+        return record
+
+    def prepare(self, record):
+        # Solo se resuelve el mensaje (los argumentos pueden cambiar después);
+        # el formato completo lo hace el hilo de escritura
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """Logger que acepta campos con nombre: log.info("mensaje", clave=valor)"""
+
+    _KWARGS = ("exc_info", "stack_info", "stacklevel", "extra")
+
+    def __init__(self, logger):
+        super().__init__(logger, {})
+
+    # Atajos sin pasar por LoggerAdapter.log: un nivel desactivado cuesta una
+    # consulta a la caché de niveles del logger
+    def debug(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger._log(logging.DEBUG, msg, args, **self.process(msg, kwargs)[1])
+
+    def info(self, msg, *args, **kwargs):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger._log(logging.INFO, msg, args, **self.process(msg, kwargs)[1])
+
+    def process(self, msg, kwargs):
+        fields = {k: kwargs.pop(k) for k in list(kwargs) if k not in self._KWARGS}
+        if fields:
+            kwargs["extra"] = dict(kwargs.get("extra") or {}, **fields)
+        return msg, kwargs
+
+
+def configure_logging(level=None, levels=None, fmt=None, path=None):
+    """
+    Configura el registro (una vez por proceso; volver a llamarla cambia los
+    niveles pero no los destinos)
+
+    Args:
+        level: Nivel general de ROOT (por defecto RPG_LOG_LEVEL o INFO)
+        levels: {módulo: nivel}; se suma a RPG_LOG
+        fmt: "text" o "json" (por defecto RPG_LOG_FORMAT o text)
+        path: Archivo adicional (por defecto RPG_LOG_FILE)
+    """
+    global _listener
+    root = logging.getLogger(ROOT)
+    root.setLevel(_level(level or os.environ.get("RPG_LOG_LEVEL", "INFO")))
+
+    spec = os.environ.get("RPG_LOG", "")
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        set_level(name, value)
+    for name, value in (levels or {}).items():
+        set_level(name, value)
+
+    with _lock:
+        if _listener is not None:
+            return
+        fmt = fmt or os.environ.get("RPG_LOG_FORMAT", "text")
+        formatter = JsonFormatter() if fmt == "json" else TextFormatter()
+        handlers = [logging.StreamHandler(sys.stderr)]
+        path = path or os.environ.get("RPG_LOG_FILE")
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            handlers.append(logging.FileHandler(path, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        records = queue.SimpleQueue()
+        root.addHandler(_QueueHandler(records))
+        root.propagate = False
+        _listener = logging.handlers.QueueListener(
+            records, *handlers, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def set_level(name, level):
+    """Nivel de un módulo o paquete ("src.sim", "src.ai.chatgpt_client"...)"""
+    logging.getLogger(name).setLevel(_level(level))
+
+
+def shutdown_logging():
+    """Escribe lo que quede en la cola y para el hilo de escritura"""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+
+
+def _restart_after_fork():
+    # Los procesos hijos (ProcessPoolExecutor) heredan la cola pero no el hilo
+    global _listener
+    if _listener is not None:
+        _listener = logging.handlers.QueueListener(
+            _listener.queue, *_listener.handlers, respect_handler_level=True
+        )
+        _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def get_logger(name):
+    """Logger estructurado de un módulo; configura el registro la primera vez"""
+    if _listener is None:
+        configure_logging()
+    return StructuredLogger(logging.getLogger(name))
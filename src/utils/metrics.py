@@ -0,0 +1,331 @@
+"""
+Métricas del motor y de la IA en formato de texto de Prometheus, sin
+dependencias externas.
+
+Contadores, medidores e histogramas con etiquetas, seguros entre hilos. Se
+registran siempre (cada observación es una suma bajo un lock, ~1 µs) y solo se
+sirven si se arranca el exportador:
+
+    from src.utils.metrics import start_metrics_server
+    start_metrics_server(9100)      # http://127.0.0.1:9100/metrics
+
+En el juego se activa con "metrics_port" en config/game_config.json y en el
+servidor de combates con --metrics-port.
+"""
+
+import bisect
+import os
+import threading
+import time
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.log import get_logger
+
+log = get_logger(__name__)
+
+# Límites superiores (s) de los histogramas
+FRAME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.0167, 0.025, 0.05, 0.1, 0.25, 1.0)
+LATENCY_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base: una serie por combinación de valores de etiquetas"""
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def samples(self):
+        """[(sufijo, valores de etiquetas, etiqueta extra, valor)]"""
+        with self.lock:
+            return [("", key, None, value) for key, value in self.series.items()]
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, key, extra, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(self.labels, key, extra)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.series[label_values] = self.series.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labels=()):
+        super().__init__(name, documentation, labels)
+        self.function = None
+
+    def set(self, value, *label_values):
+        with self.lock:
+            self.series[label_values] = value
+
+    def inc(self, amount=1, *label_values):
+        with self.lock:
+            self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def dec(self, amount=1, *label_values):
+        self.inc(-amount, *label_values)
+
+    def set_function(self, function):
+        """Calcula el valor al servir las métricas (medidor sin etiquetas)"""
+        self.function = function
+
+    def samples(self):
+        if self.function is not None:
+            return [("", (), None, self.function())]
+        return super().samples()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                # [cuenta por cubo (+ el de +Inf), suma]
+                series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, labels=None):
+        """
+        Decorador que observa la duración de cada llamada
+
+        Args:
+            labels: Función con los mismos argumentos que la decorada que
+                devuelve los valores de las etiquetas
+        """
+
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    label_values = labels(*args, **kwargs) if labels else ()
+                    self.observe(time.perf_counter() - start, *label_values)
+
+            return wrapper
+
+        return decorator
+
+    def samples(self):
+        with self.lock:
+            series = [(key, list(counts), total) for key, (counts, total) in self.series.items()]
+        samples = []
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(("_bucket", key, ("le", _format_value(float(bound))), cumulative))
+            samples.append(("_sum", key, None, total))
+            samples.append(("_count", key, None, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Conjunto de métricas y colectores que se evalúan al servirlas"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def _add(self, metric):
+        with self.lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self._add(Counter(name, documentation, labels))
+
+    def gauge(self, name, documentation, labels=()):
+        return self._add(Gauge(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(name, documentation, labels, buckets))
+
+    def add_collector(self, collector):
+        """`collector()` actualiza métricas justo antes de cada lectura"""
+        with self.lock:
+            self.collectors.append(collector)
+
+    def render(self):
+        """Todas las métricas en formato de texto de Prometheus"""
+        with self.lock:
+            collectors = list(self.collectors)
+            metrics = list(self.metrics)
+        for collector in collectors:
+            try:
+                collector()
+            except Exception as e:
+                log.warning("Error en un colector de métricas", error=str(e))
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Motor del juego
+TURNS_RESOLVED = registry.counter(
+    "rpg_turns_resolved_total", "Turnos completos resueltos", ("source",)
+)
+ENEMY_TURN_SECONDS = registry.histogram(
+    "rpg_enemy_turn_seconds", "Duración del turno de los enemigos (handle_enemy_turn)"
+)
+UPDATE_SECONDS = registry.histogram(
+    "rpg_update_seconds", "Duración de GameEngine.update", buckets=FRAME_BUCKETS
+)
+FRAME_SECONDS = registry.histogram(
+    "rpg_frame_seconds", "Duración de GameEngine.render", buckets=FRAME_BUCKETS
+)
+ACTIVE_SESSIONS = registry.gauge("rpg_active_sessions", "Partidas en curso")
+ACTIVE_SESSIONS.set(0)
+
+# IA
+AI_DECISION_SECONDS = registry.histogram(
+    "rpg_ai_decision_seconds", "Latencia de ChatGPTClient.get_decision", ("model",)
+)
+AI_CACHE_HITS = registry.gauge(
+    "rpg_ai_cache_hits", "Aciertos de caché por punto de llamada de IA", ("site",)
+)
+AI_CACHE_HIT_RATIO = registry.gauge(
+    "rpg_ai_cache_hit_ratio", "Proporción de aciertos de caché de IA", ("site",)
+)
+AI_COALESCED = registry.gauge(
+    "rpg_ai_coalesced", "Decisiones agrupadas con otra idéntica en vuelo", ("site",)
+)
+AI_PROMPT_CACHE_RATIO = registry.gauge(
+    "rpg_ai_prompt_cache_ratio",
+    "Proporción de tokens de entrada servidos desde la caché del proveedor",
+    ("site",),
+)
+
+# Proceso
+RESIDENT_MEMORY = registry.gauge(
+    "rpg_process_resident_memory_bytes", "Memoria residente del proceso"
+)
+MAX_RESIDENT_MEMORY = registry.gauge(
+    "rpg_process_max_resident_memory_bytes", "Pico de memoria residente del proceso"
+)
+
+
+def _collect_telemetry():
+    from src.ai.telemetry import telemetry
+
+    for site, stats in telemetry.snapshot().items():
+        AI_CACHE_HITS.set(stats["cache_hits"], site)
+        AI_COALESCED.set(stats["coalesced"], site)
+        if stats["cache_hit_rate"] is not None:
+            AI_CACHE_HIT_RATIO.set(stats["cache_hit_rate"], site)
+        if stats["prompt_cache_rate"] is not None:
+            AI_PROMPT_CACHE_RATIO.set(stats["prompt_cache_rate"], site)
+
+
+def _collect_memory():
+    try:
+        with open("/proc/self/statm") as f:
+            RESIDENT_MEMORY.set(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"))
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return
+    # ru_maxrss está en KiB en Linux
+    MAX_RESIDENT_MEMORY.set(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+
+
+registry.add_collector(_collect_telemetry)
+registry.add_collector(_collect_memory)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_SERVER = None
+_SERVER_LOCK = threading.Lock()
+
+
+def start_metrics_server(port, host="127.0.0.1", metrics_registry=None):
+    """
+    Sirve /metrics en un hilo en segundo plano (una sola vez por proceso)
+
+    Returns:
+        El ThreadingHTTPServer, o None si no se pudo abrir el puerto
+    """
+    global _SERVER
+    with _SERVER_LOCK:
+        if _SERVER is not None:
+            return _SERVER
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            log.error("No se pudo abrir el puerto de métricas", port=port, error=str(e))
+            return None
+        server.daemon_threads = True
+        server.registry = metrics_registry or registry
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        log.info(f"Métricas en http://{host}:{server.server_address[1]}/metrics")
+        _SERVER = server
+        return server
@@ -0,0 +1,192 @@
+"""
+Ritmo de frames: espera de eventos sin sondeo para las pantallas por turnos y
+bucle de paso fijo para las pantallas animadas.
+
+En lugar de `pygame.event.get()` + `pygame.time.delay()` en bucle, las pantallas
+que solo cambian con la entrada del jugador se bloquean en
+`pygame.event.wait(timeout)`: el proceso duerme hasta que llega un evento o
+hasta el próximo despertar programado. Quien anima algo pide un frame con
+`frames.request_frame(ms)`; sin peticiones la espera no tiene límite.
+
+    from src.utils.pacing import frames, wait_events
+
+    dirty = True
+    while waiting:
+        if dirty or frames.due():
+            render()
+            dirty = False
+        events = wait_events(frames.timeout())
+        # Sin eventos venció la espera: toca un frame programado
+        dirty = not events
+        for event in events:
+            ...
+
+Las pantallas animadas (menús y tutorial) separan simulación y render con
+FixedTimestep: las animaciones avanzan a SIM_HZ pasos por segundo sea cual sea
+el ritmo de render, que fija "fps" en config/game_config.json (0 = sin límite;
+con "vsync": true, la ventana de open_window sigue el refresco de la pantalla).
+El render interpola entre el paso anterior y el actual con `loop.alpha`:
+
+    loop = FixedTimestep(fps=render_fps(config), clock=self.clock)
+    while running:
+        handle_events()
+        for _ in range(loop.advance()):
+            update()                # un paso de 1/SIM_HZ s
+        draw(loop.alpha)            # lerp(anterior, actual, loop.alpha)
+"""
+
+import heapq
+
+import pygame
+
+from src.utils.log import get_logger
+from src.utils.profiler import REFRESH_NS, profiler
+
+log = get_logger(__name__)
+
+# Con la superposición del perfilador visible se redibuja a su ritmo
+PROFILER_REFRESH_MS = REFRESH_NS // 1_000_000
+# Pasos de simulación por segundo de las animaciones (estaban ajustadas a 60 fps)
+SIM_HZ = 60
+# Pasos como máximo por frame: con más retraso la simulación se frena en lugar de
+# encadenar frames cada vez más lentos
+MAX_STEPS = 5
+DEFAULT_FPS = 60
+
+# True si open_window consiguió sincronizar el flip con el refresco
+_vsync = False
+
+
+def open_window(size, vsync=False):
+    """Ventana del juego; con vsync el flip espera al refresco de la pantalla"""
+    global _vsync
+    if vsync:
+        try:
+            # SDL solo sincroniza con el refresco en modo SCALED u OpenGL
+            screen = pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            _vsync = True
+            return screen
+        except pygame.error as e:
+            log.warning("Vsync no disponible; se usa el límite de fps", error=str(e))
+    _vsync = False
+    return pygame.display.set_mode(size)
+
+
+def render_fps(config):
+    """Límite de fps del render según la configuración (0 = sin límite)"""
+    if _vsync:
+        # El flip ya espera al refresco de la pantalla
+        return 0
+    try:
+        return max(0, int(config.get("fps", DEFAULT_FPS)))
+    except (TypeError, ValueError):
+        return DEFAULT_FPS
+
+
+def lerp(previous, current, alpha):
+    return previous + (current - previous) * alpha
+
+
+class FixedTimestep:
+    """
+    Pasos de simulación de duración fija desacoplados del render
+
+    Args:
+        tick_hz: Pasos de simulación por segundo
+        fps: Límite de frames por segundo del render (0 = sin límite)
+        clock: pygame.time.Clock de la pantalla (get_time() sigue valiendo)
+        max_steps: Pasos como máximo por frame
+    """
+
+    def __init__(self, tick_hz=SIM_HZ, fps=DEFAULT_FPS, clock=None, max_steps=MAX_STEPS):
+        self.step_ms = 1000.0 / tick_hz
+        self.fps = fps
+        self.clock = clock or pygame.time.Clock()
+        self.max_steps = max_steps
+        # El primer frame ya da un paso
+        self.accumulator = self.step_ms
+        self.alpha = 0.0
+
+    def advance(self):
+        """
+        Espera al límite de fps y devuelve cuántos pasos de simulación tocan en
+        este frame; `alpha` queda como la fracción del paso siguiente ya
+        transcurrida
+        """
+        with profiler.scope("idle"):
+            elapsed = self.clock.tick(self.fps)
+        self.accumulator = min(
+            self.accumulator + elapsed, self.step_ms * self.max_steps
+        )
+        steps = int(self.accumulator // self.step_ms)
+        self.accumulator -= steps * self.step_ms
+        self.alpha = self.accumulator / self.step_ms
+        return steps
+
+
+class FrameScheduler:
+    """Despertares programados (instantes en ms de pygame.time.get_ticks)"""
+
+    def __init__(self):
+        self.deadlines = []
+
+    def request_frame(self, delay_ms=0):
+        """Pide un frame dentro de `delay_ms` milisegundos"""
+        heapq.heappush(self.deadlines, pygame.time.get_ticks() + max(0, int(delay_ms)))
+
+    def clear(self):
+        self.deadlines = []
+
+    def due(self):
+        """True (y consume las peticiones) si algún frame pedido ya toca"""
+        now = pygame.time.get_ticks()
+        fired = False
+        while self.deadlines and self.deadlines[0] <= now:
+            heapq.heappop(self.deadlines)
+            fired = True
+        return fired
+
+    def timeout(self):
+        """Milisegundos hasta el próximo frame pedido, o None si no hay ninguno"""
+        timeout = None
+        if self.deadlines:
+            timeout = max(0, self.deadlines[0] - pygame.time.get_ticks())
+        if profiler.enabled and (timeout is None or timeout > PROFILER_REFRESH_MS):
+            timeout = PROFILER_REFRESH_MS
+        return timeout
+
+
+def wait_events(timeout=None):
+    """
+    Bloquea hasta el primer evento (o hasta `timeout` ms) y devuelve la lista de
+    eventos pendientes, vacía si venció la espera. El tiempo bloqueado cuenta
+    como espera ("idle") en el perfilador.
+    """
+    with profiler.scope("idle"):
+        if timeout == 0:
+            first = None
+        else:
+            # pygame.event.wait(0) esperaría sin límite: None y 0 se separan aquí
+            first = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+    events = [] if first is None or first.type == pygame.NOEVENT else [first]
+    events.extend(pygame.event.get())
+    return events
+
+
+def wait_for_key():
+    """
+    Espera sin sondeo a una tecla o un clic (pantallas de "pulsa para continuar")
+
+    Returns:
+        False si se cerró la ventana
+    """
+    while True:
+        for event in wait_events():
+            if event.type == pygame.QUIT:
+                return False
+            if event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                return True
+
+
+# Una instancia por proceso, compartida por todas las pantallas
+frames = FrameScheduler()
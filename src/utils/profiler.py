@@ -0,0 +1,314 @@
+"""
+Perfilador de frames con superposición en pantalla (F3).
+
+Cada pantalla marca sus fases con ámbitos baratos y presenta el frame con
+`profiler.present()` en lugar de `pygame.display.flip()`:
+
+    from src.utils.profiler import profiler
+
+    with profiler.scope("update"):
+        self.update()
+    profiler.present()      # mide el flip, cierra el frame y dibuja la superposición
+
+El frame va de un present() al siguiente; el tiempo que no cae en ninguna fase
+se cuenta como "other". Los ámbitos anidados miden tiempo exclusivo (una
+animación de ataque dentro de "update" cuenta como "effects") y un ámbito que
+abarca varios frames se reparte entre ellos. Con el perfilador desactivado, scope() devuelve siempre
+el mismo contexto vacío y present() es un flip normal, así que el coste es una
+comprobación de atributo por ámbito.
+
+Se activa con F3 en el juego, con "profiler": true en config/game_config.json o
+con RPG_PROFILER=1.
+"""
+
+import os
+import time
+from collections import deque
+
+import pygame
+
+# Orden de las fases en la superposición (el resto aparece detrás)
+PHASES = (
+    "events",
+    "update",
+    "characters",
+    "combat_ui",
+    "draw",
+    "effects",
+    "overlay",
+    "flip",
+    "idle",
+    "other",
+)
+PHASE_COLORS = {
+    "events": (120, 200, 255),
+    "update": (255, 170, 60),
+    "characters": (120, 230, 120),
+    "combat_ui": (60, 170, 90),
+    "draw": (120, 230, 120),
+    "effects": (230, 120, 230),
+    "overlay": (90, 140, 140),
+    "flip": (240, 240, 110),
+    "idle": (90, 90, 110),
+    "other": (170, 170, 170),
+}
+TOGGLE_KEY = pygame.K_F3
+# El panel se redibuja 4 veces por segundo; entre medias se reutiliza
+REFRESH_NS = 250_000_000
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.start = now = time.perf_counter_ns()
+        if profiler.stack:
+            # El ámbito exterior se pausa mientras corre este
+            parent = profiler.stack[-1]
+            profiler.add(parent.name, now - parent.start)
+        profiler.stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        profiler = self.profiler
+        if not profiler.stack or profiler.stack[-1] is not self:
+            # El perfilador se desactivó o reinició dentro del ámbito
+            return False
+        now = time.perf_counter_ns()
+        profiler.stack.pop()
+        profiler.add(self.name, now - self.start)
+        if profiler.stack:
+            profiler.stack[-1].start = now
+        return False
+
+
+class FrameProfiler:
+    """
+    Tiempos por fase de los últimos frames y los peores frames vistos
+
+    Args:
+        history: Frames de la gráfica móvil
+        worst: Peores frames que se conservan
+    """
+
+    def __init__(self, history=240, worst=5):
+        self.enabled = False
+        self.history = deque(maxlen=history)
+        self.worst_count = worst
+        self.worst = []
+        self.current = {}
+        self.stack = []
+        self.frame_start = None
+        self.frames = 0
+        self.font = None
+        self.panel = None
+        self.panel_built = 0
+
+
+    def scope(self, name):
+        """Contexto que suma su duración a la fase `name` del frame en curso"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def add(self, name, elapsed_ns):
+        self.current[name] = self.current.get(name, 0) + elapsed_ns
+
+    def wait(self, milliseconds):
+        """pygame.time.delay contado como espera ("idle")"""
+        with self.scope("idle"):
+            pygame.time.delay(milliseconds)
+
+    def tick(self, clock, fps):
+        """clock.tick contado como espera ("idle")"""
+        with self.scope("idle"):
+            return clock.tick(fps)
+
+    def present(self):
+        """Presenta el frame: dibuja la superposición, hace el flip y cierra el frame"""
+        if not self.enabled:
+            pygame.display.flip()
+            return
+        surface = pygame.display.get_surface()
+        if surface is not None:
+            with self.scope("overlay"):
+                self.draw(surface)
+        with self.scope("flip"):
+            pygame.display.flip()
+        self.end_frame()
+
+    def end_frame(self, now=None):
+        now = now or time.perf_counter_ns()
+        if self.stack:
+            # El ámbito en curso sigue en el frame siguiente
+            running = self.stack[-1]
+            self.add(running.name, now - running.start)
+            running.start = now
+        if self.frame_start is None:
+            # El primer frame tras activar el perfilador no tiene inicio conocido
+            self.frame_start = now
+            self.current = {}
+            return
+        total = now - self.frame_start
+        phases = self.current
+        measured = sum(phases.values())
+        if total > measured:
+            phases["other"] = phases.get("other", 0) + total - measured
+        self.history.append((total, phases))
+        self.frames += 1
+        # Los peores frames se ordenan por trabajo, sin contar la espera
+        busy = total - phases.get("idle", 0)
+        if len(self.worst) < self.worst_count or busy > self.worst[-1][0]:
+            self.worst.append((busy, self.frames, phases))
+            self.worst.sort(key=lambda frame: -frame[0])
+            del self.worst[self.worst_count :]
+        self.current = {}
+        self.frame_start = now
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        self.current = {}
+        self.stack = []
+        self.frame_start = None
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+
+    def reset(self):
+        self.history.clear()
+        self.worst = []
+        self.current = {}
+        self.stack = []
+        self.frame_start = None
+        self.frames = 0
+
+    def handle_event(self, event):
+        """True si el evento era el atajo del perfilador (y ya está atendido)"""
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        return False
+
+
+    def summary(self):
+        """Medias por fase (ms), fps y peores frames de la historia actual"""
+        if not self.history:
+            return {"frames": 0, "frame_ms": 0.0, "fps": 0.0, "phases_ms": {}, "worst": []}
+        count = len(self.history)
+        frame_ms = sum(total for total, _ in self.history) / count / 1e6
+        totals = {}
+        for _, phases in self.history:
+            for name, elapsed in phases.items():
+                totals[name] = totals.get(name, 0) + elapsed
+        return {
+            "frames": count,
+            "frame_ms": frame_ms,
+            "fps": 1000.0 / frame_ms if frame_ms else 0.0,
+            "phases_ms": {name: totals[name] / count / 1e6 for name in _ordered(totals)},
+            "worst": [
+                {
+                    "frame": index,
+                    "busy_ms": busy / 1e6,
+                    "phases_ms": {name: phases[name] / 1e6 for name in _ordered(phases)},
+                }
+                for busy, index, phases in self.worst
+            ],
+        }
+
+
+    def draw(self, surface, x=None, y=8):
+        """Panel con fps, fases, gráfica móvil y peores frames"""
+        now = time.perf_counter_ns()
+        if self.panel is None or now - self.panel_built >= REFRESH_NS:
+            self.build_panel()
+            self.panel_built = now
+        if x is None:
+            x = surface.get_width() - self.panel.get_width() - 8
+        surface.blit(self.panel, (x, y))
+
+    def build_panel(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        summary = self.summary()
+        graph_w, graph_h = 240, 60
+        width = graph_w + 16
+        rows = 2 + len(summary["phases_ms"]) + 1 + len(summary["worst"])
+        height = rows * 15 + graph_h + 20
+        if self.panel is None or self.panel.get_size() != (width, height):
+            self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel = self.panel
+        panel.fill((0, 0, 0, 190))
+
+        line = 6
+
+        def text(value, color=(230, 230, 230), indent=0):
+            nonlocal line
+            panel.blit(self.font.render(value, True, color), (8 + indent, line))
+            line += 15
+
+        text(f"{summary['fps']:5.1f} fps  {summary['frame_ms']:6.2f} ms/frame", (255, 215, 0))
+        text("fase            ms   %", (160, 160, 160))
+        frame_ms = summary["frame_ms"] or 1.0
+        for name, ms in summary["phases_ms"].items():
+            color = PHASE_COLORS.get(name, (200, 200, 200))
+            text(f"{name:<12}{ms:7.2f} {ms / frame_ms:4.0%}", color, 4)
+
+        # Gráfica móvil: una barra por frame, apilada por fases; líneas a 60 y 30 fps
+        top = line + 4
+        scale = graph_h / 50.0  # 50 ms = altura completa
+        pygame.draw.rect(panel, (30, 30, 40, 220), (8, top, graph_w, graph_h))
+        frames = list(self.history)[-graph_w:]
+        for i, (total, phases) in enumerate(frames):
+            bar_x = 8 + graph_w - len(frames) + i
+            bottom = top + graph_h
+            for name in _ordered(phases):
+                h = phases[name] / 1e6 * scale
+                if h <= 0:
+                    continue
+                h = min(h, bottom - top)
+                color = PHASE_COLORS.get(name, (200, 200, 200))
+                pygame.draw.line(panel, color, (bar_x, bottom), (bar_x, bottom - h))
+                bottom -= h
+                if bottom <= top:
+                    break
+        for ms, color in ((1000 / 60, (0, 200, 0)), (1000 / 30, (200, 60, 60))):
+            mark = top + graph_h - ms * scale
+            pygame.draw.line(panel, color, (8, mark), (8 + graph_w, mark))
+        line = top + graph_h + 6
+
+        text("peores frames (sin espera)", (160, 160, 160))
+        for worst in summary["worst"]:
+            busy = {name: ms for name, ms in worst["phases_ms"].items() if name != "idle"}
+            main = max(busy.items(), key=lambda item: item[1], default=("", 0))
+            text(
+                f"#{worst['frame']:<6}{worst['busy_ms']:7.1f} ms  {main[0]}", (255, 140, 140), 4
+            )
+
+
+def _ordered(phases):
+    known = [name for name in PHASES if name in phases]
+    return known + sorted(name for name in phases if name not in PHASES)
+
+
+# Una instancia por proceso, compartida por todas las pantallas
+profiler = FrameProfiler()
+if os.environ.get("RPG_PROFILER", "") not in ("", "0"):
+    profiler.set_enabled(True)
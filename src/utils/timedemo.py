@@ -0,0 +1,317 @@
+"""
+Grabación y reproducción de partidas completas (timedemo).
+
+    python main.py --record demos/partida.json      # jugar y grabar
+    python main.py --timedemo demos/partida.json    # reproducir y medir
+
+La grabación guarda la semilla aleatoria, la configuración y cada evento de
+entrada con su instante, indexado por la consulta de eventos en la que llegó
+(`pygame.event.get` o `pygame.event.wait`). La reproducción devuelve esos
+eventos en las mismas consultas, sin esperas (`pygame.time.delay`, `wait`,
+`Clock.tick` y `pygame.event.wait` no duermen), así que la partida se repite
+frame a frame lo más rápido posible. Al terminar informa del tiempo total, la
+distribución del tiempo por frame y el desglose por escena (menú, tutorial,
+opciones, combate y jefe).
+
+Para que la partida sea repetible, en los dos modos la IA usa el modelo local,
+la configuración vive solo en memoria (las opciones cambiadas no se guardan) y
+el generador aleatorio se vuelve a sembrar en cada cambio de escena. Los pasos
+de simulación de cada frame de las pantallas animadas (FixedTimestep) dependen
+del reloj, así que también se graban y se repiten tal cual. Sin
+ventana: SDL_VIDEODRIVER=dummy python main.py --timedemo ...
+"""
+
+import json
+import os
+import random
+import time
+
+import pygame
+
+from src.utils.log import get_logger
+from src.utils.pacing import FixedTimestep
+from src.utils.stats import summarize_latencies
+
+log = get_logger(__name__)
+
+# 2: pygame.event.wait también cuenta como consulta
+# 3: pasos de simulación por frame de FixedTimestep
+FORMAT_VERSION = 3
+# Eventos que se graban (el resto, como los de ventana, no afectan a la partida)
+RECORDED_EVENTS = (
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+)
+DEMO_CONFIG = {"ai_model": "local"}
+
+
+def serialize_event(event):
+    attributes = {}
+    for name, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if value is None or isinstance(value, (bool, int, float, str, list)):
+            attributes[name] = value
+    return [event.type, attributes]
+
+
+def deserialize_event(data):
+    event_type, attributes = data
+    return pygame.event.Event(
+        event_type,
+        {k: tuple(v) if isinstance(v, list) else v for k, v in attributes.items()},
+    )
+
+
+class _Demo:
+    """Parte común: semilla por escena y parches de pygame"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.polls = 0
+        self.scene_index = 0
+        self.scene = "inicio"
+        self.scene_detail = None
+        self.patched = []
+
+    def _patch(self, owner, name, value):
+        self.patched.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, value)
+
+    def uninstall(self):
+        for owner, name, original in reversed(self.patched):
+            setattr(owner, name, original)
+        self.patched = []
+
+    def enter_scene(self, name, detail=None):
+        """
+        Cambio de escena en main.py: vuelve a sembrar el generador aleatorio
+
+        Args:
+            detail: Función opcional que devuelve un subnombre en cada frame
+                (el bioma del combate, por ejemplo)
+        """
+        self.scene_index += 1
+        self.scene = name
+        self.scene_detail = detail
+        random.seed(f"{self.seed}:{self.scene_index}")
+
+    def scene_label(self):
+        if self.scene_detail is None:
+            return self.scene
+        try:
+            return f"{self.scene}:{self.scene_detail()}"
+        except Exception:
+            return self.scene
+
+
+class InputRecorder(_Demo):
+    """Graba los eventos de entrada de una partida normal"""
+
+    def __init__(self, path, seed, config):
+        super().__init__(seed)
+        self.path = path
+        self.config = config
+        self.entries = []
+        self.steps = []
+        self.start = None
+
+    def install(self):
+        real_get = pygame.event.get
+        real_wait = pygame.event.wait
+
+        def record(events):
+            self.polls += 1
+            recorded = [serialize_event(e) for e in events if e.type in RECORDED_EVENTS]
+            if recorded:
+                elapsed_ms = (time.perf_counter() - self.start) * 1000
+                self.entries.append([self.polls, round(elapsed_ms, 3), self.scene, recorded])
+
+        def get(*args, **kwargs):
+            events = real_get(*args, **kwargs)
+            record(events)
+            return events
+
+        def wait(*args, **kwargs):
+            event = real_wait(*args, **kwargs)
+            record([event])
+            return event
+
+        real_advance = FixedTimestep.advance
+
+        def advance(loop):
+            steps = real_advance(loop)
+            self.steps.append(steps)
+            return steps
+
+        self.start = time.perf_counter()
+        self._patch(pygame.event, "get", get)
+        self._patch(pygame.event, "wait", wait)
+        self._patch(FixedTimestep, "advance", advance)
+
+    def finish(self):
+        self.uninstall()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(
+                {
+                    "version": FORMAT_VERSION,
+                    "seed": self.seed,
+                    "config": self.config,
+                    "duration_ms": (time.perf_counter() - self.start) * 1000,
+                    "polls": self.polls,
+                    "entries": self.entries,
+                    "steps": self.steps,
+                },
+                f,
+            )
+        log.info("Partida grabada", path=self.path, polls=self.polls, entries=len(self.entries))
+
+
+class _FastClock:
+    """pygame.time.Clock que no duerme: cada tick cuenta como un frame a `fps`"""
+
+    def __init__(self):
+        self.last = 0
+
+    def tick(self, framerate=0):
+        self.last = int(1000 / framerate) if framerate else 0
+        return self.last
+
+    tick_busy_loop = tick
+
+    def get_time(self):
+        return self.last
+
+    def get_rawtime(self):
+        return self.last
+
+    def get_fps(self):
+        return 1000 / self.last if self.last else 0.0
+
+
+class DemoPlayer(_Demo):
+    """Reproduce una grabación lo más rápido posible y mide cada frame"""
+
+    def __init__(self, demo):
+        if demo.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Versión de grabación no soportada: {demo.get('version')}")
+        super().__init__(demo["seed"])
+        self.demo = demo
+        self.config = demo["config"]
+        self.entries = {entry[0]: entry for entry in demo["entries"]}
+        self.steps = demo["steps"]
+        self.advances = 0
+        self.mouse_pos = (0, 0)
+        self.frames = []
+        self.start = None
+        self.last_frame = None
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def install(self):
+        real_flip = pygame.display.flip
+
+        def get(*args, **kwargs):
+            self.polls += 1
+            if self.polls > self.demo["polls"]:
+                # Fin de la grabación (o desincronización): cerrar el juego
+                return [pygame.event.Event(pygame.QUIT)]
+            entry = self.entries.get(self.polls)
+            if entry is None:
+                return []
+            events = [deserialize_event(data) for data in entry[3]]
+            for event in events:
+                if hasattr(event, "pos"):
+                    self.mouse_pos = event.pos
+            return events
+
+        def wait(*args, **kwargs):
+            # Sin dormir: el evento grabado en esta consulta o ninguno
+            events = get()
+            return events[0] if events else pygame.event.Event(pygame.NOEVENT)
+
+        def advance(loop):
+            # Los pasos grabados en este frame, sin esperar al límite de fps
+            loop.clock.tick(loop.fps)
+            loop.alpha = 0.0
+            index = self.advances
+            self.advances += 1
+            return self.steps[index] if index < len(self.steps) else 1
+
+        def flip():
+            real_flip()
+            now = time.perf_counter()
+            self.frames.append((self.scene_label(), (now - self.last_frame) * 1000))
+            self.last_frame = now
+
+        self._patch(pygame.event, "get", get)
+        self._patch(pygame.event, "wait", wait)
+        self._patch(FixedTimestep, "advance", advance)
+        self._patch(pygame.mouse, "get_pos", lambda: self.mouse_pos)
+        self._patch(pygame.time, "delay", lambda milliseconds: 0)
+        self._patch(pygame.time, "wait", lambda milliseconds: 0)
+        self._patch(pygame.time, "Clock", _FastClock)
+        self._patch(pygame.display, "flip", flip)
+        self.start = self.last_frame = time.perf_counter()
+
+    def finish(self):
+        self.uninstall()
+        return self.report(time.perf_counter() - self.start)
+
+    def report(self, elapsed):
+        frame_ms = [ms for _, ms in self.frames]
+        scenes = {}
+        for scene, ms in self.frames:
+            scenes.setdefault(scene, []).append(ms)
+        return {
+            "elapsed_s": elapsed,
+            "recorded_s": self.demo["duration_ms"] / 1000,
+            "frames": len(self.frames),
+            "fps": len(self.frames) / elapsed if elapsed else 0.0,
+            "frame_ms": summarize_latencies(frame_ms),
+            "scenes": {
+                scene: dict(summarize_latencies(values), total_s=sum(values) / 1000)
+                for scene, values in scenes.items()
+            },
+            "polls": self.polls,
+            "recorded_polls": self.demo["polls"],
+            "steps_frames": self.advances,
+            "recorded_steps_frames": len(self.steps),
+            # Con más o menos consultas o frames animados que en la grabación la
+            # partida ha divergido
+            "in_sync": self.polls == self.demo["polls"] and self.advances == len(self.steps),
+        }
+
+
+def print_report(report):
+    frame = report["frame_ms"]
+    print(
+        f"{report['frames']} frames en {report['elapsed_s']:.2f} s "
+        f"({report['fps']:.0f} fps; grabada en {report['recorded_s']:.1f} s)"
+    )
+    print(
+        f"frame: media {frame['mean']:.2f} ms  p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  "
+        f"p99 {frame['p99']:.2f}  máx {frame['max']:.2f}"
+    )
+    for scene, stats in report["scenes"].items():
+        print(
+            f"  {scene:20s} {stats['count']:6d} frames  {stats['total_s']:7.2f} s  "
+            f"media {stats['mean']:6.2f} ms  p95 {stats['p95']:6.2f} ms"
+        )
+    if not report["in_sync"]:
+        print(
+            f"AVISO: la reproducción hizo {report['polls']} consultas de eventos y "
+            f"{report['steps_frames']} frames de paso fijo, y la grabación "
+            f"{report['recorded_polls']} y {report['recorded_steps_frames']}; "
+            "la partida ha divergido"
+        )